@@ -0,0 +1,302 @@
+"""
+Netflix Content Analytics - Aggregate Engine
+============================================
+Single-pass aggregations backing the Dashboard charts.
+
+Each helper computes its result from one grouped count over the filtered
+titles instead of re-filtering the frame inside nested loops, so the cost
+is O(titles + groups) regardless of how many categories are displayed.
+
+The same helpers accept pre-aggregated rows through ``weight``: the count
+cube built at preprocessing time holds one row per observed combination of
+CUBE_DIMENSIONS with its title count, so the Dashboard charts are answered
+by slicing and summing cube cells instead of scanning titles.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Dimensions of the pre-aggregated count cube
+CUBE_DIMENSIONS = ['year_added', 'month_added', 'type', 'rating', 'primary_country', 'primary_genre']
+
+# Dimensions with a precomputed leaderboard, and the entries kept per board
+LEADERBOARD_DIMENSIONS = ['type', 'rating', 'primary_country', 'primary_genre']
+LEADERBOARD_SIZE = 50
+
+def _grouped_count(df, keys, weight=None):
+    """Row count per group, or the sum of ``weight`` for pre-aggregated rows."""
+    if weight is None:
+        return df.groupby(keys, observed=True).size()
+    return df.groupby(keys, observed=True)[weight].sum()
+
+def build_count_cube(df, dimensions=CUBE_DIMENSIONS):
+    """
+    Title counts for every observed combination of the cube dimensions.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Processed titles
+    dimensions : list of str
+        Cube dimensions
+
+    Returns:
+    --------
+    pd.DataFrame
+        One row per cell: the ``dimensions`` columns and ``count``; missing
+        dimension values form their own cells so totals are preserved
+    """
+    return df.groupby(dimensions, observed=True, dropna=False).size().reset_index(name='count')
+
+def merge_count_cubes(base, add=None, subtract=None):
+    """
+    Patch a count cube with the cells of added and removed titles.
+
+    Parameters:
+    -----------
+    base : pd.DataFrame
+        Existing cube
+    add, subtract : pd.DataFrame, optional
+        Cubes of the titles to add / remove (same dimensions)
+
+    Returns:
+    --------
+    pd.DataFrame
+        Cube with the summed counts; cells that drop to zero are removed
+    """
+    parts = [base]
+    if add is not None:
+        parts.append(add)
+    if subtract is not None:
+        parts.append(subtract.assign(count=-subtract['count']))
+    dimensions = [c for c in base.columns if c != 'count']
+    cube = pd.concat(parts, ignore_index=True).groupby(dimensions, dropna=False)['count'].sum().reset_index()
+    return cube[cube['count'] > 0].reset_index(drop=True)
+
+def cube_counts(cube, dimensions, sort=False):
+    """
+    Roll the cube up to ``dimensions`` by summing all other dimensions out.
+
+    Parameters:
+    -----------
+    cube : pd.DataFrame
+        (Sliced) count cube
+    dimensions : str or list of str
+        Dimensions to keep
+    sort : bool
+        Order by descending count (like value_counts) instead of by key
+
+    Returns:
+    --------
+    pd.Series
+        Title counts indexed by the kept dimensions; empty groups and
+        missing keys are dropped
+    """
+    counts = cube.groupby(dimensions, observed=True)['count'].sum()
+    counts = counts[counts > 0]
+    if sort:
+        counts = counts.sort_values(ascending=False, kind='stable')
+    return counts
+
+def build_leaderboards(cube, dimensions=LEADERBOARD_DIMENSIONS, k=LEADERBOARD_SIZE):
+    """
+    Top-k values of each dimension, over all titles and per content type.
+
+    Every board is built twice: over the whole catalog, and over the titles
+    with a ``year_added`` only, which are the titles the Dashboard's year
+    slider selects at its full range.
+
+    Parameters:
+    -----------
+    cube : pd.DataFrame
+        Count cube of the whole catalog
+    dimensions : list of str
+        Dimensions to rank
+    k : int
+        Entries kept per board
+
+    Returns:
+    --------
+    pd.DataFrame
+        ``dimension``, ``type`` ('All' or a content type), ``dated``,
+        ``value`` and ``count`` columns; rows of each board in descending
+        count order
+    """
+    frames = []
+    for dated in (False, True):
+        scope = cube[cube['year_added'].notna()] if dated else cube
+        for dimension in dimensions:
+            boards = [('All', cube_counts(scope, dimension, sort=True))]
+            if dimension != 'type':
+                by_type = cube_counts(scope, ['type', dimension], sort=True)
+                boards += [(content_type, counts.droplevel(0)) for content_type, counts in by_type.groupby(level=0, observed=True, sort=False)]
+            for content_type, counts in boards:
+                counts = counts.head(k)
+                frames.append(pd.DataFrame({
+                    'dimension': dimension,
+                    'type': str(content_type),
+                    'dated': dated,
+                    'value': counts.index.astype(str),
+                    'count': counts.to_numpy(),
+                }))
+    return pd.concat(frames, ignore_index=True)
+
+def leaderboard_lookup(leaderboards):
+    """
+    Index leaderboard rows for constant-time access.
+
+    Returns:
+    --------
+    dict
+        (dimension, type, dated) -> counts indexed by value, in rank order
+    """
+    return {
+        key: board.set_index('value')['count']
+        for key, board in leaderboards.groupby(['dimension', 'type', 'dated'], sort=False)
+    }
+
+def flow_matrix(df, source='primary_genre', target='primary_country', n_sources=6, n_targets=6, weight=None):
+    """
+    Title counts between the top sources and the top targets.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Filtered titles
+    source, target : str
+        Categorical columns on the left/right of the flow
+    n_sources, n_targets : int
+        Number of top values (by title count) kept on each side
+    weight : str, optional
+        Count column when ``df`` holds pre-aggregated cube cells
+
+    Returns:
+    --------
+    pd.DataFrame
+        Counts with top sources as rows and top targets as columns, both
+        ordered by descending total; zero where a pair has no titles
+    """
+    pair_counts = _grouped_count(df, [source, target], weight)
+    if pair_counts.empty:
+        return pd.DataFrame(dtype='int64')
+
+    top_sources = pair_counts.groupby(level=0, observed=True).sum().sort_values(ascending=False).head(n_sources).index
+    top_targets = pair_counts.groupby(level=1, observed=True).sum().sort_values(ascending=False).head(n_targets).index
+
+    keep = pair_counts.index.get_level_values(0).isin(top_sources) & pair_counts.index.get_level_values(1).isin(top_targets)
+    return (
+        pair_counts[keep]
+        .unstack(fill_value=0)
+        .reindex(index=top_sources, columns=top_targets, fill_value=0)
+    )
+
+def strongest_pair(matrix, n_sources=None, n_targets=None):
+    """
+    Largest cell of a flow matrix, optionally restricted to its top-left corner.
+
+    Returns:
+    --------
+    tuple or None
+        (source, target, count), or None if the matrix is empty
+    """
+    corner = matrix.iloc[:n_sources, :n_targets]
+    if corner.size == 0:
+        return None
+    stacked = corner.stack()
+    if stacked.max() <= 0:
+        return None
+    source, target = stacked.idxmax()
+    return source, target, int(stacked.max())
+
+def hierarchical_rollup(df, levels=('primary_country', 'primary_genre', 'type'), top_k=(8, 4, None), weight=None):
+    """
+    Leaf counts of a category hierarchy, keeping the top-k children per parent.
+
+    One grouped count over all ``levels`` is computed; the top-k selection at
+    each level ranks nodes by their total within their parent, so no subset
+    of the titles is ever re-filtered.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Filtered titles
+    levels : sequence of str
+        Columns from the outermost to the innermost level
+    top_k : sequence of int or None
+        Children kept under each parent at the matching level (None keeps all)
+    weight : str, optional
+        Count column when ``df`` holds pre-aggregated cube cells
+
+    Returns:
+    --------
+    pd.DataFrame
+        One row per kept leaf with the ``levels`` columns and ``count``
+    """
+    levels = list(levels)
+    leaves = _grouped_count(df, levels, weight).reset_index(name='count')
+
+    for depth, k in enumerate(top_k[:len(levels)]):
+        if k is None or leaves.empty:
+            continue
+        keys, parent = levels[:depth + 1], levels[:depth]
+        nodes = leaves.groupby(keys, observed=True, sort=False)['count'].sum().reset_index()
+        nodes = nodes.sort_values('count', ascending=False, kind='stable')
+        if parent:
+            rank = nodes.groupby(parent, observed=True, sort=False).cumcount().to_numpy()
+        else:
+            rank = np.arange(len(nodes))
+        leaves = leaves.merge(nodes.loc[rank < k, keys], on=keys)
+
+    return leaves
+
+def rollup_nodes(leaves, levels, root_label='All', label_widths=None):
+    """
+    Flatten rolled-up leaves into the parallel arrays Plotly hierarchies take.
+
+    Parameters:
+    -----------
+    leaves : pd.DataFrame
+        Output of hierarchical_rollup
+    levels : sequence of str
+        Hierarchy columns of ``leaves``
+    root_label : str
+        Label of the single root node
+    label_widths : sequence of int or None, optional
+        Per-level label truncation width (None keeps the full name)
+
+    Returns:
+    --------
+    dict
+        ``ids``, ``parents``, ``labels``, ``values`` and ``colors`` lists;
+        colors are count-weighted means of the leaf counts below each node
+    """
+    levels = list(levels)
+    label_widths = list(label_widths or [None] * len(levels))
+    leaves = leaves.assign(count_sq=leaves['count'].astype('float64') ** 2)
+
+    total = leaves['count'].sum()
+    ids, parents, labels = [root_label], [''], [root_label]
+    values = [int(total)]
+    colors = [float(leaves['count_sq'].sum() / total) if total else 0.0]
+
+    for depth, level in enumerate(levels):
+        keys = levels[:depth + 1]
+        nodes = leaves.groupby(keys, observed=True, sort=False)[['count', 'count_sq']].sum().reset_index()
+        node_parents = pd.Series(root_label, index=nodes.index, dtype=object)
+        for key in keys[:-1]:
+            node_parents = node_parents + '/' + nodes[key].astype(str)
+        node_ids = node_parents + '/' + nodes[level].astype(str)
+
+        node_labels = nodes[level].astype(str)
+        width = label_widths[depth]
+        if width is not None:
+            long_names = node_labels.str.len() > width
+            node_labels = node_labels.where(~long_names, node_labels.str[:width] + '...')
+
+        ids += node_ids.tolist()
+        parents += node_parents.tolist()
+        labels += node_labels.tolist()
+        values += nodes['count'].astype(int).tolist()
+        colors += (nodes['count_sq'] / nodes['count']).tolist()
+
+    return {'ids': ids, 'parents': parents, 'labels': labels, 'values': values, 'colors': colors}
@@ -0,0 +1,112 @@
+"""
+Netflix Content Analytics - Catalog Dtype Compaction
+====================================================
+Compact in-memory dtypes for the shared catalog.
+
+The processed titles come back from CSV/Parquet with every label column as
+Python strings and the year/month columns as float64 (because of missing
+dates). Low-cardinality label columns are converted to categoricals (one
+small integer code per row plus one copy of each distinct label) and the
+integer-valued columns to nullable small ints, which shrinks the catalog
+several-fold and lets ``value_counts``/``groupby`` work on integer codes.
+
+The comma-separated text columns (country, listed_in, cast, director) are
+nearly unique per title, so a categorical would keep almost every string.
+They are dropped instead: the catalog holds the same values as
+MultiValueColumns (offsets + codes into one vocabulary per column).
+
+Categoricals report every category, used or not: group them with
+``observed=True`` and drop zero counts from ``value_counts`` on subsets.
+
+Run ``python compaction.py`` to print the per-column memory report.
+"""
+
+import calendar
+
+import pandas as pd
+
+from multivalue import MULTIVALUE_COLUMNS
+
+# Target dtype per column; columns missing from a frame are skipped
+COMPACT_DTYPES = {
+    'type': 'category',
+    'rating': 'category',
+    'duration': 'category',
+    'primary_country': 'category',
+    'primary_genre': 'category',
+    # Calendar order, so month-wise sorts and charts need no extra mapping
+    'month_name': pd.CategoricalDtype(list(calendar.month_name)[1:]),
+    'release_year': 'Int16',
+    'year_added': 'Int16',
+    'month_added': 'Int8',
+    'decade': 'Int16',
+    'duration_minutes': 'Int16',
+    'num_seasons': 'Int8',
+}
+
+# Text columns held by the catalog only as their MultiValueColumn encoding
+MULTIVALUE_TEXT_COLUMNS = list(MULTIVALUE_COLUMNS.values())
+
+def compact_dtypes(df, dtypes=COMPACT_DTYPES, drop=MULTIVALUE_TEXT_COLUMNS):
+    """
+    Convert columns to their compact dtypes.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Processed titles
+    dtypes : dict
+        Column -> target dtype
+    drop : list of str
+        Columns to leave out (by default the multi-valued text columns)
+
+    Returns:
+    --------
+    pd.DataFrame
+        New frame with the converted columns; other columns are shared
+    """
+    df = df.drop(columns=[column for column in drop if column in df.columns])
+    return df.astype({column: dtype for column, dtype in dtypes.items() if column in df.columns})
+
+def multivalue_bytes(mv):
+    """Memory footprint of a MultiValueColumn (offsets, codes and vocabulary)."""
+    return mv.offsets.nbytes + mv.codes.nbytes + int(pd.Series(mv.vocab).memory_usage(deep=True, index=False))
+
+def memory_report(before, after):
+    """
+    Per-column memory footprint before and after compaction.
+
+    Parameters:
+    -----------
+    before, after : pd.DataFrame
+        The same rows with the original and the compacted dtypes; columns
+        missing from ``after`` are reported as dropped, with zero bytes
+
+    Returns:
+    --------
+    pd.DataFrame
+        ``dtype_before``, ``dtype_after``, ``bytes_before``, ``bytes_after``
+        and ``ratio`` per column, with a final ``TOTAL`` row
+    """
+    report = pd.DataFrame({
+        'dtype_before': before.dtypes.astype(str),
+        'dtype_after': after.dtypes.astype(str).reindex(before.columns, fill_value='dropped'),
+        'bytes_before': before.memory_usage(deep=True, index=False),
+        'bytes_after': after.memory_usage(deep=True, index=False).reindex(before.columns, fill_value=0),
+    })
+    report.loc['TOTAL'] = ['', '', report['bytes_before'].sum(), report['bytes_after'].sum()]
+    report['ratio'] = report['bytes_before'] / report['bytes_after'].where(report['bytes_after'] > 0)
+    return report
+
+if __name__ == "__main__":
+    from eda_preprocessing import load_processed_data, load_multivalue_columns
+
+    titles = load_processed_data('netflix_titles_processed.parquet')
+    multivalue = load_multivalue_columns('netflix_titles_processed.parquet')
+    report = memory_report(titles, compact_dtypes(titles))
+    with pd.option_context('display.width', 120, 'display.max_columns', None,
+                           'display.float_format', '{:.1f}x'.format):
+        print(report)
+    # The dashboard loads these either way; they replace the dropped text columns
+    encoded = sum(multivalue_bytes(mv) for mv in multivalue.values())
+    print(f"MultiValueColumns ({', '.join(MULTIVALUE_COLUMNS)}): {encoded:,} bytes")
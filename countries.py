@@ -0,0 +1,451 @@
+"""
+Netflix Content Analytics - Country Codes
+=========================================
+Country name -> ISO 3166-1 lookup behind the choropleth map.
+
+Every ISO 3166-1 country is listed with its alpha-3 code (what Plotly's
+``locationmode='ISO-3'`` draws) and its numeric code, plus the aliases and
+historical names found in catalog feeds. Preprocessing resolves each title's
+country once into the numeric code (``primary_country_iso``, -1 when the
+country is missing or unknown), which stays valid when entries are added
+here. The map then counts titles per code with a single bincount and looks
+the alpha-3 codes and display names up by position.
+
+Co-productions can instead be credited to every listed country. The listed
+names are resolved per vocabulary entry of the ``country_list`` column into
+a per-title list of distinct ISO codes, built once per process; the map then
+explodes the filtered rows' codes and bincounts them, counting each title
+fully for every country or splitting it evenly across them.
+"""
+
+import numpy as np
+import pandas as pd
+
+from multivalue import MultiValueColumn, explode_rows
+
+# (alpha-3, numeric, display name) of every ISO 3166-1 country
+ISO_COUNTRIES = (
+    ('AFG', 4, 'Afghanistan'),
+    ('ALA', 248, 'Åland Islands'),
+    ('ALB', 8, 'Albania'),
+    ('DZA', 12, 'Algeria'),
+    ('ASM', 16, 'American Samoa'),
+    ('AND', 20, 'Andorra'),
+    ('AGO', 24, 'Angola'),
+    ('AIA', 660, 'Anguilla'),
+    ('ATA', 10, 'Antarctica'),
+    ('ATG', 28, 'Antigua and Barbuda'),
+    ('ARG', 32, 'Argentina'),
+    ('ARM', 51, 'Armenia'),
+    ('ABW', 533, 'Aruba'),
+    ('AUS', 36, 'Australia'),
+    ('AUT', 40, 'Austria'),
+    ('AZE', 31, 'Azerbaijan'),
+    ('BHS', 44, 'Bahamas'),
+    ('BHR', 48, 'Bahrain'),
+    ('BGD', 50, 'Bangladesh'),
+    ('BRB', 52, 'Barbados'),
+    ('BLR', 112, 'Belarus'),
+    ('BEL', 56, 'Belgium'),
+    ('BLZ', 84, 'Belize'),
+    ('BEN', 204, 'Benin'),
+    ('BMU', 60, 'Bermuda'),
+    ('BTN', 64, 'Bhutan'),
+    ('BOL', 68, 'Bolivia'),
+    ('BES', 535, 'Caribbean Netherlands'),
+    ('BIH', 70, 'Bosnia and Herzegovina'),
+    ('BWA', 72, 'Botswana'),
+    ('BVT', 74, 'Bouvet Island'),
+    ('BRA', 76, 'Brazil'),
+    ('IOT', 86, 'British Indian Ocean Territory'),
+    ('BRN', 96, 'Brunei'),
+    ('BGR', 100, 'Bulgaria'),
+    ('BFA', 854, 'Burkina Faso'),
+    ('BDI', 108, 'Burundi'),
+    ('CPV', 132, 'Cabo Verde'),
+    ('KHM', 116, 'Cambodia'),
+    ('CMR', 120, 'Cameroon'),
+    ('CAN', 124, 'Canada'),
+    ('CYM', 136, 'Cayman Islands'),
+    ('CAF', 140, 'Central African Republic'),
+    ('TCD', 148, 'Chad'),
+    ('CHL', 152, 'Chile'),
+    ('CHN', 156, 'China'),
+    ('CXR', 162, 'Christmas Island'),
+    ('CCK', 166, 'Cocos (Keeling) Islands'),
+    ('COL', 170, 'Colombia'),
+    ('COM', 174, 'Comoros'),
+    ('COG', 178, 'Republic of the Congo'),
+    ('COD', 180, 'Democratic Republic of the Congo'),
+    ('COK', 184, 'Cook Islands'),
+    ('CRI', 188, 'Costa Rica'),
+    ('CIV', 384, 'Ivory Coast'),
+    ('HRV', 191, 'Croatia'),
+    ('CUB', 192, 'Cuba'),
+    ('CUW', 531, 'Curaçao'),
+    ('CYP', 196, 'Cyprus'),
+    ('CZE', 203, 'Czech Republic'),
+    ('DNK', 208, 'Denmark'),
+    ('DJI', 262, 'Djibouti'),
+    ('DMA', 212, 'Dominica'),
+    ('DOM', 214, 'Dominican Republic'),
+    ('ECU', 218, 'Ecuador'),
+    ('EGY', 818, 'Egypt'),
+    ('SLV', 222, 'El Salvador'),
+    ('GNQ', 226, 'Equatorial Guinea'),
+    ('ERI', 232, 'Eritrea'),
+    ('EST', 233, 'Estonia'),
+    ('SWZ', 748, 'Eswatini'),
+    ('ETH', 231, 'Ethiopia'),
+    ('FLK', 238, 'Falkland Islands'),
+    ('FRO', 234, 'Faroe Islands'),
+    ('FJI', 242, 'Fiji'),
+    ('FIN', 246, 'Finland'),
+    ('FRA', 250, 'France'),
+    ('GUF', 254, 'French Guiana'),
+    ('PYF', 258, 'French Polynesia'),
+    ('ATF', 260, 'French Southern Territories'),
+    ('GAB', 266, 'Gabon'),
+    ('GMB', 270, 'Gambia'),
+    ('GEO', 268, 'Georgia'),
+    ('DEU', 276, 'Germany'),
+    ('GHA', 288, 'Ghana'),
+    ('GIB', 292, 'Gibraltar'),
+    ('GRC', 300, 'Greece'),
+    ('GRL', 304, 'Greenland'),
+    ('GRD', 308, 'Grenada'),
+    ('GLP', 312, 'Guadeloupe'),
+    ('GUM', 316, 'Guam'),
+    ('GTM', 320, 'Guatemala'),
+    ('GGY', 831, 'Guernsey'),
+    ('GIN', 324, 'Guinea'),
+    ('GNB', 624, 'Guinea-Bissau'),
+    ('GUY', 328, 'Guyana'),
+    ('HTI', 332, 'Haiti'),
+    ('HMD', 334, 'Heard Island and McDonald Islands'),
+    ('VAT', 336, 'Vatican City'),
+    ('HND', 340, 'Honduras'),
+    ('HKG', 344, 'Hong Kong'),
+    ('HUN', 348, 'Hungary'),
+    ('ISL', 352, 'Iceland'),
+    ('IND', 356, 'India'),
+    ('IDN', 360, 'Indonesia'),
+    ('IRN', 364, 'Iran'),
+    ('IRQ', 368, 'Iraq'),
+    ('IRL', 372, 'Ireland'),
+    ('IMN', 833, 'Isle of Man'),
+    ('ISR', 376, 'Israel'),
+    ('ITA', 380, 'Italy'),
+    ('JAM', 388, 'Jamaica'),
+    ('JPN', 392, 'Japan'),
+    ('JEY', 832, 'Jersey'),
+    ('JOR', 400, 'Jordan'),
+    ('KAZ', 398, 'Kazakhstan'),
+    ('KEN', 404, 'Kenya'),
+    ('KIR', 296, 'Kiribati'),
+    ('PRK', 408, 'North Korea'),
+    ('KOR', 410, 'South Korea'),
+    ('KWT', 414, 'Kuwait'),
+    ('KGZ', 417, 'Kyrgyzstan'),
+    ('LAO', 418, 'Laos'),
+    ('LVA', 428, 'Latvia'),
+    ('LBN', 422, 'Lebanon'),
+    ('LSO', 426, 'Lesotho'),
+    ('LBR', 430, 'Liberia'),
+    ('LBY', 434, 'Libya'),
+    ('LIE', 438, 'Liechtenstein'),
+    ('LTU', 440, 'Lithuania'),
+    ('LUX', 442, 'Luxembourg'),
+    ('MAC', 446, 'Macao'),
+    ('MDG', 450, 'Madagascar'),
+    ('MWI', 454, 'Malawi'),
+    ('MYS', 458, 'Malaysia'),
+    ('MDV', 462, 'Maldives'),
+    ('MLI', 466, 'Mali'),
+    ('MLT', 470, 'Malta'),
+    ('MHL', 584, 'Marshall Islands'),
+    ('MTQ', 474, 'Martinique'),
+    ('MRT', 478, 'Mauritania'),
+    ('MUS', 480, 'Mauritius'),
+    ('MYT', 175, 'Mayotte'),
+    ('MEX', 484, 'Mexico'),
+    ('FSM', 583, 'Micronesia'),
+    ('MDA', 498, 'Moldova'),
+    ('MCO', 492, 'Monaco'),
+    ('MNG', 496, 'Mongolia'),
+    ('MNE', 499, 'Montenegro'),
+    ('MSR', 500, 'Montserrat'),
+    ('MAR', 504, 'Morocco'),
+    ('MOZ', 508, 'Mozambique'),
+    ('MMR', 104, 'Myanmar'),
+    ('NAM', 516, 'Namibia'),
+    ('NRU', 520, 'Nauru'),
+    ('NPL', 524, 'Nepal'),
+    ('NLD', 528, 'Netherlands'),
+    ('NCL', 540, 'New Caledonia'),
+    ('NZL', 554, 'New Zealand'),
+    ('NIC', 558, 'Nicaragua'),
+    ('NER', 562, 'Niger'),
+    ('NGA', 566, 'Nigeria'),
+    ('NIU', 570, 'Niue'),
+    ('NFK', 574, 'Norfolk Island'),
+    ('MKD', 807, 'North Macedonia'),
+    ('MNP', 580, 'Northern Mariana Islands'),
+    ('NOR', 578, 'Norway'),
+    ('OMN', 512, 'Oman'),
+    ('PAK', 586, 'Pakistan'),
+    ('PLW', 585, 'Palau'),
+    ('PSE', 275, 'Palestine'),
+    ('PAN', 591, 'Panama'),
+    ('PNG', 598, 'Papua New Guinea'),
+    ('PRY', 600, 'Paraguay'),
+    ('PER', 604, 'Peru'),
+    ('PHL', 608, 'Philippines'),
+    ('PCN', 612, 'Pitcairn Islands'),
+    ('POL', 616, 'Poland'),
+    ('PRT', 620, 'Portugal'),
+    ('PRI', 630, 'Puerto Rico'),
+    ('QAT', 634, 'Qatar'),
+    ('REU', 638, 'Réunion'),
+    ('ROU', 642, 'Romania'),
+    ('RUS', 643, 'Russia'),
+    ('RWA', 646, 'Rwanda'),
+    ('BLM', 652, 'Saint Barthélemy'),
+    ('SHN', 654, 'Saint Helena'),
+    ('KNA', 659, 'Saint Kitts and Nevis'),
+    ('LCA', 662, 'Saint Lucia'),
+    ('MAF', 663, 'Saint Martin'),
+    ('SPM', 666, 'Saint Pierre and Miquelon'),
+    ('VCT', 670, 'Saint Vincent and the Grenadines'),
+    ('WSM', 882, 'Samoa'),
+    ('SMR', 674, 'San Marino'),
+    ('STP', 678, 'Sao Tome and Principe'),
+    ('SAU', 682, 'Saudi Arabia'),
+    ('SEN', 686, 'Senegal'),
+    ('SRB', 688, 'Serbia'),
+    ('SYC', 690, 'Seychelles'),
+    ('SLE', 694, 'Sierra Leone'),
+    ('SGP', 702, 'Singapore'),
+    ('SXM', 534, 'Sint Maarten'),
+    ('SVK', 703, 'Slovakia'),
+    ('SVN', 705, 'Slovenia'),
+    ('SLB', 90, 'Solomon Islands'),
+    ('SOM', 706, 'Somalia'),
+    ('ZAF', 710, 'South Africa'),
+    ('SGS', 239, 'South Georgia and the South Sandwich Islands'),
+    ('SSD', 728, 'South Sudan'),
+    ('ESP', 724, 'Spain'),
+    ('LKA', 144, 'Sri Lanka'),
+    ('SDN', 729, 'Sudan'),
+    ('SUR', 740, 'Suriname'),
+    ('SJM', 744, 'Svalbard and Jan Mayen'),
+    ('SWE', 752, 'Sweden'),
+    ('CHE', 756, 'Switzerland'),
+    ('SYR', 760, 'Syria'),
+    ('TWN', 158, 'Taiwan'),
+    ('TJK', 762, 'Tajikistan'),
+    ('TZA', 834, 'Tanzania'),
+    ('THA', 764, 'Thailand'),
+    ('TLS', 626, 'Timor-Leste'),
+    ('TGO', 768, 'Togo'),
+    ('TKL', 772, 'Tokelau'),
+    ('TON', 776, 'Tonga'),
+    ('TTO', 780, 'Trinidad and Tobago'),
+    ('TUN', 788, 'Tunisia'),
+    ('TUR', 792, 'Turkey'),
+    ('TKM', 795, 'Turkmenistan'),
+    ('TCA', 796, 'Turks and Caicos Islands'),
+    ('TUV', 798, 'Tuvalu'),
+    ('UGA', 800, 'Uganda'),
+    ('UKR', 804, 'Ukraine'),
+    ('ARE', 784, 'United Arab Emirates'),
+    ('GBR', 826, 'United Kingdom'),
+    ('USA', 840, 'United States'),
+    ('UMI', 581, 'United States Minor Outlying Islands'),
+    ('URY', 858, 'Uruguay'),
+    ('UZB', 860, 'Uzbekistan'),
+    ('VUT', 548, 'Vanuatu'),
+    ('VEN', 862, 'Venezuela'),
+    ('VNM', 704, 'Vietnam'),
+    ('VGB', 92, 'British Virgin Islands'),
+    ('VIR', 850, 'U.S. Virgin Islands'),
+    ('WLF', 876, 'Wallis and Futuna'),
+    ('ESH', 732, 'Western Sahara'),
+    ('YEM', 887, 'Yemen'),
+    ('ZMB', 894, 'Zambia'),
+    ('ZWE', 716, 'Zimbabwe'),
+)
+
+# Other names used for a country -> its alpha-3 code; historical states map to their main successor
+COUNTRY_ALIASES = {
+    'United States of America': 'USA', 'USA': 'USA', 'US': 'USA', 'U.S.': 'USA',
+    'UK': 'GBR', 'Great Britain': 'GBR', 'England': 'GBR', 'Scotland': 'GBR', 'Wales': 'GBR',
+    'Northern Ireland': 'GBR',
+    'Soviet Union': 'RUS', 'USSR': 'RUS', 'Russian Federation': 'RUS',
+    'West Germany': 'DEU', 'East Germany': 'DEU',
+    'Czechia': 'CZE', 'Czechoslovakia': 'CZE',
+    'Yugoslavia': 'SRB', 'Serbia and Montenegro': 'SRB',
+    'Korea': 'KOR', 'Republic of Korea': 'KOR', 'Korea, South': 'KOR',
+    "Democratic People's Republic of Korea": 'PRK', 'Korea, North': 'PRK',
+    'Holy See': 'VAT', 'Vatican': 'VAT',
+    "Côte d'Ivoire": 'CIV', "Cote d'Ivoire": 'CIV',
+    'Cape Verde': 'CPV', 'Swaziland': 'SWZ', 'Macedonia': 'MKD', 'Burma': 'MMR',
+    'East Timor': 'TLS', 'Macau': 'MAC', 'Türkiye': 'TUR', 'Viet Nam': 'VNM',
+    'The Bahamas': 'BHS', 'The Gambia': 'GMB', 'Brunei Darussalam': 'BRN', 'Lao PDR': 'LAO',
+    'Syrian Arab Republic': 'SYR', 'Iran, Islamic Republic of': 'IRN', 'Republic of Moldova': 'MDA',
+    'United Republic of Tanzania': 'TZA', 'Palestinian Territories': 'PSE', 'State of Palestine': 'PSE',
+    'Congo': 'COG', 'Congo-Brazzaville': 'COG', 'Congo-Kinshasa': 'COD', 'DR Congo': 'COD',
+    'Democratic Republic of Congo': 'COD', 'Zaire': 'COD',
+    'Bonaire, Sint Eustatius and Saba': 'BES', 'Pitcairn': 'PCN', 'Saint Martin (French part)': 'MAF',
+    'Sint Maarten (Dutch part)': 'SXM', 'Federated States of Micronesia': 'FSM',
+    'Falkland Islands (Malvinas)': 'FLK', 'Virgin Islands, British': 'VGB', 'Virgin Islands, U.S.': 'VIR',
+    'Saint Helena, Ascension and Tristan da Cunha': 'SHN', 'Reunion': 'REU', 'Curacao': 'CUW',
+    'Aland Islands': 'ALA', 'Saint Barthelemy': 'BLM',
+    'Slovak Republic': 'SVK', 'Kyrgyz Republic': 'KGZ', 'Korea, Rep.': 'KOR', 'Korea, Dem. Rep.': 'PRK',
+    'Congo, Rep.': 'COG', 'Congo, Dem. Rep.': 'COD', 'Egypt, Arab Rep.': 'EGY', 'Yemen, Rep.': 'YEM',
+    'Hong Kong, China': 'HKG', 'Hong Kong SAR': 'HKG', 'Macao SAR': 'MAC', 'West Bank and Gaza': 'PSE',
+    'Central African Rep.': 'CAF', 'Saint Vincent': 'VCT',
+}
+
+# Numeric codes are below 1000: arrays indexed by numeric code
+N_CODES = 1000
+ISO3_BY_CODE = np.full(N_CODES, '', dtype=object)
+NAME_BY_CODE = np.full(N_CODES, '', dtype=object)
+for _alpha3, _code, _name in ISO_COUNTRIES:
+    ISO3_BY_CODE[_code] = _alpha3
+    NAME_BY_CODE[_code] = _name
+
+def _normalize(name):
+    """Lookup form of a country name: case-folded, trimmed, '&' and 'St' spelled out."""
+    name = ' '.join(name.casefold().replace('&', ' and ').split()).rstrip(',.;').strip()
+    if name.startswith(('st ', 'st. ')):
+        name = 'saint ' + name.split(' ', 1)[1]
+    return name
+
+_CODE_BY_ALPHA3 = {alpha3: code for alpha3, code, _ in ISO_COUNTRIES}
+_CODE_BY_NAME = {_normalize(name): code for _, code, name in ISO_COUNTRIES}
+_CODE_BY_NAME.update({_normalize(alpha3): code for alpha3, code in _CODE_BY_ALPHA3.items()})
+_CODE_BY_NAME.update({_normalize(alias): _CODE_BY_ALPHA3[alpha3] for alias, alpha3 in COUNTRY_ALIASES.items()})
+
+def country_code(name):
+    """ISO 3166-1 numeric code of a country name, or -1 when it is missing or unknown."""
+    if not isinstance(name, str):
+        return -1
+    return _CODE_BY_NAME.get(_normalize(name), -1)
+
+def country_codes(names):
+    """
+    ISO 3166-1 numeric code of each country name.
+
+    Each distinct name is looked up once, so the cost follows the number of
+    distinct names rather than the number of titles.
+
+    Parameters:
+    -----------
+    names : array-like of str
+        Country names; missing values are allowed
+
+    Returns:
+    --------
+    np.ndarray
+        int16 code per name, -1 where the name is missing or unknown
+    """
+    positions, uniques = pd.factorize(pd.Series(names, copy=False))
+    lookup = np.array([country_code(name) for name in uniques] + [-1], dtype=np.int16)
+    # factorize marks missing values with -1, the last entry of the lookup
+    return lookup[positions]
+
+def unmapped_countries(names, missing=('Unknown', '')):
+    """
+    Country names without an ISO code, with the number of times each occurs.
+
+    Parameters:
+    -----------
+    names : array-like of str
+        Country names (one per title, or every listed country)
+    missing : tuple of str
+        Placeholders for an absent country, which are not reported
+
+    Returns:
+    --------
+    pd.Series
+        Occurrences per unmapped name, most frequent first
+    """
+    names = pd.Series(names, copy=False).dropna()
+    counts = names[~names.str.strip().isin(missing)].value_counts()
+    return counts[country_codes(counts.index) < 0]
+
+def code_counts(codes, weights=None):
+    """
+    Titles (or weights) per ISO numeric code, as one bincount.
+
+    Parameters:
+    -----------
+    codes : np.ndarray
+        Numeric codes; negative codes (no country) are skipped
+    weights : np.ndarray, optional
+        Weight of each code, e.g. a fractional share of a title
+
+    Returns:
+    --------
+    np.ndarray
+        Array of N_CODES totals indexed by numeric code
+    """
+    known = codes >= 0
+    return np.bincount(codes[known], weights=None if weights is None else weights[known], minlength=N_CODES)
+
+def country_attribution(mv):
+    """
+    Distinct ISO codes listed by each title.
+
+    Parameters:
+    -----------
+    mv : MultiValueColumn
+        ``country_list`` of the catalog
+
+    Returns:
+    --------
+    MultiValueColumn
+        Row-aligned with ``mv``; its vocabulary is the numeric codes
+        themselves, so values are codes. Unknown names are dropped, and a
+        country listed under two names (e.g. 'Germany' and 'West Germany')
+        is listed once.
+    """
+    rows, codes = explode_rows(mv)
+    iso = country_codes(mv.vocab)[codes]
+    known = iso >= 0
+    # Sorting the (row, code) keys orders every row's codes; the values are
+    # already grouped by row, which the stable sort exploits
+    keys = np.sort(rows[known].astype(np.int64) * N_CODES + iso[known], kind='stable')
+    keys = keys[np.append(True, keys[1:] != keys[:-1])]
+    offsets = np.zeros(mv.n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys // N_CODES, minlength=mv.n_rows), out=offsets[1:])
+    return MultiValueColumn(offsets, (keys % N_CODES).astype(np.int32), np.arange(N_CODES))
+
+def attributed_counts(attribution, rows=None, fractional=False):
+    """
+    Titles per ISO code, crediting every country a title lists.
+
+    Parameters:
+    -----------
+    attribution : MultiValueColumn
+        Built by country_attribution
+    rows : array-like of int, optional
+        Row positions to count (e.g. the rows matching the filters); all
+        rows when omitted
+    fractional : bool
+        Split each title evenly across its countries instead of counting it
+        fully for each, so the totals add up to the titles with a known
+        country
+
+    Returns:
+    --------
+    np.ndarray
+        Array of N_CODES totals indexed by numeric code
+    """
+    _, codes = explode_rows(attribution, rows)
+    if not fractional:
+        return code_counts(codes)
+    lengths = attribution.lengths() if rows is None else attribution.lengths()[np.asarray(rows, dtype=np.int64)]
+    lengths = lengths[lengths > 0]
+    return code_counts(codes, np.repeat(1.0 / lengths, lengths))
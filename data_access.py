@@ -0,0 +1,232 @@
+"""
+Netflix Content Analytics - Shared Data Layer
+=============================================
+One process-wide, read-only catalog shared by every Streamlit page and
+browser session.
+
+``get_catalog()`` is backed by ``st.cache_resource``: the catalog is loaded
+once per process and every rerun of every session receives the same object,
+without the pickle round-trip of ``st.cache_data``. Pages must treat it as
+immutable and derive filtered views instead of modifying it in place.
+
+The titles are opened from the memory-mapped catalog store when it exists,
+so a restarted server process maps the file instead of parsing it, and all
+server processes on a machine share the same OS page cache. The filter
+indexes and the map's country attribution are built on first use, and the
+row fingerprint that matches the prebuilt search and similarity indexes is
+read from the store rather than recomputed.
+"""
+
+import functools
+from dataclasses import dataclass
+
+import pandas as pd
+import streamlit as st
+
+from filter_index import FilterIndex, InvertedIndex, intersect_rows
+from eda_preprocessing import (
+    load_and_clean_data, load_processed_data, load_multivalue_columns, load_catalog_store, rows_fingerprint
+)
+from multivalue import MULTIVALUE_COLUMNS, encode_multivalue
+from aggregations import build_count_cube, build_leaderboards, leaderboard_lookup
+from collaboration import load_collaboration_graph
+from compaction import compact_dtypes
+from search_index import SearchIndex, build_search_index, read_search_index
+from similarity import SimilarityIndex, build_embeddings, read_similarity_index
+from figure_cache import FigureCache
+from data_table import SortIndex
+from countries import country_codes, country_attribution
+
+RAW_DATA_PATH = 'netflix_titles.csv'
+PROCESSED_CSV_PATH = 'netflix_titles_processed.csv'
+PROCESSED_PARQUET_PATH = 'netflix_titles_processed.parquet'
+CUBE_PARQUET_PATH = 'netflix_titles_cube.parquet'
+CATALOG_STORE_PATH = 'netflix_titles_catalog.arrow'
+LEADERBOARDS_PATH = 'netflix_titles_leaderboards.parquet'
+SEARCH_INDEX_PATH = 'netflix_titles_search.npz'
+SIMILARITY_INDEX_PATH = 'netflix_titles_similar.npy'
+COLLABORATION_CACHE_PATH = 'netflix_collaboration.npz'
+
+# Multi-valued columns with a token -> titles index: any-listed filters and the people index
+TOKEN_INDEX_COLUMNS = ['country_list', 'genres', 'cast_list', 'director_list']
+
+@dataclass(frozen=True)
+class Catalog:
+    """Immutable, process-wide Netflix catalog."""
+    titles: pd.DataFrame  # one row per title, RangeIndex = row id, compact dtypes
+    multivalue: dict      # column name -> MultiValueColumn, row-aligned with titles
+    filter_index: FilterIndex  # bitsets for the Dashboard sidebar filters
+    token_index: dict     # TOKEN_INDEX_COLUMNS name -> InvertedIndex (token/person -> titles)
+    cube: pd.DataFrame    # title counts per CUBE_DIMENSIONS cell
+    cube_index: FilterIndex  # the same filters, resolved over cube cells
+    leaderboards: dict    # (dimension, type, dated) -> top-k title counts, in rank order
+    search: SearchIndex   # BM25 postings over title and description
+    similar: SimilarityIndex  # title embeddings (memory-mapped) for "titles like this"
+    sort_index: SortIndex  # per-column row orders for the data table, built on first sort
+
+    @functools.cached_property
+    def country_iso(self):
+        """Distinct ISO codes of every listed country, per title (map attribution), built on first use."""
+        return country_attribution(self.multivalue['country_list'])
+
+def _load_titles():
+    """Load the processed titles, preferring the columnar artifact."""
+    try:
+        # Columnar artifact: dates and periods are already typed, no parsing needed
+        return load_processed_data(PROCESSED_PARQUET_PATH)
+    except (FileNotFoundError, ImportError):
+        pass
+
+    try:
+        df = pd.read_csv(PROCESSED_CSV_PATH)
+        df['date_added'] = pd.to_datetime(df['date_added'], errors='coerce')
+        df['year_month'] = df['date_added'].dt.to_period('M')
+        return df.drop(columns=['genres'])
+    except FileNotFoundError:
+        df = load_and_clean_data(RAW_DATA_PATH)
+        return df.drop(columns=['genres', 'country_list'])
+
+def _load_multivalue(titles):
+    """Load the list-valued columns, encoding them from the text columns if needed."""
+    try:
+        return load_multivalue_columns(PROCESSED_PARQUET_PATH)
+    except (FileNotFoundError, ImportError):
+        return {name: encode_multivalue(titles[source]) for name, source in MULTIVALUE_COLUMNS.items()}
+
+def _load_store():
+    """Open the memory-mapped catalog store, or load and compact the other artifacts."""
+    try:
+        titles, multivalue, fingerprint = load_catalog_store(CATALOG_STORE_PATH)
+    except (FileNotFoundError, ImportError):
+        titles = _load_titles().reset_index(drop=True)
+        titles, multivalue, fingerprint = compact_dtypes(titles), _load_multivalue(titles), ''
+    if not fingerprint:
+        # Stores written before the fingerprint was saved, and the other artifacts
+        fingerprint = rows_fingerprint(titles['show_id'], titles['content_hash'])
+    return titles, multivalue, fingerprint
+
+def _load_cube(titles):
+    """Load the precomputed count cube, building it from the titles if needed."""
+    try:
+        return pd.read_parquet(CUBE_PARQUET_PATH)
+    except (FileNotFoundError, ImportError):
+        return build_count_cube(titles)
+
+def _load_leaderboards(cube):
+    """Load the precomputed leaderboards, building them from the cube if needed."""
+    try:
+        leaderboards = pd.read_parquet(LEADERBOARDS_PATH)
+    except (FileNotFoundError, ImportError):
+        leaderboards = build_leaderboards(cube)
+    return leaderboard_lookup(leaderboards)
+
+def _load_search(titles, fingerprint):
+    """Load the prebuilt search index, building it from the titles if needed."""
+    try:
+        search = read_search_index(SEARCH_INDEX_PATH)
+        # An index built from other rows (or by an older version) would point at the wrong titles
+        if search.fingerprint == fingerprint:
+            return search
+    except FileNotFoundError:
+        pass
+    return build_search_index(titles['title'], titles['description'])
+
+def _load_similarity(titles, multivalue, fingerprint):
+    """Memory-map the prebuilt similarity index, building it in memory if needed."""
+    try:
+        similar = read_similarity_index(SIMILARITY_INDEX_PATH)
+        if similar.fingerprint == fingerprint:
+            return similar
+    except FileNotFoundError:
+        pass
+    return SimilarityIndex(build_embeddings(titles['description'], multivalue))
+
+def filter_key(equals=None, value_range=None, tokens=None):
+    """
+    Hashable key of a Dashboard filter state; 'All' selections are dropped.
+
+    Parameters:
+    -----------
+    equals : dict, optional
+        Column -> value equality filters (see FilterIndex.bitset)
+    value_range : tuple, optional
+        Inclusive year_added range
+    tokens : dict, optional
+        TOKEN_INDEX_COLUMNS name -> token every title must list
+
+    Returns:
+    --------
+    tuple
+        (equals items, value_range, token items), usable as a cache key
+    """
+    return (
+        tuple(sorted((column, value) for column, value in (equals or {}).items() if value != 'All')),
+        None if value_range is None else tuple(int(bound) for bound in value_range),
+        tuple(sorted((column, token) for column, token in (tokens or {}).items() if token != 'All')),
+    )
+
+def filter_rows(catalog, key):
+    """Sorted row ids of the titles matching a filter_key."""
+    equals, value_range, tokens = key
+    token_rows = intersect_rows([catalog.token_index[column].rows(token) for column, token in tokens])
+    return catalog.filter_index.rows(dict(equals), value_range, within=token_rows)
+
+@st.cache_resource(show_spinner="Loading Netflix catalog...")
+def get_catalog():
+    """
+    Return the shared catalog, loading it on first use in this process.
+
+    Returns:
+    --------
+    Catalog
+        The same object for every page, session and rerun
+    """
+    titles, multivalue, fingerprint = _load_store()
+    if 'primary_country_iso' not in titles.columns:
+        # Artifacts written before the ISO code column existed
+        titles = titles.assign(primary_country_iso=country_codes(titles['primary_country']))
+    for mv in multivalue.values():
+        for array in (mv.offsets, mv.codes, mv.vocab):
+            array.flags.writeable = False
+    cube = _load_cube(titles)
+    # Prebuilt indexes are only served against the rows they were built from
+    return Catalog(
+        titles=titles,
+        multivalue=multivalue,
+        filter_index=FilterIndex(titles),
+        token_index={name: InvertedIndex(multivalue[name]) for name in TOKEN_INDEX_COLUMNS},
+        cube=cube,
+        cube_index=FilterIndex(cube),
+        leaderboards=_load_leaderboards(cube),
+        search=_load_search(titles, fingerprint),
+        similar=_load_similarity(titles, multivalue, fingerprint),
+        sort_index=SortIndex(titles)
+    )
+
+@st.cache_resource(show_spinner="Building collaboration graph...")
+def get_collaboration_graph():
+    """
+    Return the shared cast/director collaboration graph.
+
+    Read from the on-disk cache when it was built from the current credits,
+    otherwise built from the catalog and written back to the cache.
+
+    Returns:
+    --------
+    CollaborationGraph
+        The same object for every session and rerun
+    """
+    multivalue = get_catalog().multivalue
+    return load_collaboration_graph(multivalue['cast_list'], multivalue['director_list'], COLLABORATION_CACHE_PATH)
+
+@st.cache_resource
+def get_figure_cache():
+    """
+    Return the figure cache shared by every session of this process.
+
+    Returns:
+    --------
+    FigureCache
+        Byte-bounded LRU cache of Dashboard figures keyed by filter state
+    """
+    return FigureCache()
@@ -0,0 +1,219 @@
+"""
+Netflix Content Analytics - Paginated Data Table
+================================================
+Server-side paging, sorting and CSV export for the Detailed Data View.
+
+The table never materializes the filtered titles. Sorting works on row
+ids: each column gets an integer sort key per title (its rank among the
+column's distinct values, missing values last) and a stable row order over
+the whole catalog, both computed on the first sort by that column. A small
+selection is sorted by its keys; a large one is read off the catalog-wide
+order through a membership mask, which costs one pass over the row ids and
+no comparison sort. Only the rows of the visible page are then taken from
+the catalog and sent to the browser.
+
+Columns listed in ``SORT_COLUMNS`` sort by parsed values instead of their
+text: ``duration`` ranks movies by minutes, then TV shows by seasons, so
+"99 min" no longer outranks a 312-minute film or "17 Seasons".
+
+The CSV export is generated only when the user clicks the download button
+(``st.download_button`` with a callable). The selection is encoded
+``CSV_CHUNK_ROWS`` rows at a time into a temporary file and read back once,
+so no copy of the selected rows is made. Streamlit then keeps the returned
+bytes in its in-memory media storage while the session references them, so
+each export still costs one CSV of the selection in server memory; larger
+selections than ``CSV_EXPORT_MAX_ROWS`` are not offered for export.
+"""
+
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Selections smaller than n_rows / SORT_SUBSET_RATIO are sorted directly
+SORT_SUBSET_RATIO = 16
+
+# Rows encoded per CSV chunk
+CSV_CHUNK_ROWS = 50_000
+
+# Largest selection offered for CSV export (the file is held in server memory once generated)
+CSV_EXPORT_MAX_ROWS = 500_000
+
+# Table column -> numeric columns it sorts by, one group per column in this order
+SORT_COLUMNS = {
+    'duration': ['duration_minutes', 'num_seasons'],
+}
+
+def sort_keys(values, descending=False):
+    """
+    Integer sort key of each value: its rank among the distinct values.
+
+    Categoricals rank in category order; missing values rank last in
+    either direction.
+
+    Returns:
+    --------
+    np.ndarray
+        int64 array, row-aligned with ``values``
+    """
+    codes, uniques = pd.factorize(values, sort=True)
+    if descending:
+        codes = np.where(codes < 0, codes, len(uniques) - 1 - codes)
+    return np.where(codes < 0, len(uniques), codes).astype(np.int64)
+
+def grouped_sort_keys(columns, descending=False):
+    """
+    Integer sort key of each row over several columns, one group per column.
+
+    Each row is keyed by the first column that has a value, and the groups
+    follow the column order in either direction: with minutes then seasons,
+    every movie sorts before every TV show. Rows without any value rank last.
+
+    Parameters:
+    -----------
+    columns : list of pd.Series
+        Row-aligned columns, typically at most one non-missing per row
+    descending : bool
+        Sort direction within each group
+
+    Returns:
+    --------
+    np.ndarray
+        int64 array, row-aligned with the columns
+    """
+    keys = np.full(len(columns[0]), -1, dtype=np.int64)
+    offset = 0
+    for values in columns:
+        missing = np.asarray(pd.isna(values))
+        column_keys = sort_keys(values, descending)
+        take = (keys < 0) & ~missing
+        keys[take] = column_keys[take] + offset
+        offset += int(column_keys[~missing].max(initial=-1)) + 1
+    keys[keys < 0] = offset
+    return keys
+
+class SortIndex:
+    """
+    Catalog-wide sort orders of the table columns, built per column on first use.
+
+    Parameters:
+    -----------
+    titles : pd.DataFrame
+        Catalog with one row per title; row ids are positions in this frame
+    """
+
+    def __init__(self, titles):
+        self.titles = titles
+        self.n_rows = len(titles)
+        self._keys = {}
+        self._orders = {}
+        self._lock = threading.Lock()
+
+    def keys(self, column, descending=False):
+        """Sort key per row (see sort_keys)."""
+        with self._lock:
+            keys = self._keys.get((column, descending))
+        if keys is None:
+            sources = SORT_COLUMNS.get(column)
+            if sources is None:
+                keys = sort_keys(self.titles[column], descending)
+            else:
+                keys = grouped_sort_keys([self.titles[source] for source in sources], descending)
+            with self._lock:
+                self._keys[(column, descending)] = keys
+        return keys
+
+    def order(self, column, descending=False):
+        """All row ids sorted by ``column`` (ties in row order)."""
+        with self._lock:
+            order = self._orders.get((column, descending))
+        if order is None:
+            order = np.argsort(self.keys(column, descending), kind='stable')
+            with self._lock:
+                self._orders[(column, descending)] = order
+        return order
+
+    def sort(self, rows, column, descending=False):
+        """
+        Sort a selection of row ids by a column.
+
+        Parameters:
+        -----------
+        rows : np.ndarray
+            Sorted, duplicate-free row ids (e.g. the rows matching the filters)
+        column : str
+            Column to sort by
+        descending : bool
+            Sort direction; missing values come last either way
+
+        Returns:
+        --------
+        np.ndarray
+            ``rows`` in sorted order, ties in row order
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) * SORT_SUBSET_RATIO < self.n_rows:
+            return rows[np.argsort(self.keys(column, descending)[rows], kind='stable')]
+        order = self.order(column, descending)
+        selected = np.zeros(self.n_rows, dtype=bool)
+        selected[rows] = True
+        return order[selected[order]]
+
+def page_bounds(n_rows, page, page_size):
+    """(first, stop) positions of 1-based ``page``, clamped to the last page."""
+    n_pages = max(1, -(-n_rows // page_size))
+    first = (min(max(page, 1), n_pages) - 1) * page_size
+    return first, min(first + page_size, n_rows)
+
+def iter_csv_chunks(titles, rows, columns, rename=None, chunk_rows=CSV_CHUNK_ROWS):
+    """
+    CSV text of selected rows, one chunk of rows at a time.
+
+    Parameters:
+    -----------
+    titles : pd.DataFrame
+        Catalog the row ids refer to
+    rows : np.ndarray
+        Row ids in output order
+    columns : list of str
+        Columns to export
+    rename : dict, optional
+        Column -> header label
+    chunk_rows : int
+        Rows per chunk
+
+    Yields:
+    -------
+    bytes
+        UTF-8 CSV; the first chunk starts with the header line
+    """
+    header = pd.DataFrame(columns=columns).rename(columns=rename or {}).to_csv(index=False)
+    yield header.encode('utf-8')
+    for start in range(0, len(rows), chunk_rows):
+        chunk_ids = rows[start:start + chunk_rows]
+        # Take only the exported columns, never the whole frame
+        chunk = pd.DataFrame({column: titles[column].take(chunk_ids) for column in columns})
+        yield chunk.to_csv(index=False, header=False).encode('utf-8')
+
+def export_csv(titles, rows, columns, rename=None, chunk_rows=CSV_CHUNK_ROWS):
+    """
+    CSV of selected rows, encoded chunk by chunk through a temporary file.
+
+    Parameters:
+    -----------
+    titles, rows, columns, rename, chunk_rows
+        As for iter_csv_chunks
+
+    Returns:
+    --------
+    bytes
+        UTF-8 CSV with a header line; the chunks are spooled to disk and
+        read back once, so they are never held alongside the whole file
+    """
+    with tempfile.TemporaryFile() as export:
+        # Buffered writes always take the whole chunk
+        for chunk in iter_csv_chunks(titles, rows, columns, rename, chunk_rows):
+            export.write(chunk)
+        export.seek(0)
+        return export.read()
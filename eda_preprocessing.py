@@ -5,13 +5,92 @@ This script performs EDA and data preprocessing for the Netflix titles dataset.
 It prepares the data for visualization in the descriptive analytics dashboard.
 """
 
+import hashlib
 import pandas as pd
 import numpy as np
 from datetime import datetime
 import warnings
+from concurrent.futures import ProcessPoolExecutor
+from parsing import parse_duration_minutes, parse_num_seasons
+from aggregations import CUBE_DIMENSIONS, build_count_cube, merge_count_cubes, build_leaderboards
+from multivalue import MULTIVALUE_COLUMNS, encode_multivalue, to_arrow, from_arrow
+from compaction import compact_dtypes
+from search_index import build_search_index, update_search_index, read_search_index, write_search_index
+from similarity import (
+    REBUILD_FRACTION, build_embeddings, count_doc_freqs, merge_doc_freqs,
+    read_similarity_stats, stats_path, write_similarity_index
+)
+from countries import country_codes, unmapped_countries
 warnings.filterwarnings('ignore')
 
-def load_and_clean_data(file_path='netflix_titles.csv'):
+# Columns of the raw netflix_titles.csv feed
+RAW_COLUMNS = [
+    'show_id', 'type', 'title', 'director', 'cast', 'country', 'date_added',
+    'release_year', 'rating', 'duration', 'listed_in', 'description'
+]
+
+# Format of the raw date_added values ("September 25, 2021"); explicit, so the
+# result never depends on which rows a partition or chunk starts with
+DATE_ADDED_FORMAT = '%B %d, %Y'
+
+# Read every raw text column as text, so a chunk where one is entirely empty keeps the type
+RAW_TEXT_DTYPES = {column: str for column in RAW_COLUMNS if column != 'release_year'}
+
+def hash_rows(df):
+    """
+    Stable 64-bit content hash of each raw row.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Raw rows with the RAW_COLUMNS columns
+        
+    Returns:
+    --------
+    np.ndarray
+        uint64 hash per row; equal rows hash equally across runs
+    """
+    return pd.util.hash_pandas_object(df[RAW_COLUMNS], index=False).to_numpy()
+
+def rows_fingerprint(show_ids, content_hashes):
+    """
+    Identity of the rows of a processed table.
+    
+    Parameters:
+    -----------
+    show_ids, content_hashes : array-like
+        ``show_id`` and ``content_hash`` columns (pandas or pyarrow)
+        
+    Returns:
+    --------
+    str
+        SHA-1 hex digest; changes when a title is added, removed, edited or
+        moved to another row
+    """
+    digest = hashlib.sha1()
+    digest.update(pd.util.hash_array(np.asarray(show_ids, dtype=object)).tobytes())
+    digest.update(np.asarray(content_hashes, dtype=np.uint64).tobytes())
+    return digest.hexdigest()
+
+def _saved_fingerprint(path):
+    """Row fingerprint stored in an ``.npz`` artifact; empty when missing or unreadable."""
+    try:
+        with np.load(path) as saved:
+            return str(saved['fingerprint'])
+    except (FileNotFoundError, KeyError, ValueError):
+        return ''
+
+def _store_fingerprint(path):
+    """Row fingerprint in the catalog store's schema metadata; empty when missing or unreadable."""
+    import pyarrow as pa
+    
+    try:
+        metadata = pa.ipc.open_file(path).schema.metadata or {}
+    except (FileNotFoundError, pa.ArrowInvalid):
+        return ''
+    return metadata.get(b'fingerprint', b'').decode()
+
+def load_and_clean_data(file_path='netflix_titles.csv', workers=1):
     """
     Load and clean the Netflix titles dataset.
     
@@ -19,6 +98,8 @@ def load_and_clean_data(file_path='netflix_titles.csv'):
     -----------
     file_path : str
         Path to the CSV file
+    workers : int
+        Worker processes for the cleaning stages (1 cleans in-process)
         
     Returns:
     --------
@@ -29,48 +110,66 @@ def load_and_clean_data(file_path='netflix_titles.csv'):
     df = pd.read_csv(file_path)
     print(f"Original dataset shape: {df.shape}")
     
+    df_clean = clean_data_parallel(df, workers)
+    
+    print(f"\nCleaned dataset shape: {df_clean.shape}")
+    print(f"Date range: {df_clean['date_added'].min()} to {df_clean['date_added'].max()}")
+    print(f"Release year range: {df_clean['release_year'].min()} to {df_clean['release_year'].max()}")
+    
+    return df_clean
+
+def clean_data(df, verbose=True):
+    """
+    Clean raw Netflix title rows and derive the dashboard features.
+    
+    Every stage is row-local, so any row range can be cleaned on its own;
+    see clean_data_parallel.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Raw rows as read from the CSV feed
+    verbose : bool
+        Print the progress of each stage
+        
+    Returns:
+    --------
+    pd.DataFrame
+        Cleaned dataset
+    """
     # Create a copy for cleaning
     df_clean = df.copy()
     
+    # Fingerprint the raw row so incremental runs can detect changes
+    df_clean['content_hash'] = hash_rows(df)
+    
     # Parse date_added column
-    print("\nProcessing date_added column...")
-    df_clean['date_added'] = pd.to_datetime(df_clean['date_added'], errors='coerce')
+    if verbose:
+        print("\nProcessing date_added column...")
+    # Some feed values carry a leading space (" August 4, 2017"); microseconds
+    # even for a batch without any date, so every chunk shares one schema
+    df_clean['date_added'] = pd.to_datetime(
+        df_clean['date_added'].astype('string').str.strip(), format=DATE_ADDED_FORMAT, errors='coerce'
+    ).astype('datetime64[us]')
     
     # Extract temporal features
-    df_clean['year_added'] = df_clean['date_added'].dt.year
-    df_clean['month_added'] = df_clean['date_added'].dt.month
+    # float64 even when a batch has no missing dates, so every chunk shares one schema
+    df_clean['year_added'] = df_clean['date_added'].dt.year.astype('float64')
+    df_clean['month_added'] = df_clean['date_added'].dt.month.astype('float64')
     df_clean['month_name'] = df_clean['date_added'].dt.strftime('%B')
     df_clean['year_month'] = df_clean['date_added'].dt.to_period('M')
     
     # Extract duration for movies (in minutes)
-    print("Processing duration column...")
-    def extract_duration(duration_str):
-        if pd.isna(duration_str):
-            return np.nan
-        if 'min' in str(duration_str):
-            try:
-                return int(str(duration_str).split()[0])
-            except:
-                return np.nan
-        return np.nan
-    
-    df_clean['duration_minutes'] = df_clean[df_clean['type'] == 'Movie']['duration'].apply(extract_duration)
+    if verbose:
+        print("Processing duration column...")
+    df_clean['duration_minutes'] = parse_duration_minutes(df_clean)
     
     # Extract number of seasons for TV Shows
-    def extract_seasons(duration_str):
-        if pd.isna(duration_str):
-            return np.nan
-        if 'Season' in str(duration_str):
-            try:
-                return int(str(duration_str).split()[0])
-            except:
-                return np.nan
-        return np.nan
-    
-    df_clean['num_seasons'] = df_clean[df_clean['type'] == 'TV Show']['duration'].apply(extract_seasons)
+    df_clean['num_seasons'] = parse_num_seasons(df_clean)
     
     # Process country column (handle multiple countries)
-    print("Processing country column...")
+    if verbose:
+        print("Processing country column...")
     df_clean['country'] = df_clean['country'].fillna('Unknown')
     df_clean['country_list'] = df_clean['country'].str.split(', ')
     
@@ -78,9 +177,14 @@ def load_and_clean_data(file_path='netflix_titles.csv'):
     df_clean['primary_country'] = df_clean['country_list'].apply(
         lambda x: x[0] if isinstance(x, list) and len(x) > 0 else 'Unknown'
     )
+    # ISO 3166-1 numeric code of the primary country (-1 if unknown), resolved once per distinct name
+    df_clean['primary_country_iso'] = country_codes(df_clean['primary_country'])
+    if verbose:
+        report_unmapped_countries(df_clean)
     
     # Process genres (listed_in column)
-    print("Processing genres...")
+    if verbose:
+        print("Processing genres...")
     df_clean['genres'] = df_clean['listed_in'].str.split(', ')
     df_clean['primary_genre'] = df_clean['genres'].apply(
         lambda x: x[0] if isinstance(x, list) and len(x) > 0 else 'Unknown'
@@ -92,10 +196,62 @@ def load_and_clean_data(file_path='netflix_titles.csv'):
     # Create decade column for release_year
     df_clean['decade'] = (df_clean['release_year'] // 10) * 10
     
-    print(f"\nCleaned dataset shape: {df_clean.shape}")
-    print(f"Date range: {df_clean['date_added'].min()} to {df_clean['date_added'].max()}")
-    print(f"Release year range: {df_clean['release_year'].min()} to {df_clean['release_year'].max()}")
+    return df_clean
+
+def report_unmapped_countries(df):
+    """Print the listed country names without an ISO code; the map cannot show their titles."""
+    unmapped = unmapped_countries(df['country_list'].explode())
+    if len(unmapped) == 0:
+        print("All listed countries resolved to ISO codes.")
+        return
+    print(f"Countries without an ISO code ({len(unmapped)} names, {unmapped.sum():,} listings):")
+    for name, count in unmapped.head(20).items():
+        print(f"  {name!r}: {count:,}")
+
+def _clean_partition(df):
+    """Worker entry point: clean one row range without progress output."""
+    return clean_data(df, verbose=False)
+
+def clean_data_parallel(df, workers=1, executor=None):
+    """
+    Clean raw rows in parallel worker processes.
     
+    The rows are split into ``workers`` contiguous row ranges, each range is
+    cleaned by clean_data in its own process, and the results are
+    concatenated in range order, so the output (values, dtypes and index) is
+    identical to ``clean_data(df)``.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Raw rows as read from the CSV feed
+    workers : int
+        Number of row ranges / worker processes; 1 cleans in-process
+    executor : concurrent.futures.Executor, optional
+        Pool to reuse across calls (e.g. one per chunked run); a pool of
+        ``workers`` processes is started and shut down when omitted
+        
+    Returns:
+    --------
+    pd.DataFrame
+        Cleaned dataset
+    """
+    n_parts = min(workers, len(df))
+    if n_parts <= 1:
+        return clean_data(df)
+    
+    print(f"\nCleaning {len(df):,} rows in {n_parts} worker processes...")
+    bounds = np.linspace(0, len(df), n_parts + 1).astype(int)
+    parts = [df.iloc[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+    
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=n_parts) as pool:
+            cleaned = list(pool.map(_clean_partition, parts))
+    else:
+        # map() yields in submission order, whatever order the workers finish in
+        cleaned = list(executor.map(_clean_partition, parts))
+    df_clean = pd.concat(cleaned)
+    report_unmapped_countries(df_clean)
     return df_clean
 
 def generate_summary_statistics(df):
@@ -151,9 +307,30 @@ def generate_summary_statistics(df):
     
     print("\n" + "="*60)
 
-def save_processed_data(df, output_path='netflix_titles_processed.csv'):
+# Columns written to the processed artifact, in output order
+PROCESSED_COLUMNS = [
+    'show_id', 'type', 'title', 'director', 'cast', 'country', 
+    'date_added', 'release_year', 'rating', 'duration', 'listed_in', 
+    'description', 'year_added', 'month_added', 'month_name', 
+    'year_month', 'duration_minutes', 'num_seasons', 'primary_country', 
+    'primary_genre', 'genres', 'decade', 'content_hash', 'primary_country_iso'
+]
+
+# Low-cardinality text columns stored dictionary-encoded in the Parquet artifact
+DICTIONARY_COLUMNS = [
+    'type', 'country', 'rating', 'duration', 'listed_in', 'month_name',
+    'primary_country', 'primary_genre'
+]
+
+def save_processed_data(df, output_path='netflix_titles_processed.csv', fmt=None):
     """
-    Save processed data to CSV.
+    Save processed data to CSV or Parquet.
+    
+    The Parquet output keeps typed columns (datetime ``date_added``, period
+    ``year_month``) and dictionary-encodes the low-cardinality text columns,
+    so it can be loaded without any string parsing. The multi-valued fields
+    (genres, countries, cast, director) are stored as Arrow list columns,
+    i.e. flat offsets + values arrays; see load_multivalue_columns.
     
     Parameters:
     -----------
@@ -161,33 +338,610 @@ def save_processed_data(df, output_path='netflix_titles_processed.csv'):
         Processed dataset
     output_path : str
         Output file path
+    fmt : str, optional
+        'csv' or 'parquet'; inferred from the file extension when omitted
     """
-    # Select relevant columns for dashboard
-    columns_to_save = [
-        'show_id', 'type', 'title', 'director', 'cast', 'country', 
-        'date_added', 'release_year', 'rating', 'duration', 'listed_in', 
-        'description', 'year_added', 'month_added', 'month_name', 
-        'year_month', 'duration_minutes', 'num_seasons', 'primary_country', 
-        'primary_genre', 'genres', 'decade'
-    ]
-    
-    df_output = df[columns_to_save].copy()
-    df_output.to_csv(output_path, index=False)
+    if fmt is None:
+        fmt = 'parquet' if output_path.endswith('.parquet') else 'csv'
+    
+    df_output = df[PROCESSED_COLUMNS]
+    
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        
+        pq.write_table(_processed_table(df), output_path, use_dictionary=DICTIONARY_COLUMNS)
+    elif fmt == 'csv':
+        df_output.to_csv(output_path, index=False)
+    else:
+        raise ValueError(f"Unsupported output format: {fmt}")
     print(f"\nProcessed data saved to: {output_path}")
 
-if __name__ == "__main__":
+def _processed_table(df):
+    """Arrow table of the Parquet artifact: scalar columns plus list-valued columns."""
+    import pyarrow as pa
+    
+    scalar_columns = [c for c in PROCESSED_COLUMNS if c not in MULTIVALUE_COLUMNS]
+    table = pa.Table.from_pandas(df[scalar_columns], preserve_index=False)
+    for name, source in MULTIVALUE_COLUMNS.items():
+        table = table.append_column(name, to_arrow(encode_multivalue(df[source])))
+    return table
+
+def load_processed_data(file_path='netflix_titles_processed.parquet'):
+    """
+    Load the scalar columns of a processed Parquet artifact.
+    
+    The list-valued columns are skipped; use load_multivalue_columns to get
+    them as flat arrays.
+    
+    Parameters:
+    -----------
+    file_path : str
+        Path to the Parquet file
+        
+    Returns:
+    --------
+    pd.DataFrame
+        Processed dataset with typed columns
+    """
+    import pyarrow.parquet as pq
+    
+    columns = [c for c in pq.read_schema(file_path).names if c not in MULTIVALUE_COLUMNS]
+    return pd.read_parquet(file_path, engine='pyarrow', columns=columns)
+
+def load_multivalue_columns(file_path='netflix_titles_processed.parquet', names=None):
+    """
+    Load the list-valued columns of a processed Parquet artifact.
+    
+    Parameters:
+    -----------
+    file_path : str
+        Path to the Parquet file
+    names : list of str, optional
+        Columns to load (default: all of MULTIVALUE_COLUMNS)
+        
+    Returns:
+    --------
+    dict
+        Column name -> MultiValueColumn (offsets, codes, vocab)
+    """
+    import pyarrow.parquet as pq
+    
+    names = list(MULTIVALUE_COLUMNS) if names is None else names
+    table = pq.read_table(file_path, columns=names)
+    return {name: from_arrow(table.column(name)) for name in names}
+
+def save_catalog_store(table, output_path='netflix_titles_catalog.arrow'):
+    """
+    Save the memory-mappable catalog store opened by the dashboard.
+    
+    The store is an uncompressed Arrow IPC file holding the processed table
+    with the compact in-memory dtypes already applied (see compaction), so
+    opening it is a memory map plus metadata parsing: column data is paged
+    in by the OS on first access and shared between every process that maps
+    the file. The row fingerprint is kept in the schema metadata, so the
+    dashboard can match the prebuilt indexes without rehashing every row.
+    
+    Parameters:
+    -----------
+    table : pyarrow.Table
+        Processed table (scalar and list-valued columns), as built by
+        _processed_table or read from the Parquet artifact
+    output_path : str
+        Output Arrow IPC file path
+    """
+    import pyarrow as pa
+    
+    scalar_columns = [c for c in table.column_names if c not in MULTIVALUE_COLUMNS]
+    titles = compact_dtypes(table.select(scalar_columns).to_pandas())
+    store = pa.Table.from_pandas(titles, preserve_index=False)
+    for name in MULTIVALUE_COLUMNS:
+        store = store.append_column(name, table.column(name))
+    # The IPC file format allows a single dictionary per column
+    store = store.unify_dictionaries()
+    fingerprint = rows_fingerprint(table['show_id'], table['content_hash'])
+    store = store.replace_schema_metadata({**(store.schema.metadata or {}), b'fingerprint': fingerprint.encode()})
+    
+    with pa.OSFile(output_path, 'wb') as sink, pa.ipc.new_file(sink, store.schema) as writer:
+        writer.write_table(store)
+    print(f"Catalog store saved to: {output_path}")
+
+def load_catalog_store(file_path='netflix_titles_catalog.arrow'):
+    """
+    Open the catalog store as a memory map.
+    
+    Parameters:
+    -----------
+    file_path : str
+        Path to the Arrow IPC file
+        
+    Returns:
+    --------
+    tuple
+        (titles, multivalue, fingerprint): the scalar columns as a DataFrame
+        with compact dtypes, column name -> MultiValueColumn for the list
+        columns, and the saved rows_fingerprint (empty for stores written
+        without one); text and fixed-width columns without missing values
+        reference the mapped pages instead of being copied
+    """
+    import pyarrow as pa
+    
+    table = pa.ipc.open_file(pa.memory_map(file_path)).read_all()
+    scalar_columns = [c for c in table.column_names if c not in MULTIVALUE_COLUMNS]
+    # split_blocks avoids consolidating same-typed columns into copied 2-D blocks
+    titles = table.select(scalar_columns).to_pandas(split_blocks=True)
+    multivalue = {name: from_arrow(table.column(name)) for name in MULTIVALUE_COLUMNS}
+    fingerprint = (table.schema.metadata or {}).get(b'fingerprint', b'').decode()
+    return titles, multivalue, fingerprint
+
+def save_count_cube(df, output_path='netflix_titles_cube.parquet'):
+    """
+    Save the pre-aggregated title count cube used by the dashboard charts.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Processed dataset
+    output_path : str
+        Output Parquet file path
+        
+    Returns:
+    --------
+    pd.DataFrame
+        The saved cube
+    """
+    cube = build_count_cube(df)
+    cube.to_parquet(output_path, index=False, engine='pyarrow')
+    print(f"Count cube saved to: {output_path} ({len(cube):,} cells for {len(df):,} titles)")
+    return cube
+
+def save_leaderboards(cube, output_path='netflix_titles_leaderboards.parquet'):
+    """
+    Save the top-k leaderboards behind the dashboard sidebar and top-k charts.
+    
+    Parameters:
+    -----------
+    cube : pd.DataFrame
+        Count cube of the whole catalog
+    output_path : str
+        Output Parquet file path
+    """
+    leaderboards = build_leaderboards(cube)
+    leaderboards.to_parquet(output_path, index=False, engine='pyarrow')
+    print(f"Leaderboards saved to: {output_path}")
+
+def save_search_index(df, output_path='netflix_titles_search.npz'):
+    """
+    Save the full-text search index over the titles and descriptions.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame or pyarrow.Table
+        Processed dataset with ``title``, ``description``, ``show_id`` and
+        ``content_hash`` columns; row ids of the index are positions in it
+    output_path : str
+        Output ``.npz`` file path
+    """
+    index = build_search_index(df['title'], df['description'])
+    index.fingerprint = rows_fingerprint(df['show_id'], df['content_hash'])
+    write_search_index(index, output_path)
+    print(f"Search index saved to: {output_path} ({len(index.vocab):,} terms)")
+
+def _update_search_index(existing, merged, delta, kept_rows, kept_positions, delta_positions, output_path):
+    """
+    Patch the saved search index with the delta of an incremental update.
+    
+    Only the delta's text is tokenized. The index is rebuilt from ``merged``
+    instead when the saved one does not belong to the ``existing`` rows
+    (missing, written by an older version, or left over from another table).
+    """
+    if _saved_fingerprint(output_path) != rows_fingerprint(existing['show_id'], existing['content_hash']):
+        print("Search index does not match the existing artifact, rebuilding it...")
+        save_search_index(merged, output_path)
+        return
+    index = update_search_index(
+        read_search_index(output_path), kept_rows, kept_positions,
+        delta['title'], delta['description'], delta_positions, merged.num_rows
+    )
+    index.fingerprint = rows_fingerprint(merged['show_id'], merged['content_hash'])
+    write_search_index(index, output_path)
+    print(f"Search index updated: {output_path} ({len(index.vocab):,} terms)")
+
+def save_similarity_index(table, output_path='netflix_titles_similar.npy'):
+    """
+    Save the similar-titles index memory-mapped by the dashboard.
+    
+    Parameters:
+    -----------
+    table : pyarrow.Table
+        Processed table (scalar and list-valued columns), as built by
+        _processed_table or read from the Parquet artifact
+    output_path : str
+        Output ``.npy`` file path; the document frequencies and row
+        fingerprint are written next to it (see similarity.stats_path)
+    """
+    multivalue = {name: from_arrow(table.column(name)) for name in MULTIVALUE_COLUMNS}
+    doc_freqs = count_doc_freqs(table['description'], multivalue)
+    embeddings = build_embeddings(table['description'], multivalue, doc_freqs=doc_freqs, n_docs=table.num_rows)
+    fingerprint = rows_fingerprint(table['show_id'], table['content_hash'])
+    write_similarity_index(embeddings, output_path, fingerprint, doc_freqs)
+    print(f"Similarity index saved to: {output_path} ({embeddings.shape[1]} dimensions)")
+
+def _update_similarity_index(existing, merged, delta, replaced, kept_rows, kept_positions, delta_positions,
+                             output_path):
+    """
+    Patch the saved similarity index with the delta of an incremental update.
+    
+    Only the delta is embedded, with the saved document frequencies patched
+    by its features; the kept rows are copied from the saved embeddings.
+    The index is rebuilt from ``merged`` instead when the saved one does not
+    belong to the ``existing`` rows, or when the rows changed since the last
+    full build exceed similarity.REBUILD_FRACTION of the catalog (the kept
+    rows' IDF weights would drift too far).
+    """
+    fingerprint, doc_freqs, changed_rows = read_similarity_stats(output_path)
+    changed_rows += len(replaced) + len(delta)
+    if not doc_freqs or fingerprint != rows_fingerprint(existing['show_id'], existing['content_hash']):
+        print("Similarity index does not match the existing artifact, rebuilding it...")
+        save_similarity_index(merged, output_path)
+        return
+    if changed_rows > REBUILD_FRACTION * merged.num_rows:
+        print(f"{changed_rows:,} titles changed since the similarity index was built, rebuilding it...")
+        save_similarity_index(merged, output_path)
+        return
+    
+    delta_multivalue = {name: from_arrow(delta.column(name)) for name in MULTIVALUE_COLUMNS}
+    replaced_multivalue = {name: from_arrow(replaced.column(name)) for name in MULTIVALUE_COLUMNS}
+    doc_freqs = merge_doc_freqs(
+        doc_freqs,
+        add=count_doc_freqs(delta['description'], delta_multivalue),
+        subtract=count_doc_freqs(replaced['description'], replaced_multivalue)
+    )
+    delta_embeddings = build_embeddings(delta['description'], delta_multivalue,
+                                        doc_freqs=doc_freqs, n_docs=merged.num_rows)
+    previous = np.load(output_path)
+    embeddings = np.empty((merged.num_rows, delta_embeddings.shape[1]), dtype=np.float32)
+    embeddings[kept_positions] = previous[kept_rows]
+    embeddings[delta_positions] = delta_embeddings
+    fingerprint = rows_fingerprint(merged['show_id'], merged['content_hash'])
+    write_similarity_index(embeddings, output_path, fingerprint, doc_freqs, changed_rows)
+    print(f"Similarity index updated: {output_path} ({len(delta):,} titles embedded)")
+
+def update_processed_data(file_path='netflix_titles.csv',
+                          output_path='netflix_titles_processed.parquet',
+                          cube_path='netflix_titles_cube.parquet', workers=1,
+                          store_path='netflix_titles_catalog.arrow',
+                          leaderboards_path='netflix_titles_leaderboards.parquet',
+                          search_path='netflix_titles_search.npz',
+                          similar_path='netflix_titles_similar.npy'):
+    """
+    Incrementally refresh the Parquet artifact and count cube from the feed.
+    
+    Rows are matched by ``show_id``; a row is reprocessed only when it is new
+    or its raw content hash changed, and rows no longer in the feed are
+    dropped. Unchanged rows are carried over from the existing artifact
+    without re-cleaning, and the cube, search index and similarity index are
+    patched with the delta's cells, postings and embeddings. Falls back to a full rebuild when no artifact exists yet.
+    
+    Parameters:
+    -----------
+    file_path : str
+        Path to the raw CSV feed
+    output_path : str
+        Existing processed Parquet artifact to update in place
+    cube_path : str
+        Existing count cube to update in place
+    workers : int
+        Worker processes for cleaning the delta (see clean_data_parallel)
+    store_path : str
+        Catalog store rewritten from the updated artifact
+    leaderboards_path : str
+        Leaderboards rebuilt from the updated cube
+    search_path : str
+        Search index patched with the delta (rebuilt when it does not
+        match the existing artifact)
+    similar_path : str
+        Similarity index patched with the delta (rebuilt when it does not
+        match the existing artifact or has drifted, see
+        _update_similarity_index)
+        
+    Returns:
+    --------
+    dict
+        Number of ``added``, ``changed``, ``removed`` and ``unchanged`` titles
+    """
+    import os
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    print("Loading dataset...")
+    raw = pd.read_csv(file_path)
+    
+    if not (os.path.exists(output_path) and os.path.exists(cube_path)):
+        print("No existing artifact found, running a full rebuild...")
+        rebuild = True
+    elif set(PROCESSED_COLUMNS) - set(pq.read_schema(output_path).names):
+        print("Existing artifact lacks newer columns, running a full rebuild...")
+        rebuild = True
+    else:
+        rebuild = False
+    
+    if rebuild:
+        df = clean_data_parallel(raw, workers)
+        save_processed_data(df, output_path)
+        save_leaderboards(save_count_cube(df, cube_path), leaderboards_path)
+        table = _processed_table(df)
+        save_catalog_store(table, store_path)
+        save_search_index(df, search_path)
+        save_similarity_index(table, similar_path)
+        return {'added': len(df), 'changed': 0, 'removed': 0, 'unchanged': 0}
+    
+    existing = pq.read_table(output_path)
+    previous = pd.DataFrame({
+        'show_id': existing.column('show_id').to_numpy(zero_copy_only=False),
+        'content_hash': existing.column('content_hash').to_numpy(zero_copy_only=False),
+    })
+    raw_hash = pd.Series(hash_rows(raw), index=raw['show_id'])
+    previous_hash = previous.set_index('show_id')['content_hash']
+    
+    # Compare against the previous hash of the same show_id (NaN when new)
+    known_hash = previous_hash.reindex(raw_hash.index).to_numpy()
+    is_new = pd.isna(known_hash)
+    is_changed = ~is_new & (known_hash != raw_hash.to_numpy())
+    keep_previous = previous['show_id'].isin(raw_hash.index[~(is_new | is_changed)]).to_numpy()
+    
+    stats = {
+        'added': int(is_new.sum()),
+        'changed': int(is_changed.sum()),
+        'removed': int((~previous['show_id'].isin(raw_hash.index)).sum()),
+        'unchanged': int(keep_previous.sum()),
+    }
+    print(f"Delta: {stats['added']:,} new, {stats['changed']:,} changed, "
+          f"{stats['removed']:,} removed, {stats['unchanged']:,} unchanged")
+    
+    if stats['added'] == stats['changed'] == stats['removed'] == 0:
+        print("Processed data is up to date.")
+        fingerprint = rows_fingerprint(existing['show_id'], existing['content_hash'])
+        if _store_fingerprint(store_path) != fingerprint:
+            save_catalog_store(existing, store_path)
+        if not os.path.exists(leaderboards_path):
+            save_leaderboards(pd.read_parquet(cube_path), leaderboards_path)
+        if _saved_fingerprint(search_path) != fingerprint:
+            save_search_index(existing, search_path)
+        if _saved_fingerprint(stats_path(similar_path)) != fingerprint:
+            save_similarity_index(existing, similar_path)
+        return stats
+    
+    # Only the delta goes through the cleaning pipeline
+    delta = clean_data_parallel(raw[is_new | is_changed].reset_index(drop=True), workers)
+    delta_table = _processed_table(delta).cast(existing.schema)
+    kept_table = existing.filter(pa.array(keep_previous))
+    
+    # Restore the feed's row order, as a full rebuild would produce
+    merged = pa.concat_tables([kept_table, delta_table]).unify_dictionaries()
+    feed_position = pd.Series(np.arange(len(raw)), index=raw['show_id'])
+    order = np.argsort(feed_position.reindex(merged.column('show_id').to_numpy(zero_copy_only=False)).to_numpy(), kind='stable')
+    merged = merged.take(pa.array(order))
+    pq.write_table(merged, output_path, use_dictionary=DICTIONARY_COLUMNS)
+    print(f"Processed data updated: {output_path} ({merged.num_rows:,} titles)")
+    save_catalog_store(merged, store_path)
+    
+    # Row ids of the kept (previous row order) and delta titles in the merged table
+    position = np.empty(len(order), dtype=np.int64)
+    position[order] = np.arange(len(order))
+    kept_rows = np.flatnonzero(keep_previous)
+    kept_positions, delta_positions = position[:len(kept_rows)], position[len(kept_rows):]
+    replaced_table = existing.filter(pa.array(~keep_previous))
+    _update_search_index(existing, merged, delta_table, kept_rows, kept_positions, delta_positions, search_path)
+    _update_similarity_index(existing, merged, delta_table, replaced_table, kept_rows, kept_positions,
+                             delta_positions, similar_path)
+    
+    # Patch the cube: remove the replaced rows' cells, add the delta's
+    replaced = replaced_table.select(CUBE_DIMENSIONS).to_pandas()
+    cube = merge_count_cubes(pd.read_parquet(cube_path), add=build_count_cube(delta), subtract=build_count_cube(replaced))
+    cube.to_parquet(cube_path, index=False, engine='pyarrow')
+    print(f"Count cube updated: {cube_path} ({len(cube):,} cells)")
+    save_leaderboards(cube, leaderboards_path)
+    
+    return stats
+
+def process_in_chunks(file_path='netflix_titles.csv', chunksize=100_000,
+                      csv_path='netflix_titles_processed.csv',
+                      parquet_path='netflix_titles_processed.parquet',
+                      cube_path='netflix_titles_cube.parquet', workers=1,
+                      store_path='netflix_titles_catalog.arrow',
+                      leaderboards_path='netflix_titles_leaderboards.parquet',
+                      search_path='netflix_titles_search.npz',
+                      similar_path='netflix_titles_similar.npy'):
+    """
+    Stream the feed through the cleaning pipeline in bounded-size chunks.
+    
+    Each chunk is cleaned on its own and appended to the outputs (a CSV
+    append and one Parquet row group per chunk); only the small count cube
+    is accumulated across chunks. Peak memory therefore depends on
+    ``chunksize`` rather than on the size of the feed.
+    
+    The catalog store needs one dictionary per column across the whole
+    feed, and the search and similarity indexes the text of every title, so
+    none of them is written here; existing ones are removed so the dashboard
+    falls back to the fresh Parquet artifact (and builds its indexes) instead
+    of stale data.
+    
+    Parameters:
+    -----------
+    file_path : str
+        Path to the raw CSV feed
+    chunksize : int
+        Raw rows per chunk
+    csv_path, parquet_path, cube_path, leaderboards_path : str
+        Output paths (same artifacts as a full run)
+    store_path, search_path, similar_path : str
+        Catalog store and text indexes to invalidate
+    workers : int
+        Worker processes each chunk is split across; one pool is reused for
+        every chunk
+        
+    Returns:
+    --------
+    int
+        Number of titles processed
+    """
+    import os
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    for stale_path in (store_path, search_path, similar_path, stats_path(similar_path)):
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+            print(f"Removed stale artifact: {stale_path}")
+    
+    writer = None
+    schema = None
+    cube = None
+    n_rows = 0
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        reader = pd.read_csv(file_path, chunksize=chunksize, dtype=RAW_TEXT_DTYPES)
+        for i, chunk in enumerate(reader):
+            df = clean_data_parallel(chunk, workers, pool) if pool else clean_data(chunk)
+            df[PROCESSED_COLUMNS].to_csv(csv_path, index=False, mode='w' if i == 0 else 'a', header=(i == 0))
+            
+            table = _processed_table(df)
+            if writer is None:
+                # Columns that are entirely empty in the first chunk are still text
+                schema = pa.schema([
+                    field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                    for field in table.schema
+                ], metadata=table.schema.metadata)
+                writer = pq.ParquetWriter(parquet_path, schema, use_dictionary=DICTIONARY_COLUMNS)
+            writer.write_table(table.cast(schema))
+            
+            chunk_cube = build_count_cube(df)
+            cube = chunk_cube if cube is None else merge_count_cubes(cube, add=chunk_cube)
+            
+            n_rows += len(df)
+            print(f"  chunk {i + 1}: {len(df):,} rows ({n_rows:,} total)")
+    finally:
+        if writer is not None:
+            writer.close()
+        if pool is not None:
+            pool.shutdown()
+    
+    print(f"\nProcessed data saved to: {csv_path}, {parquet_path}")
+    if cube is not None:
+        cube.to_parquet(cube_path, index=False, engine='pyarrow')
+        print(f"Count cube saved to: {cube_path}")
+        save_leaderboards(cube, leaderboards_path)
+    return n_rows
+
+def check_chunked_output(file_path='netflix_titles.csv', chunksize=100_000, workers=1):
+    """
+    Check that a chunked run produces the same dates and cube as a one-pass run.
+    
+    The chunked run writes into a temporary directory, so existing artifacts
+    are left alone. Chunks are cleaned independently, so anything inferred
+    per chunk (such as a guessed date format) shows up here as mismatches.
+    
+    Parameters:
+    -----------
+    file_path : str
+        Path to the raw CSV feed
+    chunksize, workers : int
+        As for process_in_chunks
+        
+    Returns:
+    --------
+    dict
+        Rows whose ``date_added``, ``year_added`` or ``month_added`` differ,
+        and whether the count cubes are equal
+    """
+    import os
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {name: os.path.join(tmp, os.path.basename(default)) for name, default in [
+            ('csv_path', 'netflix_titles_processed.csv'), ('parquet_path', 'netflix_titles_processed.parquet'),
+            ('cube_path', 'netflix_titles_cube.parquet'), ('store_path', 'netflix_titles_catalog.arrow'),
+            ('leaderboards_path', 'netflix_titles_leaderboards.parquet'),
+            ('search_path', 'netflix_titles_search.npz'), ('similar_path', 'netflix_titles_similar.npy'),
+        ]}
+        process_in_chunks(file_path, chunksize, workers=workers, **paths)
+        chunked = pd.read_parquet(paths['parquet_path'], columns=['date_added', 'year_added', 'month_added'])
+        chunked_cube = pd.read_parquet(paths['cube_path'])
+    
+    full = clean_data(pd.read_csv(file_path, dtype=RAW_TEXT_DTYPES), verbose=False)
+    result = {}
+    for column in ['date_added', 'year_added', 'month_added']:
+        a, b = chunked[column].reset_index(drop=True), full[column].reset_index(drop=True)
+        result[column] = int((~((a == b) | (a.isna() & b.isna()))).sum())
+    
+    def sorted_cube(cube):
+        cube = cube.astype({column: 'object' for column in CUBE_DIMENSIONS})
+        return cube.sort_values(CUBE_DIMENSIONS, na_position='last').reset_index(drop=True)
+    try:
+        pd.testing.assert_frame_equal(sorted_cube(chunked_cube), sorted_cube(build_count_cube(full)),
+                                      check_dtype=False)
+        result['cube_equal'] = True
+    except AssertionError:
+        result['cube_equal'] = False
+    return result
+
+def run_full_preprocessing(file_path='netflix_titles.csv', workers=1):
+    """Reprocess the whole feed and write every artifact."""
     # Load and clean data
-    df = load_and_clean_data('netflix_titles.csv')
+    df = load_and_clean_data(file_path, workers)
     
     # Generate summary statistics
     generate_summary_statistics(df)
     
     # Save processed data
     save_processed_data(df, 'netflix_titles_processed.csv')
-    
-    print("\n[SUCCESS] Data preprocessing completed successfully!")
-    print("\nNext steps:")
-    print("  1. Review the summary statistics above")
-    print("  2. Run the dashboard: streamlit run app.py")
-    print("  3. Check netflix_titles_processed.csv for processed data")
+    save_processed_data(df, 'netflix_titles_processed.parquet')
+    cube = save_count_cube(df, 'netflix_titles_cube.parquet')
+    save_leaderboards(cube, 'netflix_titles_leaderboards.parquet')
+    table = _processed_table(df)
+    save_catalog_store(table, 'netflix_titles_catalog.arrow')
+    save_search_index(df, 'netflix_titles_search.npz')
+    save_similarity_index(table, 'netflix_titles_similar.npy')
 
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Preprocess the Netflix titles dataset for the dashboard.")
+    parser.add_argument('--input', default='netflix_titles.csv', help="raw CSV feed (default: netflix_titles.csv)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only reprocess new/changed show_ids and merge them into the existing "
+                             "Parquet artifact and count cube")
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help="stream the feed in chunks of this many rows (bounded memory; "
+                             "summary statistics are skipped)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="clean contiguous row ranges in this many worker processes (default: 1)")
+    parser.add_argument('--check', action='store_true',
+                        help="with --chunksize: compare a chunked run (in a temporary directory) "
+                             "with a one-pass run instead of writing the artifacts")
+    args = parser.parse_args()
+    
+    if args.check and args.chunksize:
+        print(f"Comparing chunks of {args.chunksize:,} rows with a one-pass run of {args.input}...")
+        check = check_chunked_output(args.input, args.chunksize, args.workers)
+        print(f"\nMismatched rows: date_added {check['date_added']:,}, year_added {check['year_added']:,}, "
+              f"month_added {check['month_added']:,}; count cube {'equal' if check['cube_equal'] else 'DIFFERS'}")
+        if any(check[column] for column in ['date_added', 'year_added', 'month_added']) or not check['cube_equal']:
+            raise SystemExit(1)
+    elif args.incremental:
+        update_processed_data(args.input, 'netflix_titles_processed.parquet', 'netflix_titles_cube.parquet',
+                              workers=args.workers)
+        print("\n[SUCCESS] Incremental preprocessing completed successfully!")
+        print("  Note: netflix_titles_processed.csv is only rewritten by a full run.")
+    elif args.chunksize:
+        print(f"Streaming {args.input} in chunks of {args.chunksize:,} rows...")
+        process_in_chunks(args.input, args.chunksize, workers=args.workers)
+        print("\n[SUCCESS] Chunked preprocessing completed successfully!")
+    else:
+        run_full_preprocessing(args.input, args.workers)
+        print("\n[SUCCESS] Data preprocessing completed successfully!")
+        print("\nNext steps:")
+        print("  1. Review the summary statistics above")
+        print("  2. Run the dashboard: streamlit run app.py")
+        print("  3. Check netflix_titles_processed.csv for processed data")
+        print("     (the dashboard memory-maps netflix_titles_catalog.arrow when present)")
@@ -0,0 +1,94 @@
+"""
+Netflix Content Analytics - Figure Cache
+========================================
+Byte-bounded LRU cache of serialized Plotly figures, shared by every session
+of a server process.
+
+Entries are keyed by the chart name, the normalized Dashboard filter key and
+the chart's own widget settings. Each entry holds the figure as Plotly JSON
+plus a small dict of plain "facts" (the numbers quoted in the chart's
+insights), so a filter state that was rendered before is served without
+re-aggregating anything. Least recently used entries are evicted once the
+serialized size of all entries exceeds the byte budget.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+
+import plotly.graph_objects as go
+
+# Default byte budget of the shared cache
+FIGURE_CACHE_BYTES = 64 * 1024 * 1024
+
+class FigureCache:
+    """
+    Thread-safe LRU cache of figure JSON, bounded by total size.
+
+    Parameters:
+    -----------
+    max_bytes : int
+        Budget for the serialized entries; entries larger than the whole
+        budget are never stored
+    """
+
+    def __init__(self, max_bytes=FIGURE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.n_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """UTF-8 JSON entry for ``key`` (marking it most recently used), or None."""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+            return payload
+
+    def put(self, key, payload):
+        """Store a UTF-8 JSON entry, evicting least recently used entries to fit."""
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.n_bytes -= len(previous)
+            self._entries[key] = payload
+            self.n_bytes += size
+            while self.n_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.n_bytes -= len(evicted)
+
+    def figure(self, key, build):
+        """
+        Figure and facts for ``key``, built and stored on a miss.
+
+        Parameters:
+        -----------
+        key : hashable
+            Chart name, filter key and chart settings
+        build : callable
+            Returns ``(figure, facts)``: a Plotly figure (or None when there
+            is nothing to show) and a JSON-serializable dict
+
+        Returns:
+        --------
+        tuple
+            (figure, facts); figure is None if ``build`` returned None
+        """
+        payload = self.get(key)
+        if payload is not None:
+            entry = json.loads(payload)
+            figure = entry['figure']
+            # The JSON came from a validated figure, so skip Plotly's validation
+            return (None if figure is None else go.Figure(figure, _validate=False)), entry['facts']
+
+        figure, facts = build()
+        figure_json = 'null' if figure is None else figure.to_json()
+        self.put(key, ('{"figure": %s, "facts": %s}' % (figure_json, json.dumps(facts))).encode('utf-8'))
+        return figure, facts
@@ -0,0 +1,219 @@
+"""
+Netflix Content Analytics - Bitmap Filter Index
+===============================================
+Precomputed bitsets for the Dashboard sidebar filters.
+
+Every distinct value of each categorical filter column gets one packed
+bitset (one bit per title). The year range filter uses the sorted distinct
+``year_added`` values with prefix bitsets: bit set in ``range_prefix[k]``
+means the title's year is below ``range_values[k]``, so any inclusive range
+is ``prefix[hi] & ~prefix[lo]``. A filter combination therefore resolves to
+a row-id set with a handful of bitwise ANDs, without touching the DataFrame.
+
+Multi-valued columns (every listed country/genre, not just the first) get an
+InvertedIndex instead: one sorted posting list of row ids per token. Token
+filters intersect posting lists, and the bitset filters are then tested only
+at the surviving rows, so the cost follows the size of the postings rather
+than the size of the catalog.
+
+Both indexes are built per column on first use, so opening the catalog costs
+nothing and a column that is never filtered on is never indexed.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Categorical columns filtered by equality in the Dashboard sidebar
+FILTER_COLUMNS = ['type', 'rating', 'primary_country', 'primary_genre']
+
+def _bitsets_from_codes(codes, n_values):
+    """One packed bitset per code value, built from a single sort of ``codes``."""
+    n_bytes = (len(codes) + 7) // 8
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(n_values + 1))
+    bitsets = []
+    for value in range(n_values):
+        rows = order[bounds[value]:bounds[value + 1]]
+        # Bits of distinct rows never collide, so summing per byte equals OR-ing
+        bits = np.bincount(rows >> 3, weights=0x80 >> (rows & 7), minlength=n_bytes)
+        bitsets.append(bits.astype(np.uint8))
+    return bitsets
+
+def intersect_rows(row_sets):
+    """
+    Rows present in every one of several sorted, duplicate-free row id arrays.
+
+    The shortest arrays are intersected first, so every step shrinks the
+    candidates; returns None when ``row_sets`` is empty.
+    """
+    rows = None
+    for row_ids in sorted(row_sets, key=len):
+        rows = row_ids if rows is None else np.intersect1d(rows, row_ids, assume_unique=True)
+    return rows
+
+class FilterIndex:
+    """
+    Bitset index over the Dashboard filter columns.
+
+    Parameters:
+    -----------
+    titles : pd.DataFrame
+        Catalog with one row per title; row ids are positions in this frame
+    columns : list of str
+        Columns filtered by equality
+    range_column : str
+        Numeric column filtered by an inclusive range
+    """
+
+    def __init__(self, titles, columns=FILTER_COLUMNS, range_column='year_added'):
+        self.titles = titles
+        self.columns = columns
+        self.range_column = range_column
+        self.n_rows = len(titles)
+        self.n_bytes = (self.n_rows + 7) // 8
+        self._bitsets = {}
+        self._range = None
+        self._lock = threading.Lock()
+
+    def bitsets(self, column):
+        """Value -> packed bitset of an equality column, built on first use."""
+        if column not in self.columns:
+            raise KeyError(column)
+        with self._lock:
+            bitsets = self._bitsets.get(column)
+        if bitsets is None:
+            # Missing values get code -1 and never match an equality filter
+            codes, values = pd.factorize(self.titles[column])
+            bitsets = dict(zip(values.tolist(), _bitsets_from_codes(codes, len(values))))
+            with self._lock:
+                self._bitsets[column] = bitsets
+        return bitsets
+
+    def range_index(self):
+        """(sorted distinct values, prefix bitsets) of the range column, built on first use."""
+        with self._lock:
+            range_index = self._range
+        if range_index is None:
+            range_data = self.titles[self.range_column].to_numpy(dtype=float, na_value=np.nan)
+            valid = ~np.isnan(range_data)
+            range_values = np.unique(range_data[valid])
+            range_codes = np.searchsorted(range_values, range_data)
+            range_codes[~valid] = -1
+            range_prefix = np.zeros((len(range_values) + 1, self.n_bytes), dtype=np.uint8)
+            for i, bits in enumerate(_bitsets_from_codes(range_codes, len(range_values))):
+                np.bitwise_or(range_prefix[i], bits, out=range_prefix[i + 1])
+            range_index = range_values, range_prefix
+            with self._lock:
+                self._range = range_index
+        return range_index
+
+    def bitset(self, equals=None, value_range=None):
+        """
+        Packed bitset of the titles matching every given filter.
+
+        Parameters:
+        -----------
+        equals : dict, optional
+            Column -> required value; ``None`` values are ignored
+        value_range : tuple, optional
+            Inclusive (low, high) bounds on the range column; titles with a
+            missing value never match
+
+        Returns:
+        --------
+        np.ndarray
+            uint8 array of ``ceil(n_rows / 8)`` bytes
+        """
+        bits = None
+        if value_range is not None:
+            range_values, range_prefix = self.range_index()
+            lo = np.searchsorted(range_values, value_range[0], side='left')
+            hi = np.searchsorted(range_values, value_range[1], side='right')
+            if hi <= lo:
+                return np.zeros(self.n_bytes, dtype=np.uint8)
+            bits = np.bitwise_and(range_prefix[hi], np.invert(range_prefix[lo]))
+
+        for column, value in (equals or {}).items():
+            if value is None:
+                continue
+            column_bits = self.bitsets(column).get(value)
+            if column_bits is None:
+                return np.zeros(self.n_bytes, dtype=np.uint8)
+            bits = column_bits.copy() if bits is None else np.bitwise_and(bits, column_bits, out=bits)
+
+        if bits is None:
+            return np.packbits(np.ones(self.n_rows, dtype=bool))
+        return bits
+
+    def rows(self, equals=None, value_range=None, within=None):
+        """
+        Sorted row ids of the titles matching every given filter (see bitset).
+
+        ``within`` optionally restricts the result to sorted candidate row
+        ids (e.g. InvertedIndex postings); only their bits are tested.
+        """
+        bits = self.bitset(equals, value_range)
+        if within is not None:
+            within = np.asarray(within, dtype=np.int64)
+            hit = (bits[within >> 3] >> (7 - (within & 7))) & 1
+            return within[hit.astype(bool)]
+        nonzero = np.flatnonzero(bits)
+        if len(nonzero) > self.n_bytes // 8:
+            return np.flatnonzero(np.unpackbits(bits, count=self.n_rows))
+        # Sparse result: only unpack the non-empty bytes
+        set_bits = np.unpackbits(bits[nonzero][:, None], axis=1).astype(bool)
+        byte_idx, bit_idx = np.nonzero(set_bits)
+        return nonzero[byte_idx].astype(np.int64) * 8 + bit_idx
+
+class InvertedIndex:
+    """
+    Posting lists of a multi-valued column: the titles listing each token.
+
+    Parameters:
+    -----------
+    mv : MultiValueColumn
+        Encoded column (e.g. ``country_list``); row ids are its row positions
+    """
+
+    def __init__(self, mv):
+        self.mv = mv
+        self.vocab = mv.vocab
+        self._postings = None
+        self._lock = threading.Lock()
+
+    def postings(self):
+        """(row_ids, offsets, token -> code) of the posting lists, built on first use."""
+        with self._lock:
+            postings = self._postings
+        if postings is None:
+            mv = self.mv
+            parents = np.repeat(np.arange(mv.n_rows, dtype=np.int64), mv.lengths())
+            # Stable sort by token keeps each posting list in ascending row order
+            order = np.argsort(mv.codes, kind='stable')
+            codes, row_ids = mv.codes[order], parents[order]
+            # A row listing the same token twice is posted once
+            first = np.ones(len(order), dtype=bool)
+            first[1:] = (codes[1:] != codes[:-1]) | (row_ids[1:] != row_ids[:-1])
+            # Row ids fit in int32 for any realistic catalog, halving the postings
+            row_ids = row_ids[first].astype(np.int32 if mv.n_rows <= np.iinfo(np.int32).max else np.int64)
+            offsets = np.searchsorted(codes[first], np.arange(len(mv.vocab) + 1))
+            postings = row_ids, offsets, {token: code for code, token in enumerate(mv.vocab.tolist())}
+            with self._lock:
+                self._postings = postings
+        return postings
+
+    def rows(self, token):
+        """Sorted row ids of the titles listing ``token`` (empty if unknown)."""
+        row_ids, offsets, codes = self.postings()
+        code = codes.get(token)
+        if code is None:
+            return row_ids[:0]
+        return row_ids[offsets[code]:offsets[code + 1]]
+
+    def counts(self):
+        """Titles per token, sorted descending (ties by token)."""
+        _, offsets, _ = self.postings()
+        counts = pd.Series(np.diff(offsets), index=self.vocab)
+        return counts[counts > 0].sort_index(kind='stable').sort_values(ascending=False, kind='stable')
@@ -0,0 +1,230 @@
+"""
+Multi-Valued Column Encoding
+============================
+Flat offsets + values representation for the comma-separated columns of the
+Netflix dataset (listed_in, country, cast, director).
+
+Row ``i`` owns ``codes[offsets[i]:offsets[i + 1]]``; each code indexes into
+``vocab``. The layout matches Arrow list arrays, so it round-trips through
+the Parquet artifact without any per-row parsing.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+MULTIVALUE_SEPARATOR = ','
+
+# Output column -> source text column
+MULTIVALUE_COLUMNS = {
+    'genres': 'listed_in',
+    'country_list': 'country',
+    'cast_list': 'cast',
+    'director_list': 'director',
+}
+
+# Most tokens token_cooccurrence counts into a dense token x token matrix
+DENSE_COOCCURRENCE_TOKENS = 2048
+
+@dataclass(frozen=True)
+class MultiValueColumn:
+    """Offsets + dictionary-coded values for one multi-valued column."""
+    offsets: np.ndarray  # int64, length n_rows + 1
+    codes: np.ndarray    # int32, one entry per listed value
+    vocab: np.ndarray    # token strings, indexed by code
+
+    @property
+    def n_rows(self):
+        return len(self.offsets) - 1
+
+    def lengths(self):
+        """Number of listed values per row."""
+        return np.diff(self.offsets)
+
+    def row(self, i):
+        """Tokens listed for row ``i``."""
+        return self.vocab[self.codes[self.offsets[i]:self.offsets[i + 1]]].tolist()
+
+def encode_multivalue(series, sep=MULTIVALUE_SEPARATOR):
+    """
+    Encode a comma-separated text column as a MultiValueColumn.
+
+    Tokens are whitespace-stripped; missing values and empty tokens are
+    dropped, so a missing row simply has no values.
+
+    Parameters:
+    -----------
+    series : pd.Series
+        Text column (e.g. ``listed_in``)
+    sep : str
+        Token separator
+
+    Returns:
+    --------
+    MultiValueColumn
+    """
+    series = series.reset_index(drop=True)
+    tokens = series.str.split(sep).explode().str.strip()
+    keep = tokens.notna() & (tokens != '')
+    tokens = tokens[keep]
+
+    # explode() repeats the row label per token, so the index is the parent row
+    parent = tokens.index.to_numpy()
+    lengths = np.bincount(parent, minlength=len(series))
+    offsets = np.zeros(len(series) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    codes, vocab = pd.factorize(tokens.to_numpy(dtype=object))
+    return MultiValueColumn(offsets, codes.astype(np.int32), np.asarray(vocab, dtype=object))
+
+def to_arrow(mv):
+    """Build an Arrow list<dictionary<string>> array sharing the same layout."""
+    import pyarrow as pa
+
+    values = pa.DictionaryArray.from_arrays(
+        pa.array(mv.codes, type=pa.int32()), pa.array(mv.vocab, type=pa.string())
+    )
+    if mv.offsets[-1] > np.iinfo(np.int32).max:
+        return pa.LargeListArray.from_arrays(pa.array(mv.offsets, type=pa.int64()), values)
+    return pa.ListArray.from_arrays(pa.array(mv.offsets, type=pa.int32()), values)
+
+def from_arrow(array):
+    """Rebuild a MultiValueColumn from an Arrow list array (chunked or not)."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    lengths = pc.list_value_length(array).fill_null(0).to_numpy(zero_copy_only=False)
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    values = pc.list_flatten(array)
+    if not pa.types.is_dictionary(values.type):
+        values = values.dictionary_encode()
+    codes = values.indices.to_numpy(zero_copy_only=False).astype(np.int32, copy=False)
+    vocab = np.asarray(values.dictionary.to_pylist(), dtype=object)
+    return MultiValueColumn(offsets, codes, vocab)
+
+def explode_rows(mv, rows=None):
+    """
+    Flatten the values of the selected rows.
+
+    Parameters:
+    -----------
+    mv : MultiValueColumn
+        Encoded column
+    rows : array-like of int, optional
+        Row positions to gather; all rows when omitted
+
+    Returns:
+    --------
+    tuple of np.ndarray
+        (row position per value, code per value)
+    """
+    if rows is None:
+        return np.repeat(np.arange(mv.n_rows), mv.lengths()), mv.codes
+    rows = np.asarray(rows, dtype=np.int64)
+    starts = mv.offsets[rows]
+    lengths = mv.offsets[rows + 1] - starts
+    # Index of every value: its row start plus its rank within the row
+    run_starts = np.cumsum(lengths) - lengths
+    value_idx = np.repeat(starts - run_starts, lengths) + np.arange(lengths.sum())
+    return np.repeat(rows, lengths), mv.codes[value_idx]
+
+def value_pairs(lengths):
+    """
+    Every unordered pair of values within the same row of a flat layout.
+
+    Parameters:
+    -----------
+    lengths : np.ndarray
+        Number of values of each consecutive row
+
+    Returns:
+    --------
+    tuple of np.ndarray
+        (first, second) flat value indices with first < second, both in
+        the same row
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    starts = np.cumsum(lengths) - lengths
+    value_row = np.repeat(np.arange(len(lengths)), lengths)
+    position = np.arange(lengths.sum()) - starts[value_row]
+    # A value pairs with every later value of its row
+    n_later = lengths[value_row] - 1 - position
+    first = np.repeat(np.arange(len(value_row)), n_later)
+    run_starts = np.repeat(np.cumsum(n_later) - n_later, n_later)
+    second = first + 1 + (np.arange(len(first)) - run_starts)
+    return first, second
+
+def token_cooccurrence(mv, rows=None, top=None):
+    """
+    Token x token co-occurrence counts of the selected rows.
+
+    Equivalent to ``X.T @ X`` for the sparse row x token one-hot matrix X,
+    computed from the value pairs of each row and one bincount. The matrix
+    is dense, so large vocabularies (cast, directors) must be narrowed with
+    ``top``; pairs with a dropped token are skipped before counting.
+
+    Parameters:
+    -----------
+    mv : MultiValueColumn
+        Encoded column
+    rows : array-like of int, optional
+        Row positions to include; all rows when omitted
+    top : int, optional
+        Keep only the ``top`` tokens listed by the most selected rows (ties
+        in vocabulary order); every token when omitted
+
+    Returns:
+    --------
+    pd.DataFrame
+        Symmetric counts indexed by the kept tokens on both axes (most
+        listed first when ``top`` is given); the diagonal holds the number
+        of rows listing each token
+
+    Raises:
+    -------
+    ValueError
+        If more than DENSE_COOCCURRENCE_TOKENS tokens would be kept
+    """
+    _, codes = explode_rows(mv, rows)
+    lengths = mv.lengths() if rows is None else mv.lengths()[np.asarray(rows, dtype=np.int64)]
+    first, second = value_pairs(lengths)
+
+    totals = np.bincount(codes, minlength=len(mv.vocab))
+    if top is None:
+        kept = np.arange(len(mv.vocab))
+    else:
+        listed = np.flatnonzero(totals)
+        kept = listed[np.argsort(-totals[listed], kind='stable')[:top]]
+    n_kept = len(kept)
+    if n_kept > DENSE_COOCCURRENCE_TOKENS:
+        raise ValueError(f"{n_kept:,} tokens exceed the dense co-occurrence limit of "
+                         f"{DENSE_COOCCURRENCE_TOKENS:,}; pass top to narrow them")
+
+    # Codes of the kept tokens in the output matrix, -1 for the dropped ones
+    local = np.full(len(mv.vocab), -1, dtype=np.int64)
+    local[kept] = np.arange(n_kept)
+    first_codes, second_codes = local[codes[first]], local[codes[second]]
+    both = (first_codes >= 0) & (second_codes >= 0)
+    pair_codes = first_codes[both] * n_kept + second_codes[both]
+    counts = np.bincount(pair_codes, minlength=n_kept * n_kept).reshape(n_kept, n_kept)
+    counts = counts + counts.T
+    np.fill_diagonal(counts, totals[kept])
+    return pd.DataFrame(counts, index=mv.vocab[kept], columns=mv.vocab[kept])
+
+def token_counts(mv, rows=None):
+    """
+    Count how many of the selected rows list each token.
+
+    Returns:
+    --------
+    pd.Series
+        Counts indexed by token, sorted descending, zero counts dropped
+    """
+    _, codes = explode_rows(mv, rows)
+    counts = pd.Series(np.bincount(codes, minlength=len(mv.vocab)), index=mv.vocab)
+    return counts[counts > 0].sort_values(ascending=False, kind='stable')
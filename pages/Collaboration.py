@@ -0,0 +1,436 @@
+"""
+Netflix Content Analytics - Collaboration Network
+=================================================
+Co-appearance network of the cast and directors of Netflix titles:
+centrality rankings, collaboration communities and personal networks.
+"""
+
+import streamlit as st
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import networkx as nx
+import warnings
+from data_access import get_collaboration_graph
+warnings.filterwarnings('ignore')
+
+# Page configuration
+st.set_page_config(
+    page_title="Netflix Content Analytics - Collaboration Network",
+    page_icon="🎬",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Netflix Theme CSS - Exact Match
+st.markdown("""
+    <style>
+    /* Netflix Dark Theme */
+    .stApp {
+        background-color: #141414;
+    }
+    .main .block-container {
+        padding-top: 2rem;
+        padding-bottom: 2rem;
+        background-color: #141414;
+    }
+    html, body {
+        scroll-behavior: smooth;
+        background: #141414;
+        color: #ffffff;
+        font-family: 'Helvetica Neue', 'Helvetica', 'Arial', sans-serif;
+    }
+    
+    /* Netflix Header Styling */
+    .main-header {
+        font-family: 'Helvetica Neue', 'Helvetica', 'Arial', sans-serif;
+        font-size: 3rem;
+        font-weight: 900;
+        color: #E50914;
+        text-align: left;
+        margin-bottom: 0.5rem;
+        letter-spacing: -1px;
+        text-transform: none;
+        padding-left: 0;
+    }
+    .sub-header {
+        font-size: 1.1rem;
+        color: #b3b3b3;
+        text-align: left;
+        margin-bottom: 2rem;
+        font-weight: 400;
+    }
+    
+    /* Netflix Card Styling */
+    .metric-card {
+        background: #1f1f1f;
+        padding: 1.2rem;
+        border-radius: 4px;
+        margin: 0.5rem 0;
+        border: none;
+        transition: transform 0.2s ease, background 0.2s ease;
+    }
+    .metric-card:hover {
+        background: #2a2a2a;
+        transform: scale(1.02);
+    }
+    /* Featured card special styling */
+    .metric-card[style*="linear-gradient(135deg, #E50914"]:hover {
+        transform: scale(1.08) !important;
+        box-shadow: 0 6px 20px rgba(229, 9, 20, 0.7), 0 4px 8px rgba(0, 0, 0, 0.9) !important;
+    }
+    .metric-label {
+        color: #b3b3b3;
+        font-size: 0.85rem;
+        margin-bottom: 0.5rem;
+        text-transform: uppercase;
+        letter-spacing: 0.5px;
+        font-weight: 500;
+    }
+    .metric-value {
+        color: #ffffff;
+        font-size: 2rem;
+        font-weight: 700;
+    }
+    
+    /* Section Boxes */
+    .section-box {
+        background: #1f1f1f;
+        border: none;
+        border-radius: 4px;
+        padding: 24px;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.5);
+        margin-bottom: 24px;
+        transition: opacity 0.3s ease;
+    }
+    
+    /* Filter Chips */
+    .filter-chip {
+        display: inline-block;
+        padding: 6px 14px;
+        margin: 4px 8px 4px 0;
+        background: #2a2a2a;
+        border: 1px solid #404040;
+        border-radius: 4px;
+        color: #ffffff;
+        font-size: 0.85rem;
+        transition: all 0.2s ease;
+    }
+    .filter-chip:hover {
+        background: #404040;
+        border-color: #E50914;
+    }
+    
+    /* Headers - Netflix Style */
+    h1 {
+        color: #E50914 !important;
+        font-family: 'Helvetica Neue', 'Helvetica', 'Arial', sans-serif;
+        font-weight: 900;
+        letter-spacing: -1px;
+    }
+    h2 {
+        color: #E50914 !important;
+        font-family: 'Helvetica Neue', 'Helvetica', 'Arial', sans-serif;
+        font-size: 1.5rem;
+        font-weight: 700;
+        margin-bottom: 1rem;
+        letter-spacing: -0.5px;
+    }
+    h3 {
+        color: #E50914 !important;
+        font-family: 'Helvetica Neue', 'Helvetica', 'Arial', sans-serif;
+        font-size: 1.2rem;
+        font-weight: 600;
+        letter-spacing: -0.3px;
+    }
+    h4 {
+        color: #E50914 !important;
+        font-family: 'Helvetica Neue', 'Helvetica', 'Arial', sans-serif;
+        font-size: 1.1rem;
+        font-weight: 600;
+        letter-spacing: -0.2px;
+    }
+    
+    /* Sidebar */
+    .css-1d391kg {
+        background-color: #141414;
+    }
+    [data-testid="stSidebar"] {
+        background-color: #1f1f1f;
+    }
+    
+    /* Smooth Transitions */
+    .element-container {
+        transition: opacity 0.3s ease, transform 0.3s ease;
+    }
+    
+    /* Plotly Chart Container */
+    .js-plotly-plot {
+        transition: opacity 0.4s ease;
+    }
+    
+    /* Remove Streamlit Branding */
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+    /* Keep header visible for sidebar toggle */
+    header {visibility: visible !important;}
+    
+    /* Custom Scrollbar */
+    ::-webkit-scrollbar {
+        width: 8px;
+    }
+    ::-webkit-scrollbar-track {
+        background: #1f1f1f;
+    }
+    ::-webkit-scrollbar-thumb {
+        background: #404040;
+        border-radius: 4px;
+    }
+    ::-webkit-scrollbar-thumb:hover {
+        background: #555555;
+    }
+    
+    /* Ensure sidebar toggle button is always visible */
+    [data-testid="stSidebarCollapseButton"] {
+        display: block !important;
+        visibility: visible !important;
+        opacity: 1 !important;
+        z-index: 999 !important;
+    }
+    
+    /* Ensure header is visible for sidebar toggle */
+    header[data-testid="stHeader"] {
+        visibility: visible !important;
+        display: block !important;
+    }
+    
+    /* Sidebar Navigation Buttons - Netflix Red Theme */
+    [data-testid="stSidebarNav"] a {
+        color: #E50914 !important;
+        font-weight: 600;
+        transition: all 0.3s ease;
+    }
+    [data-testid="stSidebarNav"] a:hover {
+        color: #ff1a1a !important;
+        background-color: rgba(229, 9, 20, 0.1) !important;
+    }
+    [data-testid="stSidebarNav"] a[aria-current="page"] {
+        color: #E50914 !important;
+        background-color: rgba(229, 9, 20, 0.15) !important;
+        border-left: 3px solid #E50914 !important;
+        font-weight: 700;
+    }
+    [data-testid="stSidebarNav"] ul {
+        padding-left: 0.5rem;
+    }
+    [data-testid="stSidebarNav"] li {
+        margin: 0.25rem 0;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+
+# Add glow animation style
+st.markdown("""
+<style>
+@keyframes glow {
+    from {
+        text-shadow: 0 0 10px rgba(229, 9, 20, 0.7),
+                    0 0 20px rgba(229, 9, 20, 0.5), 
+                    0 0 30px rgba(229, 9, 20, 0.3);
+    }
+    to {
+        text-shadow: 0 0 20px rgba(229, 9, 20, 0.9), 
+                    0 0 30px rgba(229, 9, 20, 0.7), 
+                    0 0 40px rgba(229, 9, 20, 0.5);
+    }
+}
+</style>
+""", unsafe_allow_html=True)
+
+# Shared collaboration graph (built once, cached on disk)
+graph = get_collaboration_graph()
+people = graph.people
+
+# Header
+st.markdown("""
+<div style="position: relative; z-index: 1;">
+    <h1 class="main-header" style="
+        text-shadow: 0 0 10px rgba(229, 9, 20, 0.7), 
+                    0 0 20px rgba(229, 9, 20, 0.5), 
+                    0 0 30px rgba(229, 9, 20, 0.3);
+        animation: glow 2s ease-in-out infinite alternate;
+    ">COLLABORATION NETWORK</h1>
+    <p class="sub-header">Who Works With Whom Across the Netflix Catalog</p>
+</div>
+""", unsafe_allow_html=True)
+
+# Sidebar options
+with st.sidebar:
+    st.markdown("### NETWORK OPTIONS")
+    st.markdown("---")
+    selected_role = st.selectbox("Role", ['All', 'Actor', 'Director'], key='network_role')
+    top_n = st.slider("People per ranking", min_value=5, max_value=30, value=15, step=5, key='network_top_n')
+
+# Rankings cover people credited in the selected role (either role for 'Actor & Director')
+if selected_role == 'All':
+    ranked = people
+else:
+    ranked = people[people['role'].str.contains(selected_role, regex=False)]
+
+# Key Metrics
+st.markdown("---")
+st.markdown("### Network Overview")
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("People", f"{len(people):,}")
+col2.metric("Collaborating Pairs", f"{len(graph.weight):,}")
+col3.metric("Recurring Pairs (2+ titles)", f"{int((graph.weight >= 2).sum()):,}")
+col4.metric("Communities", f"{people['community'].max() + 1:,}")
+
+# Centrality rankings
+st.markdown("### Most Central People")
+col1, col2 = st.columns(2)
+
+with col1:
+    top_pagerank = ranked.nlargest(top_n, 'pagerank')
+    fig1 = px.bar(
+        top_pagerank,
+        x='pagerank',
+        y='name',
+        orientation='h',
+        title='PageRank (influence through collaborators)',
+        labels={'pagerank': 'PageRank', 'name': 'Person'},
+        hover_data=['role', 'titles', 'degree'],
+        color_discrete_sequence=['#E50914']
+    )
+    fig1.update_layout(
+        yaxis=dict(autorange='reversed'),
+        plot_bgcolor='#1f1f1f',
+        paper_bgcolor='#141414',
+        font=dict(color='#ffffff', family='Helvetica Neue')
+    )
+    st.plotly_chart(fig1, use_container_width=True)
+
+with col2:
+    top_degree = ranked.nlargest(top_n, 'degree')
+    fig2 = px.bar(
+        top_degree,
+        x='degree',
+        y='name',
+        orientation='h',
+        title='Degree (distinct collaborators)',
+        labels={'degree': 'Collaborators', 'name': 'Person'},
+        hover_data=['role', 'titles', 'strength'],
+        color_discrete_sequence=['#B20710']
+    )
+    fig2.update_layout(
+        yaxis=dict(autorange='reversed'),
+        plot_bgcolor='#1f1f1f',
+        paper_bgcolor='#141414',
+        font=dict(color='#ffffff', family='Helvetica Neue')
+    )
+    st.plotly_chart(fig2, use_container_width=True)
+
+# Communities of recurring collaborators
+st.markdown("### Collaboration Communities")
+st.caption("Communities group people who repeatedly work together (2+ shared titles), detected with the Louvain method.")
+members = people[people['community'] >= 0]
+if len(members) > 0:
+    community_sizes = members['community'].value_counts().sort_index().head(top_n)
+    # Label each community by its most central member
+    leaders = members.sort_values('pagerank', ascending=False).drop_duplicates('community').set_index('community')['name']
+    community_labels = [f"#{c + 1} {leaders[c]}" for c in community_sizes.index]
+    fig3 = px.bar(
+        x=community_labels,
+        y=community_sizes.values,
+        title='Largest Communities (labelled by most central member)',
+        labels={'x': 'Community', 'y': 'Members'},
+        color_discrete_sequence=['#E50914']
+    )
+    fig3.update_xaxes(tickangle=45)
+    fig3.update_layout(
+        plot_bgcolor='#1f1f1f',
+        paper_bgcolor='#141414',
+        font=dict(color='#ffffff', family='Helvetica Neue')
+    )
+    st.plotly_chart(fig3, use_container_width=True)
+    
+    with st.expander("Community Members"):
+        for community, label in zip(community_sizes.index[:5], community_labels[:5]):
+            core = members[members['community'] == community].nlargest(8, 'pagerank')['name']
+            st.write(f"- **{label}**: {', '.join(core)}")
+else:
+    st.info("No recurring collaborations found in the catalog.")
+
+# Personal network of one person
+st.markdown("### Personal Network")
+candidates = ranked.nlargest(200, 'pagerank')
+selected_name = st.selectbox("Person (top 200 by PageRank)", candidates['name'].tolist(), key='network_person')
+person = int(candidates.index[candidates['name'] == selected_name][0])
+collaborators = graph.neighbors(person).head(25)
+
+# Ego graph: the person, their strongest collaborators and the ties among them
+ego_nodes = np.concatenate([[person], collaborators.index.to_numpy()])
+in_ego = np.isin(graph.source, ego_nodes) & np.isin(graph.target, ego_nodes)
+ego = nx.Graph()
+ego.add_nodes_from(ego_nodes.tolist())
+ego.add_weighted_edges_from(zip(graph.source[in_ego].tolist(), graph.target[in_ego].tolist(), graph.weight[in_ego].tolist()))
+layout = nx.spring_layout(ego, weight='weight', seed=0)
+
+edge_x, edge_y = [], []
+for u, v in ego.edges():
+    edge_x += [layout[u][0], layout[v][0], None]
+    edge_y += [layout[u][1], layout[v][1], None]
+node_ids = list(ego.nodes())
+node_names = people['name'].to_numpy()[node_ids]
+fig4 = go.Figure([
+    go.Scatter(x=edge_x, y=edge_y, mode='lines', line=dict(width=0.6, color='#404040'), hoverinfo='none'),
+    go.Scatter(
+        x=[layout[n][0] for n in node_ids],
+        y=[layout[n][1] for n in node_ids],
+        mode='markers+text',
+        text=node_names,
+        textposition='top center',
+        hovertext=[f"{name}<br>{people.at[n, 'titles']} titles, {people.at[n, 'degree']} collaborators" for n, name in zip(node_ids, node_names)],
+        hoverinfo='text',
+        marker=dict(
+            size=[24 if n == person else 10 + 2 * int(collaborators.get(n, 0)) for n in node_ids],
+            color=['#E50914' if n == person else '#B20710' for n in node_ids],
+            line=dict(width=1, color='#ffffff')
+        )
+    )
+])
+fig4.update_layout(
+    title=f"{selected_name} and top {len(collaborators)} collaborators",
+    showlegend=False,
+    height=600,
+    xaxis=dict(visible=False),
+    yaxis=dict(visible=False),
+    plot_bgcolor='#1f1f1f',
+    paper_bgcolor='#141414',
+    font=dict(color='#ffffff', family='Helvetica Neue')
+)
+st.plotly_chart(fig4, use_container_width=True)
+
+with st.expander("Insights - Personal Network"):
+    row = people.loc[person]
+    st.write(f"""
+    - **Role**: {row['role']}, credited on {row['titles']} titles
+    - **Collaborators**: {row['degree']} distinct people ({row['strength']} shared credits)
+    - **Strongest Tie**: {people.at[int(collaborators.index[0]), 'name'] + f" ({collaborators.iloc[0]} titles)" if len(collaborators) else 'None'}
+    - **Community**: {'#' + str(row['community'] + 1) if row['community'] >= 0 else 'No recurring collaborators'}
+    """)
+
+# Full metrics table
+st.markdown("### People Metrics")
+st.dataframe(
+    ranked.nlargest(100, 'pagerank').rename(columns={
+        'name': 'Name', 'role': 'Role', 'titles': 'Titles', 'degree': 'Collaborators',
+        'strength': 'Shared Credits', 'pagerank': 'PageRank', 'community': 'Community'
+    }),
+    use_container_width=True,
+    height=400,
+    hide_index=True
+)
+
+# Add some spacing at the bottom
+st.markdown("<br><br>", unsafe_allow_html=True)
@@ -12,7 +12,15 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime
+import time
+import functools
 import warnings
+from data_access import get_catalog, get_figure_cache, filter_key, filter_rows
+from data_table import CSV_EXPORT_MAX_ROWS, page_bounds, export_csv
+from countries import ISO3_BY_CODE, NAME_BY_CODE, code_counts, attributed_counts
+from filter_index import intersect_rows
+from multivalue import token_counts
+from aggregations import flow_matrix, strongest_pair, hierarchical_rollup, rollup_nodes, cube_counts, build_count_cube
 warnings.filterwarnings('ignore')
 
 # Page configuration
@@ -230,92 +238,25 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-@st.cache_data
-def load_data():
-    """Load and preprocess the Netflix dataset."""
-    try:
-        df = pd.read_csv('netflix_titles_processed.csv')
-        df['date_added'] = pd.to_datetime(df['date_added'], errors='coerce')
-        df['year_month'] = pd.to_datetime(df['date_added']).dt.to_period('M')
-    except FileNotFoundError:
-        df = pd.read_csv('netflix_titles.csv')
-        df['date_added'] = pd.to_datetime(df['date_added'], errors='coerce')
-        df['year_added'] = df['date_added'].dt.year
-        df['month_added'] = df['date_added'].dt.month
-        df['month_name'] = df['date_added'].dt.strftime('%B')
-        df['country'] = df['country'].fillna('Unknown')
-        df['primary_country'] = df['country'].str.split(', ').apply(
-            lambda x: x[0] if isinstance(x, list) and len(x) > 0 else 'Unknown'
-        )
-        df['genres'] = df['listed_in'].str.split(', ')
-        df['primary_genre'] = df['genres'].apply(
-            lambda x: x[0] if isinstance(x, list) and len(x) > 0 else 'Unknown'
-        )
-        df['rating'] = df['rating'].fillna('Unknown')
-        df['decade'] = (df['release_year'] // 10) * 10
-        
-        def extract_duration(duration_str):
-            if pd.isna(duration_str):
-                return np.nan
-            if 'min' in str(duration_str):
-                try:
-                    return int(str(duration_str).split()[0])
-                except:
-                    return np.nan
-            return np.nan
-        
-        df['duration_minutes'] = df[df['type'] == 'Movie']['duration'].apply(extract_duration)
-        
-        def extract_seasons(duration_str):
-            if pd.isna(duration_str):
-                return np.nan
-            if 'Season' in str(duration_str):
-                try:
-                    return int(str(duration_str).split()[0])
-                except:
-                    return np.nan
-            return np.nan
-        
-        df['num_seasons'] = df[df['type'] == 'TV Show']['duration'].apply(extract_seasons)
-    
-    return df
-
-def create_sankey_diagram(df_filtered):
+def create_sankey_diagram(df_filtered, flow=None, n_genres=6, n_countries=6, weight=None):
     """Create a clear Sankey diagram showing genre-to-country content flow."""
-    # Get top genres and countries
-    top_genres = df_filtered['primary_genre'].value_counts().head(6).index.tolist()
-    top_countries = df_filtered['primary_country'].value_counts().head(6).index.tolist()
-    
-    # Create source-target-value pairs for Sankey
-    source = []
-    target = []
-    value = []
-    label = []
-    
-    # Add genre labels (left side)
-    genre_labels = {}
-    for i, genre in enumerate(top_genres):
-        genre_labels[genre] = i
-        label.append(genre[:20] if len(genre) <= 20 else genre[:17] + '...')
-    
-    # Add country labels (right side)
-    country_labels = {}
-    start_idx = len(top_genres)
-    for i, country in enumerate(top_countries):
-        country_labels[country] = start_idx + i
-        label.append(country[:20] if len(country) <= 20 else country[:17] + '...')
+    # Genre x country counts from a single grouped pass (reuse the caller's if given)
+    if flow is None:
+        flow = flow_matrix(df_filtered, 'primary_genre', 'primary_country', n_genres, n_countries, weight)
+    n_titles = df_filtered[weight].sum() if weight else len(filtered_rows)
+    top_genres = flow.index.tolist()
+    top_countries = flow.columns.tolist()
     
-    # Create connections with minimum threshold
-    min_threshold = max(5, len(df_filtered) // 200)
+    # Add genre labels (left side), then country labels (right side)
+    label = [genre[:20] if len(genre) <= 20 else genre[:17] + '...' for genre in top_genres]
+    label += [country[:20] if len(country) <= 20 else country[:17] + '...' for country in top_countries]
     
-    for genre in top_genres:
-        genre_data = df_filtered[df_filtered['primary_genre'] == genre]
-        for country in top_countries:
-            count = len(genre_data[genre_data['primary_country'] == country])
-            if count >= min_threshold:
-                source.append(genre_labels[genre])
-                target.append(country_labels[country])
-                value.append(count)
+    # Create connections with minimum threshold
+    min_threshold = max(5, n_titles // 200)
+    genre_idx, country_idx = np.nonzero(flow.to_numpy() >= min_threshold)
+    source = genre_idx.tolist()
+    target = (country_idx + len(top_genres)).tolist()
+    value = flow.to_numpy()[genre_idx, country_idx].tolist()
     
     if not source:
         return None
@@ -355,98 +296,24 @@ def create_sankey_diagram(df_filtered):
     
     return fig
 
-def get_country_iso_mapping():
-    """Map country names to ISO-3 codes for choropleth maps."""
-    country_mapping = {
-        'United States': 'USA',
-        'India': 'IND',
-        'United Kingdom': 'GBR',
-        'Canada': 'CAN',
-        'France': 'FRA',
-        'Japan': 'JPN',
-        'Spain': 'ESP',
-        'South Korea': 'KOR',
-        'Germany': 'DEU',
-        'Australia': 'AUS',
-        'Mexico': 'MEX',
-        'Brazil': 'BRA',
-        'Italy': 'ITA',
-        'Turkey': 'TUR',
-        'Argentina': 'ARG',
-        'Netherlands': 'NLD',
-        'Poland': 'POL',
-        'Sweden': 'SWE',
-        'Belgium': 'BEL',
-        'Norway': 'NOR',
-        'Denmark': 'DNK',
-        'South Africa': 'ZAF',
-        'Thailand': 'THA',
-        'Philippines': 'PHL',
-        'Indonesia': 'IDN',
-        'Malaysia': 'MYS',
-        'Singapore': 'SGP',
-        'New Zealand': 'NZL',
-        'Ireland': 'IRL',
-        'Greece': 'GRC',
-        'Portugal': 'PRT',
-        'Switzerland': 'CHE',
-        'Austria': 'AUT',
-        'Finland': 'FIN',
-        'Czech Republic': 'CZE',
-        'Hungary': 'HUN',
-        'Romania': 'ROU',
-        'Chile': 'CHL',
-        'Colombia': 'COL',
-        'Peru': 'PER',
-        'Venezuela': 'VEN',
-        'Ecuador': 'ECU',
-        'Egypt': 'EGY',
-        'Israel': 'ISR',
-        'United Arab Emirates': 'ARE',
-        'Saudi Arabia': 'SAU',
-        'Lebanon': 'LBN',
-        'Morocco': 'MAR',
-        'Nigeria': 'NGA',
-        'Kenya': 'KEN',
-        'Ghana': 'GHA',
-        'Russia': 'RUS',
-        'China': 'CHN',
-        'Taiwan': 'TWN',
-        'Hong Kong': 'HKG',
-        'Vietnam': 'VNM',
-        'Pakistan': 'PAK',
-        'Bangladesh': 'BGD',
-        'Sri Lanka': 'LKA',
-        'Nepal': 'NPL',
-    }
-    return country_mapping
-
-def create_geospatial_map(df_filtered):
-    """Create a choropleth map showing content distribution by country."""
-    # Get country counts
-    country_counts = df_filtered['primary_country'].value_counts().reset_index()
-    country_counts.columns = ['country', 'count']
-    
-    # Remove 'Unknown' country
-    country_counts = country_counts[country_counts['country'] != 'Unknown']
-    
-    if len(country_counts) == 0:
-        return None
-    
-    # Get country mapping
-    country_mapping = get_country_iso_mapping()
-    
-    # Map country names to ISO codes
-    country_counts['iso_code'] = country_counts['country'].map(country_mapping)
-    
-    # Filter to countries with valid ISO codes
-    country_counts = country_counts.dropna(subset=['iso_code'])
+def create_geospatial_map(iso_counts, fractional=False):
+    """
+    Create a choropleth map showing content distribution by country.
     
-    if len(country_counts) == 0:
+    ``iso_counts`` holds the titles per ISO 3166-1 numeric code (see
+    countries.code_counts); countries without titles are left blank.
+    Fractional counts (shared co-productions) are shown with one decimal.
+    """
+    codes = np.flatnonzero(iso_counts)
+    if len(codes) == 0:
         return None
     
     # Sort by country name to ensure consistent ordering
-    country_counts = country_counts.sort_values('country').reset_index(drop=True)
+    country_counts = pd.DataFrame({
+        'country': NAME_BY_CODE[codes],
+        'iso_code': ISO3_BY_CODE[codes],
+        'count': iso_counts[codes],
+    }).sort_values('country').reset_index(drop=True)
     
     # Create choropleth map using graph objects for better hover control
     fig = go.Figure(data=go.Choropleth(
@@ -466,7 +333,7 @@ def create_geospatial_map(df_filtered):
             bordercolor='#404040',
             borderwidth=1
         ),
-        hovertemplate='<b>%{text}</b><br>Number of Titles: %{z:,}<extra></extra>',
+        hovertemplate='<b>%{text}</b><br>Number of Titles: %{z:,' + ('.1f' if fractional else '') + '}<extra></extra>',
         locationmode='ISO-3'
     ))
     
@@ -501,82 +368,60 @@ def create_geospatial_map(df_filtered):
     
     return fig
 
-def create_treemap(df_filtered):
+def create_treemap(df_filtered, levels=('primary_country', 'primary_genre', 'type'), top_k=(8, 4, None), weight=None):
     """Create a clean treemap showing hierarchical data: Country -> Genre -> Type."""
-    # Filter to top countries and genres for clarity
-    top_countries = df_filtered['primary_country'].value_counts().head(8).index.tolist()
+    # One grouped count, top-k children per parent (default: 8 countries, 4 genres each)
+    leaves = hierarchical_rollup(df_filtered, levels, top_k, weight)
     
-    # Prepare hierarchical data with minimum thresholds
-    treemap_data = []
-    min_count = max(3, len(df_filtered) // 300)  # Dynamic minimum threshold
+    # Minimum threshold on leaf counts
+    n_titles = df_filtered[weight].sum() if weight else len(filtered_rows)
+    min_count = max(3, n_titles // 300)  # Dynamic minimum threshold
+    leaves = leaves[leaves['count'] >= min_count]
     
-    for country in top_countries:
-        country_data = df_filtered[df_filtered['primary_country'] == country]
-        # Get top genres per country
-        top_genres_country = country_data['primary_genre'].value_counts().head(4).index.tolist()
-        
-        for genre in top_genres_country:
-            genre_data = country_data[country_data['primary_genre'] == genre]
-            for content_type in genre_data['type'].unique():
-                count = len(genre_data[genre_data['type'] == content_type])
-                if count >= min_count:
-                    # Shorten long names for better display
-                    country_short = country[:20] + '...' if len(country) > 20 else country
-                    genre_short = genre[:25] + '...' if len(genre) > 25 else genre
-                    
-                    treemap_data.append({
-                        'Country': country_short,
-                        'Genre': genre_short,
-                        'Type': content_type,
-                        'Count': count,
-                        'Full_Country': country,
-                        'Full_Genre': genre
-                    })
-    
-    if not treemap_data:
+    if leaves.empty:
         return None
     
-    df_treemap = pd.DataFrame(treemap_data)
+    # Shorten long names for better display
+    nodes = rollup_nodes(leaves, levels, root_label="All Content", label_widths=(20, 25, None))
     
     # Create treemap with better styling
-    fig = px.treemap(
-        df_treemap,
-        path=[px.Constant("All Content"), 'Country', 'Genre', 'Type'],
-        values='Count',
-        color='Count',
-        color_continuous_scale=[[0, '#1a1a1a'], [0.3, '#2a2a2a'], [0.6, '#E50914'], [1, '#ff1a1a']],
-        title="Content Hierarchy: Country → Genre → Type",
-        hover_data={'Count': True, 'Full_Country': False, 'Full_Genre': False},
-        custom_data=['Full_Country', 'Full_Genre']
-    )
-    
-    # Update hover template
-    fig.update_traces(
+    fig = go.Figure(go.Treemap(
+        ids=nodes['ids'],
+        parents=nodes['parents'],
+        labels=nodes['labels'],
+        values=nodes['values'],
+        branchvalues='total',
+        marker=dict(
+            colors=nodes['colors'],
+            colorscale=[[0, '#1a1a1a'], [0.3, '#2a2a2a'], [0.6, '#E50914'], [1, '#ff1a1a']],
+            showscale=True,
+            colorbar=dict(
+                title=dict(text="Count", font=dict(color='#ffffff', family='Helvetica Neue')),
+                tickfont=dict(color='#ffffff', family='Helvetica Neue'),
+                bgcolor='#1f1f1f',
+                bordercolor='#404040'
+            ),
+            line=dict(width=2, color='#141414')
+        ),
         hovertemplate='<b>%{label}</b><br>Count: %{value}<extra></extra>',
         textfont=dict(size=14, color='#ffffff', family='Helvetica Neue'),
         textposition="middle center",
-        texttemplate='<b>%{label}</b><br>%{value}',
-        marker=dict(line=dict(width=2, color='#141414'))
-    )
+        texttemplate='<b>%{label}</b><br>%{value}'
+    ))
     
     fig.update_layout(
         plot_bgcolor='#141414',
         paper_bgcolor='#141414',
         font=dict(color='#ffffff', size=12, family='Helvetica Neue'),
         title=dict(
+            text="Content Hierarchy: Country → Genre → Type",
             font=dict(size=18, color='#E50914', family='Helvetica Neue'),
             x=0.5,
             xanchor='center',
             pad=dict(b=20)
         ),
         height=550,
-        transition_duration=500,
-        coloraxis_colorbar=dict(
-            title=dict(text="Count", font=dict(color='#ffffff', family='Helvetica Neue')),
-            tickfont=dict(color='#ffffff', family='Helvetica Neue'),
-            bgcolor='#1f1f1f',
-            bordercolor='#404040'
-        )
+        transition_duration=500
     )
     
     return fig
@@ -623,8 +468,11 @@ def create_floating_elements():
     });
     </script>
     """, unsafe_allow_html=True)
-# Load data
-df = load_data()
+# Load data (shared, read-only catalog)
+catalog = get_catalog()
+df = catalog.titles
+# Figures already rendered for a filter state, shared by all sessions
+figure_cache = get_figure_cache()
 
 # Initialize session state for smooth transitions
 if 'filter_changed' not in st.session_state:
@@ -651,8 +499,11 @@ with st.sidebar:
     st.markdown("### FILTERS")
     st.markdown("---")
     
+    # Option lists come from the precomputed leaderboards
+    leaderboards = catalog.leaderboards
+    
     # Type filter
-    content_types = ['All'] + list(df['type'].unique())
+    content_types = ['All'] + leaderboards['type', 'All', False].index.tolist()
     selected_type = st.selectbox("Content Type", content_types, key='type_filter')
     
     # Year range filter
@@ -667,52 +518,102 @@ with st.sidebar:
         key='year_filter'
     )
     
+    # Country/genre matching: the first listed value, or any listed value
+    match_mode = st.radio("Match Country/Genre", ['Primary', 'Any listed'], key='match_mode', horizontal=True)
+    match_any = match_mode == 'Any listed'
+    
     # Country filter
-    countries = ['All'] + sorted(df['primary_country'].value_counts().head(20).index.tolist())
+    if match_any:
+        country_counts = catalog.token_index['country_list'].counts()
+    else:
+        country_counts = leaderboards['primary_country', 'All', False]
+    countries = ['All'] + sorted(country_counts.head(20).index.tolist())
     selected_country = st.selectbox("Top Countries", countries, key='country_filter')
     
     # Genre filter
-    genres = ['All'] + sorted(df['primary_genre'].value_counts().head(15).index.tolist())
+    if match_any:
+        genre_counts = catalog.token_index['genres'].counts()
+    else:
+        genre_counts = leaderboards['primary_genre', 'All', False]
+    genres = ['All'] + sorted(genre_counts.head(15).index.tolist())
     selected_genre = st.selectbox("Top Genres", genres, key='genre_filter')
     
     # Rating filter
-    ratings = ['All'] + sorted(df['rating'].unique())
+    ratings = ['All'] + sorted(leaderboards['rating', 'All', False].index.tolist())
     selected_rating = st.selectbox("Content Rating", ratings, key='rating_filter')
-
-# Apply filters
-df_filtered = df.copy()
-
-if selected_type != 'All':
-    df_filtered = df_filtered[df_filtered['type'] == selected_type]
-
-# Apply year filter only if year_added column has non-null values
-if not df_filtered['year_added'].isna().all():
-    df_filtered = df_filtered[
-        (df_filtered['year_added'] >= year_range[0]) & 
-        (df_filtered['year_added'] <= year_range[1])
-    ]
-
-if selected_country != 'All':
-    df_filtered = df_filtered[df_filtered['primary_country'] == selected_country]
-
-if selected_genre != 'All':
-    df_filtered = df_filtered[df_filtered['primary_genre'] == selected_genre]
-
-if selected_rating != 'All':
-    df_filtered = df_filtered[df_filtered['rating'] == selected_rating]
+    
+    st.markdown("---")
+    st.markdown("### LAYOUT")
+    # One at a time: only the selected section below the key metrics is computed and rendered
+    section_mode = st.radio("Sections", ['All', 'One at a time'], key='section_mode', horizontal=True)
+
+# Apply filters: resolve the row ids from the bitmap index, then take them once
+filter_equals = {
+    'type': selected_type,
+    'rating': selected_rating,
+}
+token_filters = {}
+if match_any:
+    # Any listed country/genre: intersect the posting lists of the inverted index
+    token_filters = {'country_list': selected_country, 'genres': selected_genre}
+else:
+    filter_equals.update({'primary_country': selected_country, 'primary_genre': selected_genre})
+dashboard_filter = filter_key(
+    filter_equals,
+    # Apply year filter only if year_added column has non-null values
+    value_range=year_range if not df['year_added'].isna().all() else None,
+    tokens=token_filters
+)
+# Kept in the session so other pages can reuse the Dashboard selection
+st.session_state['dashboard_filter_key'] = dashboard_filter
+filtered_rows = filter_rows(catalog, dashboard_filter)
+active_equals, filter_range, filter_tokens = dashboard_filter
+
+# Shared inputs of the sections below; each is built on first use in this run, so hidden sections cost nothing
+@functools.cache
+def filtered_titles():
+    return df.take(filtered_rows)
+
+@functools.cache
+def filtered_cube():
+    # Chart aggregates: slice the precomputed count cube with the same filters and sum cells
+    if not filter_tokens:
+        return catalog.cube.take(catalog.cube_index.rows(dict(active_equals), filter_range))
+    # The cube is keyed by primary values only, so aggregate the matching titles instead
+    return build_count_cube(filtered_titles())
+
+@functools.cache
+def cube_totals(column):
+    return cube_counts(filtered_cube(), column, sort=True)
+
+@functools.cache
+def top_totals(column):
+    # Top-k charts: with at most a type filter and the full year range, read the precomputed leaderboards
+    if (selected_country, selected_genre, selected_rating) == ('All', 'All', 'All') and tuple(year_range) == (min_year, max_year):
+        # The year filter drops undated titles; the 'dated' boards do the same
+        board = leaderboards.get((column, selected_type, filter_range is not None))
+        if board is not None:
+            return board
+    return cube_totals(column)
+
+# The key metrics read two columns of the matching titles only
+type_totals = df['type'].take(filtered_rows).value_counts()
+years_added = df['year_added'].take(filtered_rows)
+has_year_data = years_added.notna().any()
 
 # Dashboard content
 st.markdown("### Active Filters")
 chips = []
 chips.append(f'<span class="filter-chip">Type: {selected_type}</span>')
 chips.append(f'<span class="filter-chip">Years: {year_range[0]} - {year_range[1]}</span>')
-chips.append(f'<span class="filter-chip">Country: {selected_country}</span>')
-chips.append(f'<span class="filter-chip">Genre: {selected_genre}</span>')
+match_label = ' (any listed)' if match_any else ''
+chips.append(f'<span class="filter-chip">Country: {selected_country}{match_label}</span>')
+chips.append(f'<span class="filter-chip">Genre: {selected_genre}{match_label}</span>')
 chips.append(f'<span class="filter-chip">Rating: {selected_rating}</span>')
 st.markdown("".join(chips), unsafe_allow_html=True)
 st.markdown("<br>", unsafe_allow_html=True)
 
-if len(df_filtered) == 0:
+if len(filtered_rows) == 0:
     st.warning("No records match the selected filters. Try relaxing a filter to see results.")
     
 # Key Metrics
@@ -723,26 +624,26 @@ kcol1, kcol2, kcol3, kcol4, kcol5 = st.columns(5)
 with kcol1:
     st.markdown(
         f"""<div class="metric-card"><div class="metric-label">Total Titles</div>
-        <div class="metric-value">{len(df_filtered):,}</div></div>""",
+        <div class="metric-value">{len(filtered_rows):,}</div></div>""",
         unsafe_allow_html=True,
     )
 with kcol2:
-    movies_count = len(df_filtered[df_filtered['type'] == 'Movie'])
+    movies_count = int(type_totals.get('Movie', 0))
     st.markdown(
         f"""<div class="metric-card"><div class="metric-label">Movies</div>
         <div class="metric-value">{movies_count:,}</div></div>""",
         unsafe_allow_html=True,
     )
 with kcol3:
-    tv_count = len(df_filtered[df_filtered['type'] == 'TV Show'])
+    tv_count = int(type_totals.get('TV Show', 0))
     st.markdown(
         f"""<div class="metric-card"><div class="metric-label">TV Shows</div>
         <div class="metric-value">{tv_count:,}</div></div>""",
         unsafe_allow_html=True,
     )
 with kcol4:
-    if not df_filtered['year_added'].isna().all():
-        avg_per_year = len(df_filtered) / (year_range[1] - year_range[0] + 1)
+    if has_year_data:
+        avg_per_year = len(filtered_rows) / (year_range[1] - year_range[0] + 1)
         st.markdown(
             f"""<div class="metric-card"><div class="metric-label">Avg per Year</div>
             <div class="metric-value">{avg_per_year:.0f}</div></div>""",
@@ -751,14 +652,13 @@ with kcol4:
 with kcol5:
     # Featured Content Card - Most Recently Added Notable Title
     featured = None
-    if not df_filtered.empty:
+    if len(filtered_rows) > 0:
         # Get most recently added title (if year_added is available)
-        if not df_filtered['year_added'].isna().all():
-            df_sorted = df_filtered.sort_values('year_added', ascending=False, na_position='last')
-            featured = df_sorted.iloc[0] if len(df_sorted) > 0 else None
+        if has_year_data:
+            featured = df.loc[years_added.idxmax()]
         else:
             # Fallback: get a random notable title
-            featured = df_filtered.iloc[0] if len(df_filtered) > 0 else None
+            featured = df.iloc[filtered_rows[0]]
     
     if featured is not None:
         full_title = str(featured['title']).replace('"', '&quot;')  # Escape quotes for HTML
@@ -785,6 +685,22 @@ with kcol5:
             unsafe_allow_html=True,
         )
 st.markdown("</div>", unsafe_allow_html=True)
+
+# Titles like the featured one: nearest neighbours in the similarity index, within the filters
+if featured is not None:
+    similar_rows, similar_scores = catalog.similar.similar(int(featured.name), within=filtered_rows, limit=5)
+    if len(similar_rows) > 0:
+        st.markdown(f"#### Titles Like {featured['title']}")
+        similar_cols = st.columns(5)
+        for col, (_, similar_title), score in zip(similar_cols, df.take(similar_rows).iterrows(), similar_scores):
+            with col:
+                similar_name = str(similar_title['title']).replace('"', '&quot;')
+                similar_year = f" · {int(similar_title['release_year'])}" if not pd.isna(similar_title['release_year']) else ""
+                st.markdown(
+                    f"""<div class="metric-card"><div class="metric-label">{similar_title['type']}{similar_year} · {score:.0%} match</div>
+                    <div class="metric-value" style="font-size: 0.85rem; line-height: 1.35; white-space: normal; max-height: 3.5em; overflow: hidden;" title="{similar_name}">{similar_name}</div></div>""",
+                    unsafe_allow_html=True,
+                )
 st.markdown("<br>", unsafe_allow_html=True)
 
 # Add glow animation style
@@ -805,604 +721,925 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# SANKEY DIAGRAM AND TREEMAP SECTION
-st.markdown('<div class="section-box">', unsafe_allow_html=True)
-st.markdown("### Content Flow & Hierarchical Views")
+# Sections below the key metrics, each computed only when it is rendered
+dashboard_sections = ['Content Flow', 'Geospatial', 'Temporal Trends', 'Comparative', 'Patterns', 'People', 'Title Search', 'Data Table']
+section_widgets = {
+    'Content Flow': ('sankey_genres', 'sankey_countries', 'treemap_depth', 'treemap_countries', 'treemap_genres'),
+    'Geospatial': ('map_attribution',),
+    'People': ('people_role', 'people_lookup'),
+    'Title Search': ('search_query',),
+    'Data Table': ('table_type', 'table_rating', 'table_primary_country', 'table_primary_genre',
+                   'table_sort', 'table_descending', 'table_page_size', 'table_page'),
+}
+if section_mode == 'One at a time':
+    visible_sections = {st.radio("Section", dashboard_sections, key='dashboard_section', horizontal=True, label_visibility='collapsed')}
+    # Streamlit drops the state of widgets that are not rendered; keep the hidden sections' settings
+    for section, widget_keys in section_widgets.items():
+        if section not in visible_sections:
+            for widget_key in widget_keys:
+                if widget_key in st.session_state:
+                    st.session_state[widget_key] = st.session_state[widget_key]
+else:
+    visible_sections = set(dashboard_sections)
 
-col1, col2 = st.columns(2)
+# SANKEY DIAGRAM AND TREEMAP SECTION
+if 'Content Flow' in visible_sections:
+    st.markdown('<div class="section-box">', unsafe_allow_html=True)
+    st.markdown("### Content Flow & Hierarchical Views")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### Genre → Country Content Flow")
+        
+        # Interpretation guide
+        with st.expander("How to Read This Diagram", expanded=False):
+            st.markdown("""
+            **Visual Guide:**
+            - **Left (Red)**: Top Genres | **Right (Gray)**: Top Countries
+            - **Band width** = Number of titles (wider = more titles)
+            - **Hover** over any band to see exact count
+            
+            **Insights:**
+            - Thick bands indicate strong genre-country relationships
+            - Multiple connections show content diversity
+            - Quickly identify which genres dominate in which countries
+            """)
+        
+        scol1, scol2 = st.columns(2)
+        with scol1:
+            sankey_n_genres = st.slider("Genres shown", 3, 15, 6, key='sankey_genres')
+        with scol2:
+            sankey_n_countries = st.slider("Countries shown", 3, 15, 6, key='sankey_countries')
+        
+        def build_sankey():
+            # One grouped count feeds both the diagram and its insights
+            genre_country_flow = flow_matrix(filtered_cube(), 'primary_genre', 'primary_country',
+                                             sankey_n_genres, sankey_n_countries, weight='count')
+            # Find strongest relationship among the top 3 genres and top 3 countries
+            strongest = strongest_pair(genre_country_flow, 3, 3)
+            return create_sankey_diagram(filtered_cube(), genre_country_flow, weight='count'), {'strongest': strongest}
+        
+        sankey_fig, sankey_facts = figure_cache.figure(('sankey', dashboard_filter, sankey_n_genres, sankey_n_countries), build_sankey)
+        if sankey_fig:
+            st.plotly_chart(sankey_fig, use_container_width=True, config={'displayModeBar': False})
+            
+            # Insights
+            with st.expander("Insights - Genre-Country Flow"):
+                strongest = sankey_facts['strongest']
+                max_count = strongest[2] if strongest else 0
+                
+                st.write(f"""
+                - **Strongest Relationship**: {strongest[0] if strongest else 'N/A'} → {strongest[1] if strongest else 'N/A'} ({max_count} titles)
+                - **Content Flow**: Identify which genres dominate in which countries
+                - **Market Opportunities**: Thin or missing connections indicate potential content gaps
+                - **Strategic Planning**: Focus acquisition efforts on high-flow genre-country combinations
+                """)
+        else:
+            st.info("Insufficient data for Sankey diagram")
+    
+    with col2:
+        st.markdown("#### Content Hierarchy Treemap")
+        
+        # Interpretation guide
+        with st.expander("How to Read This Treemap", expanded=False):
+            st.markdown("""
+            **Hierarchical Structure:**
+            - **Outer Level**: Countries (largest rectangles)
+            - **Middle Level**: Genres within each country
+            - **Inner Level**: Content type (Movie/TV Show) within each genre
+            
+            **Visual Encoding:**
+            - **Rectangle Size** = Number of titles (larger = more content)
+            - **Color Intensity** = Content count (darker red = more titles)
+            - **Nested Structure** = Shows how content is organized hierarchically
+            
+            **What to Look For:**
+            - **Largest rectangles** = Countries/genres with most content
+            - **Color patterns** = Identify high-content areas (darker red)
+            - **Nesting depth** = Shows content diversity within categories
+            - **Proportions** = Compare relative sizes between different segments
+            
+            **Key Insights:**
+            - Identify dominant countries and their preferred genres
+            - Understand content mix (Movies vs TV Shows) by country/genre
+            - Discover content concentration patterns
+            - Spot opportunities in underrepresented segments
+            """)
+        
+        tcol1, tcol2, tcol3 = st.columns(3)
+        with tcol1:
+            treemap_depth = st.selectbox("Levels", [1, 2, 3], index=2,
+                                         format_func=lambda d: " → ".join(['Country', 'Genre', 'Type'][:d]),
+                                         key='treemap_depth')
+        with tcol2:
+            treemap_top_countries = st.slider("Top countries", 3, 15, 8, key='treemap_countries')
+        with tcol3:
+            treemap_top_genres = st.slider("Top genres per country", 1, 10, 4, key='treemap_genres')
+        
+        def build_treemap():
+            figure = create_treemap(
+                filtered_cube(),
+                levels=('primary_country', 'primary_genre', 'type')[:treemap_depth],
+                top_k=(treemap_top_countries, treemap_top_genres, None),
+                weight='count'
+            )
+            if figure is None:
+                return None, {}
+            country_totals = cube_totals('primary_country')
+            top_country = country_totals.index[0]
+            cube = filtered_cube()
+            top_genre_in_country = cube_counts(
+                cube[cube['primary_country'] == top_country], 'primary_genre', sort=True
+            ).index[0]
+            return figure, {
+                'top_country': str(top_country),
+                'top_country_count': int(country_totals.values[0]),
+                'top_genre_in_country': str(top_genre_in_country),
+            }
+        
+        treemap_fig, treemap_facts = figure_cache.figure(
+            ('treemap', dashboard_filter, treemap_depth, treemap_top_countries, treemap_top_genres), build_treemap
+        )
+        if treemap_fig:
+            st.plotly_chart(treemap_fig, use_container_width=True, config={'displayModeBar': False})
+            
+            # Insights
+            with st.expander("Insights - Content Hierarchy"):
+                top_country = treemap_facts['top_country']
+                top_country_count = treemap_facts['top_country_count']
+                top_genre_in_country = treemap_facts['top_genre_in_country']
+                
+                st.write(f"""
+                - **Dominant Country**: {top_country} with {int(top_country_count)} titles
+                - **Top Genre in {top_country}**: {top_genre_in_country}
+                - **Hierarchical Patterns**: Understand content organization across countries and genres
+                - **Content Concentration**: Identify where content is most concentrated
+                - **Diversification Opportunities**: Spot underrepresented country-genre combinations
+                """)
+        else:
+            st.info("Insufficient data for treemap")
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown("<br>", unsafe_allow_html=True)
 
-with col1:
-    st.markdown("#### Genre → Country Content Flow")
+# GEOSPATIAL VISUALIZATION
+if 'Geospatial' in visible_sections:
+    st.markdown('<div class="section-box">', unsafe_allow_html=True)
+    st.markdown("### Geospatial Analysis")
+    
+    st.markdown("#### Global Content Distribution Map")
     
     # Interpretation guide
-    with st.expander("How to Read This Diagram", expanded=False):
+    with st.expander("How to Read This Map", expanded=False):
         st.markdown("""
         **Visual Guide:**
-        - **Left (Red)**: Top Genres | **Right (Gray)**: Top Countries
-        - **Band width** = Number of titles (wider = more titles)
-        - **Hover** over any band to see exact count
+        - **Color Intensity**: Darker red indicates more content from that country
+        - **Hover**: Move your cursor over any country to see exact title count
+        - **Scale**: The color scale ranges from dark (few titles) to bright red (many titles)
+        
+        **Key Insights:**
+        - Identify geographic concentration of content production
+        - Understand global content distribution patterns
+        - Spot regions with high or low content representation
+        - Analyze international content strategy and market focus
         
-        **Insights:**
-        - Thick bands indicate strong genre-country relationships
-        - Multiple connections show content diversity
-        - Quickly identify which genres dominate in which countries
+        **What to Look For:**
+        - **Bright red countries**: Major content producers (e.g., United States, India)
+        - **Dark countries**: Limited content representation
+        - **Regional patterns**: Clusters of content-producing regions
+        - **Geographic gaps**: Regions with potential for content expansion
         """)
     
-    sankey_fig = create_sankey_diagram(df_filtered)
-    if sankey_fig:
-        st.plotly_chart(sankey_fig, use_container_width=True, config={'displayModeBar': False})
+    # Co-productions: credit the first listed country, or every listed one (fully or split evenly)
+    map_attribution = st.radio("Country Attribution", ['Primary country', 'All listed', 'All listed (shared)'],
+                               key='map_attribution', horizontal=True)
+    if map_attribution == 'All listed':
+        st.caption("Co-productions count fully for each listed country, so country totals exceed the number of titles.")
+    elif map_attribution == 'All listed (shared)':
+        st.caption("Each title is split evenly across its listed countries, so country totals add up to the titles with a known country.")
+    
+    def build_geospatial():
+        # Titles per ISO code: the preprocessed primary code, or the exploded codes of every listed country
+        if map_attribution == 'Primary country':
+            iso_counts = code_counts(df['primary_country_iso'].to_numpy()[filtered_rows])
+        else:
+            iso_counts = attributed_counts(catalog.country_iso, filtered_rows, fractional=map_attribution == 'All listed (shared)')
+        
+        # Countries by titles credited (ties by name), matching what the map shows
+        codes = np.flatnonzero(iso_counts)
+        codes = codes[np.lexsort((NAME_BY_CODE[codes], -iso_counts[codes]))]
+        facts = {
+            'n_countries': len(codes),
+            'top_countries': [[str(NAME_BY_CODE[code]), float(iso_counts[code])] for code in codes[:5]],
+            # Full co-production credits add up past the title count, so shares are of all credits
+            'total': float(iso_counts.sum()) if map_attribution == 'All listed' else len(filtered_rows),
+        }
+        return create_geospatial_map(iso_counts, fractional=map_attribution == 'All listed (shared)'), facts
+    
+    # Create and display geospatial map
+    geospatial_fig, geo_facts = figure_cache.figure(('geospatial', dashboard_filter, map_attribution), build_geospatial)
+    top_countries = geo_facts['top_countries']
+    
+    def titles_text(count):
+        # Shared credits are fractional
+        return f"{count:.1f}" if map_attribution == 'All listed (shared)' else f"{int(count)}"
+    
+    if geospatial_fig:
+        st.plotly_chart(geospatial_fig, use_container_width=True, config={'displayModeBar': False})
         
         # Insights
-        with st.expander("Insights - Genre-Country Flow"):
-            top_genres = df_filtered['primary_genre'].value_counts().head(3).index.tolist()
-            top_countries = df_filtered['primary_country'].value_counts().head(3).index.tolist()
+        with st.expander("Insights - Global Content Distribution"):
+            if len(top_countries) > 0:
+                top_country, top_count = top_countries[0]
+                top_3_total = sum(count for _, count in top_countries[:3])
+                total_countries = geo_facts['n_countries']
+                total_pct = (top_3_total / geo_facts['total'] * 100) if geo_facts['total'] > 0 else 0
+                
+                st.write(f"""
+                - **Top Content Producer**: {top_country} with {titles_text(top_count)} titles
+                - **Top 3 Countries**: Combined {titles_text(top_3_total)} titles ({total_pct:.1f}% of total)
+                - **Geographic Diversity**: Content from {total_countries} different countries
+                - **Global Reach**: {'High' if total_countries > 50 else 'Moderate' if total_countries > 20 else 'Limited'} geographic diversity
+                - **Market Concentration**: {'High' if total_pct > 60 else 'Moderate' if total_pct > 40 else 'Low'} concentration in top 3 countries
+                - **Strategic Insight**: Identify opportunities for content expansion in underrepresented regions
+                - **International Strategy**: Balance between major markets and emerging content-producing regions
+                """)
+            else:
+                st.info("No country data available for geospatial analysis.")
+    else:
+        st.info("Insufficient data for geospatial visualization. Please adjust filters to include country data.")
+    
+    # Additional geographic insights
+    st.markdown("#### Geographic Content Statistics")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Countries Represented", f"{geo_facts['n_countries']}")
+    
+    with col2:
+        if len(top_countries) > 0:
+            top_country, top_count = top_countries[0]
+            st.metric("Top Producer", f"{top_country[:15]}...", f"{titles_text(top_count)} titles")
+        else:
+            st.metric("Top Producer", "N/A")
+    
+    with col3:
+        if len(top_countries) > 0:
+            top_5_total = sum(count for _, count in top_countries)
+            top_5_pct = (top_5_total / geo_facts['total'] * 100) if geo_facts['total'] > 0 else 0
+            st.metric("Top 5 Countries Share", f"{top_5_pct:.1f}%", f"{titles_text(top_5_total)} titles")
+        else:
+            st.metric("Top 5 Countries Share", "N/A")
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown("<br>", unsafe_allow_html=True)
+
+# TEMPORAL VISUALIZATIONS
+if 'Temporal Trends' in visible_sections:
+    st.markdown('<div class="section-box">', unsafe_allow_html=True)
+    st.markdown("### Temporal Trends & Evolution")
+    
+    # 1. Content Added Over Time (Yearly)
+    if has_year_data:
+        st.markdown("#### Content Added Over Time (Yearly Trend)")
+        
+        def build_yearly():
+            yearly_data = cube_counts(filtered_cube(), ['year_added', 'type']).reset_index(name='count')
+            yearly_total = cube_counts(filtered_cube(), 'year_added').reset_index(name='total')
+            
+            fig_yearly = go.Figure()
+            
+            # Add total line
+            fig_yearly.add_trace(go.Scatter(
+                x=yearly_total['year_added'],
+                y=yearly_total['total'],
+                mode='lines+markers',
+                name='Total',
+                line=dict(color='#E50914', width=3),
+                marker=dict(size=8, color='#E50914')
+            ))
+            
+            # Add type-specific lines
+            for content_type in yearly_data['type'].unique():
+                type_data = yearly_data[yearly_data['type'] == content_type]
+                color = '#564d4d' if content_type == 'TV Show' else '#b3b3b3'
+                fig_yearly.add_trace(go.Scatter(
+                    x=type_data['year_added'],
+                    y=type_data['count'],
+                    mode='lines+markers',
+                    name=content_type,
+                    line=dict(width=2, color=color),
+                    marker=dict(size=6, color=color)
+                ))
+            
+            fig_yearly.update_layout(
+                title="Content Addition Trend Over Years",
+                xaxis_title="Year",
+                yaxis_title="Number of Titles Added",
+                hovermode='x unified',
+                height=400,
+                plot_bgcolor='#1f1f1f',
+                paper_bgcolor='#141414',
+                font=dict(color='#ffffff', family='Helvetica Neue'),
+                transition_duration=500,
+                legend=dict(bgcolor='#1f1f1f', bordercolor='#404040')
+            )
+            
+            peak = yearly_total.loc[yearly_total['total'].idxmax()]
+            facts = {
+                'peak_year': int(peak['year_added']),
+                'peak_count': int(peak['total']),
+                'first_total': int(yearly_total['total'].iloc[0]),
+                'last_total': int(yearly_total['total'].iloc[-1]),
+                'n_years': len(yearly_total),
+            }
+            return fig_yearly, facts
             
-            # Find strongest relationship
-            strongest = None
-            max_count = 0
-            for genre in top_genres:
-                genre_data = df_filtered[df_filtered['primary_genre'] == genre]
-                for country in top_countries:
-                    count = len(genre_data[genre_data['primary_country'] == country])
-                    if count > max_count:
-                        max_count = count
-                        strongest = (genre, country)
+        fig_yearly, yearly_facts = figure_cache.figure(('yearly', dashboard_filter), build_yearly)
+        st.plotly_chart(fig_yearly, use_container_width=True, config={'displayModeBar': False})
+        
+        # Insights
+        with st.expander("Insights - Yearly Trend"):
+            peak_year = yearly_facts['peak_year']
+            peak_count = yearly_facts['peak_count']
+            growth_rate = ((yearly_facts['last_total'] - yearly_facts['first_total']) / 
+                          yearly_facts['first_total'] * 100) if yearly_facts['n_years'] > 1 else 0
             
             st.write(f"""
-            - **Strongest Relationship**: {strongest[0] if strongest else 'N/A'} → {strongest[1] if strongest else 'N/A'} ({max_count} titles)
-            - **Content Flow**: Identify which genres dominate in which countries
-            - **Market Opportunities**: Thin or missing connections indicate potential content gaps
-            - **Strategic Planning**: Focus acquisition efforts on high-flow genre-country combinations
+            - **Peak Addition Year**: {int(peak_year)} with {int(peak_count)} titles added
+            - **Growth Pattern**: {'Rapid growth' if growth_rate > 50 else 'Steady growth' if growth_rate > 0 else 'Declining'} 
+              ({growth_rate:.1f}% change from first to last year)
+            - **Content Strategy**: The platform shows {'consistent' if growth_rate > 0 else 'variable'} content addition patterns
             """)
-    else:
-        st.info("Insufficient data for Sankey diagram")
-
-with col2:
-    st.markdown("#### Content Hierarchy Treemap")
     
-    # Interpretation guide
-    with st.expander("How to Read This Treemap", expanded=False):
-        st.markdown("""
-        **Hierarchical Structure:**
-        - **Outer Level**: Countries (largest rectangles)
-        - **Middle Level**: Genres within each country
-        - **Inner Level**: Content type (Movie/TV Show) within each genre
+    # 2. Monthly Pattern Analysis (month_added is set exactly where year_added is)
+    if has_year_data:
+        st.markdown("#### Monthly Addition Patterns")
         
-        **Visual Encoding:**
-        - **Rectangle Size** = Number of titles (larger = more content)
-        - **Color Intensity** = Content count (darker red = more titles)
-        - **Nested Structure** = Shows how content is organized hierarchically
+        def build_monthly():
+            monthly_data = cube_counts(filtered_cube(), 'month_added').reset_index(name='count')
+            month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
+                          'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+            monthly_data['month_name'] = monthly_data['month_added'].apply(
+                lambda x: month_names[int(x)-1] if not pd.isna(x) else 'Unknown'
+            )
+            
+            fig_monthly = px.bar(
+                monthly_data,
+                x='month_name',
+                y='count',
+                title="Content Added by Month",
+                labels={'count': 'Number of Titles', 'month_name': 'Month'},
+                color='count',
+                color_continuous_scale='Reds'
+            )
+            fig_monthly.update_layout(
+                height=400, 
+                plot_bgcolor='#1f1f1f',
+                paper_bgcolor='#141414',
+                font=dict(color='#ffffff', family='Helvetica Neue'),
+                transition_duration=500
+            )
+            
+            peak = monthly_data.loc[monthly_data['count'].idxmax()]
+            facts = {
+                'peak_month': str(peak['month_name']),
+                'peak_count': int(peak['count']),
+                'avg_monthly': float(monthly_data['count'].mean()),
+            }
+            return fig_monthly, facts
         
-        **What to Look For:**
-        - **Largest rectangles** = Countries/genres with most content
-        - **Color patterns** = Identify high-content areas (darker red)
-        - **Nesting depth** = Shows content diversity within categories
-        - **Proportions** = Compare relative sizes between different segments
+        fig_monthly, monthly_facts = figure_cache.figure(('monthly', dashboard_filter), build_monthly)
+        st.plotly_chart(fig_monthly, use_container_width=True, config={'displayModeBar': False})
         
-        **Key Insights:**
-        - Identify dominant countries and their preferred genres
-        - Understand content mix (Movies vs TV Shows) by country/genre
-        - Discover content concentration patterns
-        - Spot opportunities in underrepresented segments
-        """)
+        # Insights
+        with st.expander("Insights - Monthly Patterns"):
+            peak_month = monthly_facts['peak_month']
+            peak_count = monthly_facts['peak_count']
+            avg_monthly = monthly_facts['avg_monthly']
+            
+            st.write(f"""
+            - **Peak Month**: {peak_month} with {int(peak_count)} titles added
+            - **Average per Month**: {avg_monthly:.0f} titles
+            - **Seasonal Patterns**: Identify months with higher content releases
+            - **Strategic Planning**: Plan content launches around peak addition periods
+            """)
     
-    treemap_fig = create_treemap(df_filtered)
-    if treemap_fig:
-        st.plotly_chart(treemap_fig, use_container_width=True, config={'displayModeBar': False})
+    st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown("<br>", unsafe_allow_html=True)
+
+# COMPARATIVE VISUALIZATIONS
+if 'Comparative' in visible_sections:
+    st.markdown('<div class="section-box">', unsafe_allow_html=True)
+    st.markdown("### Comparative Analysis")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### Content Type Distribution")
+        def build_type():
+            type_counts = cube_totals('type')
+            fig_type = px.pie(
+                values=type_counts.values,
+                names=type_counts.index,
+                title="Movies vs TV Shows",
+                color_discrete_sequence=['#E50914', '#564d4d']
+            )
+            fig_type.update_layout(
+                height=350,
+                plot_bgcolor='#1f1f1f',
+                paper_bgcolor='#141414',
+                font=dict(color='#ffffff', family='Helvetica Neue'),
+                transition_duration=400
+            )
+            return fig_type, {'movies': int(type_counts.get('Movie', 0)), 'tv_shows': int(type_counts.get('TV Show', 0))}
+        
+        fig_type, type_facts = figure_cache.figure(('type', dashboard_filter), build_type)
+        st.plotly_chart(fig_type, use_container_width=True, config={'displayModeBar': False})
         
         # Insights
-        with st.expander("Insights - Content Hierarchy"):
-            top_country = df_filtered['primary_country'].value_counts().index[0]
-            top_country_count = df_filtered['primary_country'].value_counts().values[0]
-            top_genre_in_country = df_filtered[df_filtered['primary_country'] == top_country]['primary_genre'].value_counts().index[0]
+        with st.expander("Insights - Content Type Distribution"):
+            movies_pct = (type_facts['movies'] / len(filtered_rows) * 100) if len(filtered_rows) > 0 else 0
+            tv_pct = (type_facts['tv_shows'] / len(filtered_rows) * 100) if len(filtered_rows) > 0 else 0
             
             st.write(f"""
-            - **Dominant Country**: {top_country} with {int(top_country_count)} titles
-            - **Top Genre in {top_country}**: {top_genre_in_country}
-            - **Hierarchical Patterns**: Understand content organization across countries and genres
-            - **Content Concentration**: Identify where content is most concentrated
-            - **Diversification Opportunities**: Spot underrepresented country-genre combinations
+            - **Content Mix**: {movies_pct:.1f}% Movies, {tv_pct:.1f}% TV Shows
+            - **Platform Strategy**: {'Movie-focused' if movies_pct > 60 else 'TV Show-focused' if tv_pct > 60 else 'Balanced'} content library
+            - **Market Position**: Understand content type preferences and gaps
             """)
-    else:
-        st.info("Insufficient data for treemap")
-
-st.markdown("</div>", unsafe_allow_html=True)
-st.markdown("<br>", unsafe_allow_html=True)
-
-# GEOSPATIAL VISUALIZATION
-st.markdown('<div class="section-box">', unsafe_allow_html=True)
-st.markdown("### Geospatial Analysis")
-
-st.markdown("#### Global Content Distribution Map")
-
-# Interpretation guide
-with st.expander("How to Read This Map", expanded=False):
-    st.markdown("""
-    **Visual Guide:**
-    - **Color Intensity**: Darker red indicates more content from that country
-    - **Hover**: Move your cursor over any country to see exact title count
-    - **Scale**: The color scale ranges from dark (few titles) to bright red (many titles)
-    
-    **Key Insights:**
-    - Identify geographic concentration of content production
-    - Understand global content distribution patterns
-    - Spot regions with high or low content representation
-    - Analyze international content strategy and market focus
-    
-    **What to Look For:**
-    - **Bright red countries**: Major content producers (e.g., United States, India)
-    - **Dark countries**: Limited content representation
-    - **Regional patterns**: Clusters of content-producing regions
-    - **Geographic gaps**: Regions with potential for content expansion
-    """)
-
-# Create and display geospatial map
-geospatial_fig = create_geospatial_map(df_filtered)
-
-if geospatial_fig:
-    st.plotly_chart(geospatial_fig, use_container_width=True, config={'displayModeBar': False})
     
-    # Insights
-    with st.expander("Insights - Global Content Distribution"):
-        country_counts = df_filtered[df_filtered['primary_country'] != 'Unknown']['primary_country'].value_counts()
+    with col2:
+        st.markdown("#### Top 10 Countries by Content")
+        def build_countries():
+            top_countries = top_totals('primary_country').head(10)
+            fig_countries = px.bar(
+                x=top_countries.values,
+                y=top_countries.index,
+                orientation='h',
+                title="Top Producing Countries",
+                labels={'x': 'Number of Titles', 'y': 'Country'},
+                color=top_countries.values,
+                color_continuous_scale='Reds'
+            )
+            fig_countries.update_layout(
+                height=350,
+                plot_bgcolor='#1f1f1f',
+                paper_bgcolor='#141414',
+                font=dict(color='#ffffff', family='Helvetica Neue'),
+                transition_duration=400
+            )
+            facts = {
+                'top_country': str(top_countries.index[0]),
+                'top_count': int(top_countries.values[0]),
+                'top_3_total': int(top_countries.head(3).sum()),
+            }
+            return fig_countries, facts
+        
+        fig_countries, country_facts = figure_cache.figure(('countries', dashboard_filter), build_countries)
+        st.plotly_chart(fig_countries, use_container_width=True, config={'displayModeBar': False})
         
-        if len(country_counts) > 0:
-            top_country = country_counts.index[0]
-            top_count = country_counts.values[0]
-            top_3_total = country_counts.head(3).sum()
-            total_countries = len(country_counts)
-            total_pct = (top_3_total / len(df_filtered) * 100) if len(df_filtered) > 0 else 0
+        # Insights
+        with st.expander("Insights - Top Countries"):
+            top_country = country_facts['top_country']
+            top_count = country_facts['top_count']
+            top_3_total = country_facts['top_3_total']
+            total_pct = (top_3_total / len(filtered_rows) * 100) if len(filtered_rows) > 0 else 0
             
             st.write(f"""
-            - **Top Content Producer**: {top_country} with {int(top_count)} titles
-            - **Top 3 Countries**: Combined {int(top_3_total)} titles ({total_pct:.1f}% of total)
-            - **Geographic Diversity**: Content from {total_countries} different countries
-            - **Global Reach**: {'High' if total_countries > 50 else 'Moderate' if total_countries > 20 else 'Limited'} geographic diversity
-            - **Market Concentration**: {'High' if total_pct > 60 else 'Moderate' if total_pct > 40 else 'Low'} concentration in top 3 countries
-            - **Strategic Insight**: Identify opportunities for content expansion in underrepresented regions
-            - **International Strategy**: Balance between major markets and emerging content-producing regions
+            - **Leading Producer**: {top_country} with {int(top_count)} titles
+            - **Top 3 Concentration**: {top_3_total} titles ({total_pct:.1f}% of total)
+            - **Geographic Diversity**: {'High' if total_pct < 50 else 'Moderate' if total_pct < 70 else 'Low'} diversity across countries
+            - **Market Opportunities**: Identify underrepresented regions for content expansion
             """)
-        else:
-            st.info("No country data available for geospatial analysis.")
-else:
-    st.info("Insufficient data for geospatial visualization. Please adjust filters to include country data.")
-
-# Additional geographic insights
-st.markdown("#### Geographic Content Statistics")
-
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    country_counts = df_filtered[df_filtered['primary_country'] != 'Unknown']['primary_country'].value_counts()
-    unique_countries = len(country_counts)
-    st.metric("Countries Represented", f"{unique_countries}")
-
-with col2:
-    if len(country_counts) > 0:
-        top_country = country_counts.index[0]
-        top_count = country_counts.values[0]
-        st.metric("Top Producer", f"{top_country[:15]}...", f"{int(top_count)} titles")
-    else:
-        st.metric("Top Producer", "N/A")
-
-with col3:
-    if len(country_counts) > 0:
-        top_5_total = country_counts.head(5).sum()
-        top_5_pct = (top_5_total / len(df_filtered) * 100) if len(df_filtered) > 0 else 0
-        st.metric("Top 5 Countries Share", f"{top_5_pct:.1f}%", f"{int(top_5_total)} titles")
-    else:
-        st.metric("Top 5 Countries Share", "N/A")
-
-st.markdown("</div>", unsafe_allow_html=True)
-st.markdown("<br>", unsafe_allow_html=True)
-
-# TEMPORAL VISUALIZATIONS
-st.markdown('<div class="section-box">', unsafe_allow_html=True)
-st.markdown("### Temporal Trends & Evolution")
-
-# 1. Content Added Over Time (Yearly)
-if not df_filtered['year_added'].isna().all():
-    st.markdown("#### Content Added Over Time (Yearly Trend)")
-    
-    yearly_data = df_filtered.groupby(['year_added', 'type']).size().reset_index(name='count')
-    yearly_total = df_filtered.groupby('year_added').size().reset_index(name='total')
-    
-    fig_yearly = go.Figure()
-    
-    # Add total line
-    fig_yearly.add_trace(go.Scatter(
-        x=yearly_total['year_added'],
-        y=yearly_total['total'],
-        mode='lines+markers',
-        name='Total',
-        line=dict(color='#E50914', width=3),
-        marker=dict(size=8, color='#E50914')
-    ))
     
-    # Add type-specific lines
-    for content_type in yearly_data['type'].unique():
-        type_data = yearly_data[yearly_data['type'] == content_type]
-        color = '#564d4d' if content_type == 'TV Show' else '#b3b3b3'
-        fig_yearly.add_trace(go.Scatter(
-            x=type_data['year_added'],
-            y=type_data['count'],
-            mode='lines+markers',
-            name=content_type,
-            line=dict(width=2, color=color),
-            marker=dict(size=6, color=color)
-        ))
-    
-    fig_yearly.update_layout(
-        title="Content Addition Trend Over Years",
-        xaxis_title="Year",
-        yaxis_title="Number of Titles Added",
-        hovermode='x unified',
-        height=400,
-        plot_bgcolor='#1f1f1f',
-        paper_bgcolor='#141414',
-        font=dict(color='#ffffff', family='Helvetica Neue'),
-        transition_duration=500,
-        legend=dict(bgcolor='#1f1f1f', bordercolor='#404040')
-    )
+    # Top Genres
+    st.markdown("#### Top 15 Genres")
+    def build_genres():
+        top_genres = top_totals('primary_genre').head(15)
+        fig_genres = px.bar(
+            x=top_genres.index,
+            y=top_genres.values,
+            title="Most Popular Genres",
+            labels={'x': 'Genre', 'y': 'Number of Titles'},
+            color=top_genres.values,
+            color_continuous_scale='Reds'
+        )
+        fig_genres.update_xaxes(tickangle=45)
+        fig_genres.update_layout(
+            height=400,
+            plot_bgcolor='#1f1f1f',
+            paper_bgcolor='#141414',
+            font=dict(color='#ffffff', family='Helvetica Neue'),
+            transition_duration=400
+        )
+        
+        # All listed genres, not just the primary one
+        genres_mv = catalog.multivalue['genres']
+        listed_genre_counts = token_counts(genres_mv, filtered_rows)
+        facts = {
+            'top_genre': str(top_genres.index[0]),
+            'top_genre_count': int(top_genres.values[0]),
+            'top_5_total': int(top_genres.head(5).sum()),
+            'genre_diversity': len(cube_totals('primary_genre')),
+            'top_listed_genre': str(listed_genre_counts.index[0]) if len(listed_genre_counts) > 0 else 'N/A',
+            'top_listed_count': int(listed_genre_counts.iloc[0]) if len(listed_genre_counts) > 0 else 0,
+            'multi_genre_pct': float((genres_mv.lengths()[filtered_rows] > 1).mean() * 100) if len(filtered_rows) > 0 else 0.0,
+        }
+        return fig_genres, facts
     
-    st.plotly_chart(fig_yearly, use_container_width=True, config={'displayModeBar': False})
+    fig_genres, genre_facts = figure_cache.figure(('genres', dashboard_filter), build_genres)
+    st.plotly_chart(fig_genres, use_container_width=True, config={'displayModeBar': False})
     
     # Insights
-    with st.expander("Insights - Yearly Trend"):
-        peak_year = yearly_total.loc[yearly_total['total'].idxmax(), 'year_added']
-        peak_count = yearly_total['total'].max()
-        growth_rate = ((yearly_total['total'].iloc[-1] - yearly_total['total'].iloc[0]) / 
-                      yearly_total['total'].iloc[0] * 100) if len(yearly_total) > 1 else 0
+    with st.expander("Insights - Top Genres"):
+        top_genre = genre_facts['top_genre']
+        top_genre_count = genre_facts['top_genre_count']
+        top_5_total = genre_facts['top_5_total']
+        genre_diversity = genre_facts['genre_diversity']
+        multi_genre_pct = genre_facts['multi_genre_pct']
         
         st.write(f"""
-        - **Peak Addition Year**: {int(peak_year)} with {int(peak_count)} titles added
-        - **Growth Pattern**: {'Rapid growth' if growth_rate > 50 else 'Steady growth' if growth_rate > 0 else 'Declining'} 
-          ({growth_rate:.1f}% change from first to last year)
-        - **Content Strategy**: The platform shows {'consistent' if growth_rate > 0 else 'variable'} content addition patterns
+        - **Dominant Genre**: {top_genre} with {int(top_genre_count)} titles
+        - **Top 5 Genres**: {int(top_5_total)} titles combined
+        - **Genre Diversity**: {genre_diversity} unique genres in catalog
+        - **Most Listed Genre (any position)**: {genre_facts['top_listed_genre']} on {genre_facts['top_listed_count']} titles
+        - **Multi-Genre Titles**: {multi_genre_pct:.1f}% of titles list more than one genre
+        - **Content Strategy**: Identify genre gaps and opportunities for diversification
         """)
-
-# 2. Monthly Pattern Analysis
-if not df_filtered['month_added'].isna().all():
-    st.markdown("#### Monthly Addition Patterns")
-    
-    monthly_data = df_filtered.groupby('month_added').size().reset_index(name='count')
-    month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                  'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-    monthly_data['month_name'] = monthly_data['month_added'].apply(
-        lambda x: month_names[int(x)-1] if not pd.isna(x) else 'Unknown'
-    )
     
-    fig_monthly = px.bar(
-        monthly_data,
-        x='month_name',
-        y='count',
-        title="Content Added by Month",
-        labels={'count': 'Number of Titles', 'month_name': 'Month'},
-        color='count',
-        color_continuous_scale='Reds'
-    )
-    fig_monthly.update_layout(
-        height=400, 
-        plot_bgcolor='#1f1f1f',
-        paper_bgcolor='#141414',
-        font=dict(color='#ffffff', family='Helvetica Neue'),
-        transition_duration=500
-    )
-    st.plotly_chart(fig_monthly, use_container_width=True, config={'displayModeBar': False})
+    # Rating Distribution
+    st.markdown("#### Content Rating Distribution")
+    def build_rating():
+        rating_counts = cube_counts(filtered_cube(), 'rating', sort=True)
+        fig_rating = px.bar(
+            x=rating_counts.index,
+            y=rating_counts.values,
+            title="Content by Rating",
+            labels={'x': 'Rating', 'y': 'Number of Titles'},
+            color=rating_counts.values,
+            color_continuous_scale='Reds'
+        )
+        fig_rating.update_layout(
+            height=400,
+            plot_bgcolor='#1f1f1f',
+            paper_bgcolor='#141414',
+            font=dict(color='#ffffff', family='Helvetica Neue'),
+            transition_duration=400
+        )
+        return fig_rating, {'ratings': [str(rating) for rating in rating_counts.index], 'counts': [int(count) for count in rating_counts.values]}
     
-    # Insights
-    with st.expander("Insights - Monthly Patterns"):
-        peak_month_idx = monthly_data['count'].idxmax()
-        peak_month = monthly_data.loc[peak_month_idx, 'month_name']
-        peak_count = monthly_data.loc[peak_month_idx, 'count']
-        avg_monthly = monthly_data['count'].mean()
-        
-        st.write(f"""
-        - **Peak Month**: {peak_month} with {int(peak_count)} titles added
-        - **Average per Month**: {avg_monthly:.0f} titles
-        - **Seasonal Patterns**: Identify months with higher content releases
-        - **Strategic Planning**: Plan content launches around peak addition periods
-        """)
-
-st.markdown("</div>", unsafe_allow_html=True)
-st.markdown("<br>", unsafe_allow_html=True)
-
-# COMPARATIVE VISUALIZATIONS
-st.markdown('<div class="section-box">', unsafe_allow_html=True)
-st.markdown("### Comparative Analysis")
-
-col1, col2 = st.columns(2)
-
-with col1:
-    st.markdown("#### Content Type Distribution")
-    type_counts = df_filtered['type'].value_counts()
-    fig_type = px.pie(
-        values=type_counts.values,
-        names=type_counts.index,
-        title="Movies vs TV Shows",
-        color_discrete_sequence=['#E50914', '#564d4d']
-    )
-    fig_type.update_layout(
-        height=350,
-        plot_bgcolor='#1f1f1f',
-        paper_bgcolor='#141414',
-        font=dict(color='#ffffff', family='Helvetica Neue'),
-        transition_duration=400
-    )
-    st.plotly_chart(fig_type, use_container_width=True, config={'displayModeBar': False})
+    fig_rating, rating_facts = figure_cache.figure(('rating', dashboard_filter), build_rating)
+    st.plotly_chart(fig_rating, use_container_width=True, config={'displayModeBar': False})
     
     # Insights
-    with st.expander("Insights - Content Type Distribution"):
-        movies_pct = (type_counts.get('Movie', 0) / len(df_filtered) * 100) if len(df_filtered) > 0 else 0
-        tv_pct = (type_counts.get('TV Show', 0) / len(df_filtered) * 100) if len(df_filtered) > 0 else 0
+    with st.expander("Insights - Rating Distribution"):
+        rating_counts = pd.Series(rating_facts['counts'], index=rating_facts['ratings'], dtype='int64')
+        top_rating = rating_counts.index[0]
+        top_rating_count = rating_counts.values[0]
+        top_rating_pct = (top_rating_count / len(filtered_rows) * 100) if len(filtered_rows) > 0 else 0
+        mature_content = rating_counts[rating_counts.index.isin(['TV-MA', 'R', 'NC-17'])].sum() if any(r in rating_counts.index for r in ['TV-MA', 'R', 'NC-17']) else 0
+        mature_pct = (mature_content / len(filtered_rows) * 100) if len(filtered_rows) > 0 else 0
         
         st.write(f"""
-        - **Content Mix**: {movies_pct:.1f}% Movies, {tv_pct:.1f}% TV Shows
-        - **Platform Strategy**: {'Movie-focused' if movies_pct > 60 else 'TV Show-focused' if tv_pct > 60 else 'Balanced'} content library
-        - **Market Position**: Understand content type preferences and gaps
+        - **Most Common Rating**: {top_rating} ({top_rating_pct:.1f}% of content)
+        - **Mature Content**: {mature_pct:.1f}% of catalog (TV-MA/R/NC-17)
+        - **Audience Targeting**: Understand content rating distribution for audience segmentation
+        - **Content Mix**: Balance between family-friendly and mature content
         """)
-
-with col2:
-    st.markdown("#### Top 10 Countries by Content")
-    top_countries = df_filtered['primary_country'].value_counts().head(10)
-    fig_countries = px.bar(
-        x=top_countries.values,
-        y=top_countries.index,
-        orientation='h',
-        title="Top Producing Countries",
-        labels={'x': 'Number of Titles', 'y': 'Country'},
-        color=top_countries.values,
-        color_continuous_scale='Reds'
-    )
-    fig_countries.update_layout(
-        height=350,
-        plot_bgcolor='#1f1f1f',
-        paper_bgcolor='#141414',
-        font=dict(color='#ffffff', family='Helvetica Neue'),
-        transition_duration=400
-    )
-    st.plotly_chart(fig_countries, use_container_width=True, config={'displayModeBar': False})
     
-    # Insights
-    with st.expander("Insights - Top Countries"):
-        top_country = top_countries.index[0]
-        top_count = top_countries.values[0]
-        top_3_total = top_countries.head(3).sum()
-        total_pct = (top_3_total / len(df_filtered) * 100) if len(df_filtered) > 0 else 0
-        
-        st.write(f"""
-        - **Leading Producer**: {top_country} with {int(top_count)} titles
-        - **Top 3 Concentration**: {top_3_total} titles ({total_pct:.1f}% of total)
-        - **Geographic Diversity**: {'High' if total_pct < 50 else 'Moderate' if total_pct < 70 else 'Low'} diversity across countries
-        - **Market Opportunities**: Identify underrepresented regions for content expansion
-        """)
-
-# Top Genres
-st.markdown("#### Top 15 Genres")
-top_genres = df_filtered['primary_genre'].value_counts().head(15)
-fig_genres = px.bar(
-    x=top_genres.index,
-    y=top_genres.values,
-    title="Most Popular Genres",
-    labels={'x': 'Genre', 'y': 'Number of Titles'},
-    color=top_genres.values,
-    color_continuous_scale='Reds'
-)
-fig_genres.update_xaxes(tickangle=45)
-fig_genres.update_layout(
-    height=400,
-    plot_bgcolor='#1f1f1f',
-    paper_bgcolor='#141414',
-    font=dict(color='#ffffff', family='Helvetica Neue'),
-    transition_duration=400
-)
-st.plotly_chart(fig_genres, use_container_width=True, config={'displayModeBar': False})
-
-# Insights
-with st.expander("Insights - Top Genres"):
-    top_genre = top_genres.index[0]
-    top_genre_count = top_genres.values[0]
-    top_5_total = top_genres.head(5).sum()
-    genre_diversity = len(df_filtered['primary_genre'].unique())
-    
-    st.write(f"""
-    - **Dominant Genre**: {top_genre} with {int(top_genre_count)} titles
-    - **Top 5 Genres**: {int(top_5_total)} titles combined
-    - **Genre Diversity**: {genre_diversity} unique genres in catalog
-    - **Content Strategy**: Identify genre gaps and opportunities for diversification
-    """)
-
-# Rating Distribution
-st.markdown("#### Content Rating Distribution")
-rating_counts = df_filtered['rating'].value_counts()
-fig_rating = px.bar(
-    x=rating_counts.index,
-    y=rating_counts.values,
-    title="Content by Rating",
-    labels={'x': 'Rating', 'y': 'Number of Titles'},
-    color=rating_counts.values,
-    color_continuous_scale='Reds'
-)
-fig_rating.update_layout(
-    height=400,
-    plot_bgcolor='#1f1f1f',
-    paper_bgcolor='#141414',
-    font=dict(color='#ffffff', family='Helvetica Neue'),
-    transition_duration=400
-)
-st.plotly_chart(fig_rating, use_container_width=True, config={'displayModeBar': False})
-
-# Insights
-with st.expander("Insights - Rating Distribution"):
-    top_rating = rating_counts.index[0]
-    top_rating_count = rating_counts.values[0]
-    top_rating_pct = (top_rating_count / len(df_filtered) * 100) if len(df_filtered) > 0 else 0
-    mature_content = rating_counts[rating_counts.index.isin(['TV-MA', 'R', 'NC-17'])].sum() if any(r in rating_counts.index for r in ['TV-MA', 'R', 'NC-17']) else 0
-    mature_pct = (mature_content / len(df_filtered) * 100) if len(df_filtered) > 0 else 0
-    
-    st.write(f"""
-    - **Most Common Rating**: {top_rating} ({top_rating_pct:.1f}% of content)
-    - **Mature Content**: {mature_pct:.1f}% of catalog (TV-MA/R/NC-17)
-    - **Audience Targeting**: Understand content rating distribution for audience segmentation
-    - **Content Mix**: Balance between family-friendly and mature content
-    """)
-
-st.markdown("</div>", unsafe_allow_html=True)
-st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown("<br>", unsafe_allow_html=True)
 
 # PATTERN ANALYSIS
-st.markdown('<div class="section-box">', unsafe_allow_html=True)
-st.markdown("### Pattern Analysis")
-
-# Genre Evolution Over Time
-if not df_filtered['year_added'].isna().all():
-    st.markdown("#### Genre Evolution Over Time (Top 5 Genres)")
-    
-    top_5_genres = df_filtered['primary_genre'].value_counts().head(5).index.tolist()
-    genre_time_data = df_filtered[df_filtered['primary_genre'].isin(top_5_genres)]
-    genre_yearly = genre_time_data.groupby(['year_added', 'primary_genre']).size().reset_index(name='count')
-    
-    fig_genre_time = px.line(
-        genre_yearly,
-        x='year_added',
-        y='count',
-        color='primary_genre',
-        title="Top 5 Genres Trend Over Time",
-        labels={'count': 'Number of Titles', 'year_added': 'Year Added'},
-        markers=True,
-        color_discrete_sequence=['#E50914', '#564d4d', '#b3b3b3', '#808080', '#404040']
-    )
-    fig_genre_time.update_layout(
-        height=400,
-        plot_bgcolor='#1f1f1f',
-        paper_bgcolor='#141414',
-        font=dict(color='#ffffff', family='Helvetica Neue'),
-        transition_duration=400,
-        legend=dict(bgcolor='#1f1f1f', bordercolor='#404040')
-    )
-    st.plotly_chart(fig_genre_time, use_container_width=True, config={'displayModeBar': False})
+if 'Patterns' in visible_sections:
+    st.markdown('<div class="section-box">', unsafe_allow_html=True)
+    st.markdown("### Pattern Analysis")
     
-    with st.expander("Insights - Genre Evolution"):
-        st.write("""
-        - **Genre Trends**: Observe which genres are growing or declining
-        - **Market Shifts**: Identify changing viewer preferences over time
-        - **Content Strategy**: Understand Netflix's genre investment patterns
-        """)
-
-# Country vs Type Analysis
-st.markdown("#### Content Type by Top Countries")
-top_10_countries = df_filtered['primary_country'].value_counts().head(10).index.tolist()
-country_type_data = df_filtered[df_filtered['primary_country'].isin(top_10_countries)]
-country_type_counts = country_type_data.groupby(['primary_country', 'type']).size().reset_index(name='count')
-
-fig_country_type = px.bar(
-    country_type_counts,
-    x='primary_country',
-    y='count',
-    color='type',
-    title="Movies vs TV Shows by Country",
-    labels={'count': 'Number of Titles', 'primary_country': 'Country'},
-    barmode='group',
-    color_discrete_sequence=['#E50914', '#564d4d']
-)
-fig_country_type.update_xaxes(tickangle=45)
-fig_country_type.update_layout(
-    height=400,
-    plot_bgcolor='#1f1f1f',
-    paper_bgcolor='#141414',
-    font=dict(color='#ffffff', family='Helvetica Neue'),
-    transition_duration=400,
-    legend=dict(bgcolor='#1f1f1f', bordercolor='#404040')
-)
-st.plotly_chart(fig_country_type, use_container_width=True, config={'displayModeBar': False})
-
-# Insights
-with st.expander("Insights - Content Type by Country"):
-    country_movie_ratio = country_type_counts.groupby('primary_country').apply(
-        lambda x: x[x['type'] == 'Movie']['count'].sum() / x['count'].sum() if x['count'].sum() > 0 else 0
-    )
-    movie_focused = country_movie_ratio[country_movie_ratio > 0.7].index.tolist()
-    tv_focused = country_movie_ratio[country_movie_ratio < 0.3].index.tolist()
-    
-    st.write(f"""
-    - **Content Preferences**: Different countries show varying Movie vs TV Show ratios
-    - **Movie-Focused Countries**: {', '.join(movie_focused[:3]) if movie_focused else 'None identified'}
-    - **TV Show-Focused Countries**: {', '.join(tv_focused[:3]) if tv_focused else 'None identified'}
-    - **Strategic Insight**: Tailor content acquisition by country preferences
-    """)
-
-# Movie Duration Distribution
-if len(df_filtered[df_filtered['type'] == 'Movie']) > 0:
-    st.markdown("#### Movie Duration Distribution")
-    movie_durations = df_filtered[df_filtered['type'] == 'Movie']['duration_minutes'].dropna()
-    
-    if len(movie_durations) > 0:
-        fig_duration = px.histogram(
-            movie_durations,
-            nbins=30,
-            title="Distribution of Movie Durations",
-            labels={'value': 'Duration (minutes)', 'count': 'Number of Movies'},
-            color_discrete_sequence=['#E50914']
+    # Genre Evolution Over Time
+    if has_year_data:
+        st.markdown("#### Genre Evolution Over Time (Top 5 Genres)")
+        
+        def build_genre_time():
+            top_5_genres = cube_totals('primary_genre').head(5).index.tolist()
+            cube = filtered_cube()
+            genre_time_data = cube[cube['primary_genre'].isin(top_5_genres)]
+            genre_yearly = cube_counts(genre_time_data, ['year_added', 'primary_genre']).reset_index(name='count')
+            
+            fig_genre_time = px.line(
+                genre_yearly,
+                x='year_added',
+                y='count',
+                color='primary_genre',
+                title="Top 5 Genres Trend Over Time",
+                labels={'count': 'Number of Titles', 'year_added': 'Year Added'},
+                markers=True,
+                color_discrete_sequence=['#E50914', '#564d4d', '#b3b3b3', '#808080', '#404040']
+            )
+            fig_genre_time.update_layout(
+                height=400,
+                plot_bgcolor='#1f1f1f',
+                paper_bgcolor='#141414',
+                font=dict(color='#ffffff', family='Helvetica Neue'),
+                transition_duration=400,
+                legend=dict(bgcolor='#1f1f1f', bordercolor='#404040')
+            )
+            return fig_genre_time, {}
+        
+        fig_genre_time, _ = figure_cache.figure(('genre_time', dashboard_filter), build_genre_time)
+        st.plotly_chart(fig_genre_time, use_container_width=True, config={'displayModeBar': False})
+        
+        with st.expander("Insights - Genre Evolution"):
+            st.write("""
+            - **Genre Trends**: Observe which genres are growing or declining
+            - **Market Shifts**: Identify changing viewer preferences over time
+            - **Content Strategy**: Understand Netflix's genre investment patterns
+            """)
+    
+    # Country vs Type Analysis
+    st.markdown("#### Content Type by Top Countries")
+    def build_country_type():
+        top_10_countries = cube_totals('primary_country').head(10).index.tolist()
+        cube = filtered_cube()
+        country_type_data = cube[cube['primary_country'].isin(top_10_countries)]
+        country_type_counts = cube_counts(country_type_data, ['primary_country', 'type']).reset_index(name='count')
+    
+        fig_country_type = px.bar(
+            country_type_counts,
+            x='primary_country',
+            y='count',
+            color='type',
+            title="Movies vs TV Shows by Country",
+            labels={'count': 'Number of Titles', 'primary_country': 'Country'},
+            barmode='group',
+            color_discrete_sequence=['#E50914', '#564d4d']
         )
-        fig_duration.update_layout(
+        fig_country_type.update_xaxes(tickangle=45)
+        fig_country_type.update_layout(
             height=400,
             plot_bgcolor='#1f1f1f',
             paper_bgcolor='#141414',
             font=dict(color='#ffffff', family='Helvetica Neue'),
-            transition_duration=400
+            transition_duration=400,
+            legend=dict(bgcolor='#1f1f1f', bordercolor='#404040')
         )
-        st.plotly_chart(fig_duration, use_container_width=True, config={'displayModeBar': False})
         
-        with st.expander("Insights - Movie Duration"):
+        country_movie_ratio = country_type_counts.groupby('primary_country').apply(
+            lambda x: x[x['type'] == 'Movie']['count'].sum() / x['count'].sum() if x['count'].sum() > 0 else 0
+        )
+        facts = {
+            'movie_focused': [str(country) for country in country_movie_ratio[country_movie_ratio > 0.7].index],
+            'tv_focused': [str(country) for country in country_movie_ratio[country_movie_ratio < 0.3].index],
+        }
+        return fig_country_type, facts
+    
+    fig_country_type, country_type_facts = figure_cache.figure(('country_type', dashboard_filter), build_country_type)
+    st.plotly_chart(fig_country_type, use_container_width=True, config={'displayModeBar': False})
+    
+    # Insights
+    with st.expander("Insights - Content Type by Country"):
+        movie_focused = country_type_facts['movie_focused']
+        tv_focused = country_type_facts['tv_focused']
+        
+        st.write(f"""
+        - **Content Preferences**: Different countries show varying Movie vs TV Show ratios
+        - **Movie-Focused Countries**: {', '.join(movie_focused[:3]) if movie_focused else 'None identified'}
+        - **TV Show-Focused Countries**: {', '.join(tv_focused[:3]) if tv_focused else 'None identified'}
+        - **Strategic Insight**: Tailor content acquisition by country preferences
+        """)
+    
+    # Movie Duration Distribution
+    if type_totals.get('Movie', 0) > 0:
+        st.markdown("#### Movie Duration Distribution")
+        def build_duration():
+            movie_titles = filtered_titles()
+            movie_durations = movie_titles[movie_titles['type'] == 'Movie']['duration_minutes'].dropna()
+            if len(movie_durations) == 0:
+                return None, {}
+            
+            fig_duration = px.histogram(
+                movie_durations,
+                nbins=30,
+                title="Distribution of Movie Durations",
+                labels={'value': 'Duration (minutes)', 'count': 'Number of Movies'},
+                color_discrete_sequence=['#E50914']
+            )
+            fig_duration.update_layout(
+                height=400,
+                plot_bgcolor='#1f1f1f',
+                paper_bgcolor='#141414',
+                font=dict(color='#ffffff', family='Helvetica Neue'),
+                transition_duration=400
+            )
+            
+            modes = movie_durations.mode()
+            facts = {
+                'mean': float(movie_durations.mean()),
+                'median': float(movie_durations.median()),
+                'mode': int(modes[0]) if len(modes) > 0 else 'N/A',
+            }
+            return fig_duration, facts
+        
+        fig_duration, duration_facts = figure_cache.figure(('duration', dashboard_filter), build_duration)
+        if fig_duration is not None:
+            st.plotly_chart(fig_duration, use_container_width=True, config={'displayModeBar': False})
+            
+            with st.expander("Insights - Movie Duration"):
+                st.write(f"""
+                - **Average Duration**: {duration_facts['mean']:.1f} minutes
+                - **Median Duration**: {duration_facts['median']:.1f} minutes
+                - **Most Common Range**: {duration_facts['mode']} minutes
+                """)
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown("<br>", unsafe_allow_html=True)
+
+# PEOPLE ANALYSIS
+if 'People' in visible_sections:
+    st.markdown('<div class="section-box">', unsafe_allow_html=True)
+    st.markdown("### People Analysis")
+    
+    # Credits come from the people index: title -> people offsets and person -> titles postings
+    people_columns = {'Directors': 'director_list', 'Actors': 'cast_list'}
+    person_labels = {'Directors': 'Director', 'Actors': 'Actor'}
+    people_counts = {role: token_counts(catalog.multivalue[column], filtered_rows) for role, column in people_columns.items()}
+    
+    col1, col2 = st.columns(2)
+    for col, (role, counts) in zip((col1, col2), people_counts.items()):
+        with col:
+            st.markdown(f"#### Top 10 {role}")
+            top_people = counts.head(10)
+            if len(top_people) == 0:
+                st.info(f"No {role.lower()} listed for the selected titles.")
+                continue
+            fig_people = px.bar(
+                x=top_people.values,
+                y=top_people.index,
+                orientation='h',
+                title=f"Most Credited {role}",
+                labels={'x': 'Number of Titles', 'y': person_labels[role]},
+                color=top_people.values,
+                color_continuous_scale='Reds'
+            )
+            fig_people.update_layout(
+                height=400,
+                plot_bgcolor='#1f1f1f',
+                paper_bgcolor='#141414',
+                font=dict(color='#ffffff', family='Helvetica Neue'),
+                transition_duration=400
+            )
+            st.plotly_chart(fig_people, use_container_width=True, config={'displayModeBar': False})
+    
+    # Person lookup: the person's postings intersected with the filtered titles
+    st.markdown("#### Person Lookup")
+    lookup_col1, lookup_col2 = st.columns([1, 3])
+    with lookup_col1:
+        lookup_role = st.radio("Role", list(people_columns), key='people_role', horizontal=True)
+        other_role = 'Actors' if lookup_role == 'Directors' else 'Directors'
+        lookup_options = people_counts[lookup_role].head(50).index.tolist()
+        selected_person = st.selectbox(f"{person_labels[lookup_role]} (top 50 in selection)", lookup_options, key='people_lookup') if lookup_options else None
+    with lookup_col2:
+        if selected_person is not None:
+            person_rows = intersect_rows([catalog.token_index[people_columns[lookup_role]].rows(selected_person), filtered_rows])
+            person_titles = df.take(person_rows)
+            collaborators = token_counts(catalog.multivalue[people_columns[other_role]], person_rows)
             st.write(f"""
-            - **Average Duration**: {movie_durations.mean():.1f} minutes
-            - **Median Duration**: {movie_durations.median():.1f} minutes
-            - **Most Common Range**: {int(movie_durations.mode()[0]) if len(movie_durations.mode()) > 0 else 'N/A'} minutes
+            - **Titles in selection**: {len(person_titles)} ({(person_titles['type'] == 'Movie').sum()} movies, {(person_titles['type'] == 'TV Show').sum()} TV shows)
+            - **Frequent {other_role}**: {', '.join(collaborators.head(3).index) if len(collaborators) else 'None listed'}
             """)
-
-st.markdown("</div>", unsafe_allow_html=True)
-st.markdown("<br>", unsafe_allow_html=True)
+            st.dataframe(
+                person_titles[['title', 'type', 'release_year', 'primary_genre', 'primary_country']].rename(columns={
+                    'title': 'Title', 'type': 'Type', 'release_year': 'Release Year',
+                    'primary_genre': 'Genre', 'primary_country': 'Country'
+                }),
+                use_container_width=True,
+                hide_index=True,
+                height=250
+            )
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown("<br>", unsafe_allow_html=True)
+
+# TITLE SEARCH
+if 'Title Search' in visible_sections:
+    st.markdown('<div class="section-box">', unsafe_allow_html=True)
+    st.markdown("### Title Search")
+    
+    # Ranked with BM25 over the prebuilt title/description index, within the sidebar filters
+    search_query = st.text_input(
+        "Search titles and descriptions",
+        key='search_query',
+        placeholder="e.g. serial killer documentary"
+    )
+    if search_query.strip():
+        search_start = time.perf_counter()
+        result_rows, result_scores, n_matches = catalog.search.search(search_query, within=filtered_rows, limit=50)
+        search_ms = (time.perf_counter() - search_start) * 1000
+        st.caption(f"{n_matches:,} matching titles in the current selection ({search_ms:.1f} ms)")
+        if len(result_rows) == 0:
+            st.info("No titles in the current selection match your search. Try other words or relax a filter.")
+        else:
+            search_results = df.take(result_rows)[['title', 'type', 'release_year', 'primary_country', 'primary_genre', 'description']]
+            search_results.insert(0, 'Score', result_scores.round(2))
+            st.dataframe(
+                search_results.rename(columns={
+                    'title': 'Title', 'type': 'Type', 'release_year': 'Release Year',
+                    'primary_country': 'Country', 'primary_genre': 'Genre', 'description': 'Description'
+                }),
+                use_container_width=True,
+                hide_index=True,
+                height=400
+            )
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown("<br>", unsafe_allow_html=True)
 
 # DATA TABLE
-st.markdown('<div class="section-box">', unsafe_allow_html=True)
-st.markdown("### Detailed Data View")
-
-# Display options
-display_cols = ['title', 'type', 'primary_country', 'primary_genre', 'rating', 
-               'release_year', 'year_added', 'duration']
-df_display = df_filtered[display_cols].copy()
-df_display = df_display.rename(columns={
-    'primary_country': 'Country',
-    'primary_genre': 'Genre',
-    'release_year': 'Release Year',
-    'year_added': 'Year Added'
-})
-
-st.dataframe(
-    df_display,
-    use_container_width=True,
-    height=400,
-    hide_index=True
-)
-
-# Insights
-with st.expander("Insights - Data Overview"):
-    total_titles = len(df_display)
-    unique_countries = df_display['Country'].nunique()
-    unique_genres = df_display['Genre'].nunique()
-    avg_release_year = df_display['Release Year'].mean() if not df_display['Release Year'].isna().all() else None
-    total_in_dataset = len(df)
-    
-    st.write(f"""
-    - **Total Titles**: {total_titles:,} titles in filtered dataset
-    - **Geographic Diversity**: {unique_countries} unique countries represented
-    - **Genre Variety**: {unique_genres} unique genres available
-    - **Average Release Year**: {int(avg_release_year) if avg_release_year else 'N/A'}
-    - **Data Quality**: Use this view to explore individual titles and verify data accuracy
-    - **Filtering Impact**: Current filters show {len(df_display):,} of {total_in_dataset:,} total titles ({len(df_display)/total_in_dataset*100:.1f}%)
-    """)
-
-st.markdown("</div>", unsafe_allow_html=True)
+if 'Data Table' in visible_sections:
+    st.markdown('<div class="section-box">', unsafe_allow_html=True)
+    st.markdown("### Detailed Data View")
+    
+    # Display options
+    display_cols = ['title', 'type', 'primary_country', 'primary_genre', 'rating', 
+                   'release_year', 'year_added', 'duration']
+    display_names = {
+        'primary_country': 'Country',
+        'primary_genre': 'Genre',
+        'release_year': 'Release Year',
+        'year_added': 'Year Added'
+    }
+    
+    # Column filters: tested by the bitmap index at the rows matching the sidebar filters
+    table_filter_cols = st.columns(4)
+    table_equals = {}
+    for col, (column, label) in zip(table_filter_cols, [('type', 'Type'), ('rating', 'Rating'),
+                                                        ('primary_country', 'Country'), ('primary_genre', 'Genre')]):
+        with col:
+            column_values = sorted(str(value) for value in catalog.filter_index.bitsets(column) if str(value))
+            table_equals[column] = st.selectbox(label, ['All'] + column_values, key=f'table_{column}')
+    table_filter, _, _ = filter_key(table_equals)
+    table_rows = catalog.filter_index.rows(dict(table_filter), within=filtered_rows) if table_filter else filtered_rows
+    
+    # Sorting and paging run on row ids; only the visible page is taken from the catalog
+    ocol1, ocol2, ocol3, ocol4 = st.columns([2, 1, 1, 1])
+    with ocol1:
+        sort_column = st.selectbox("Sort by", display_cols, format_func=lambda column: display_names.get(column, column),
+                                   key='table_sort')
+    with ocol2:
+        sort_descending = st.radio("Order", ['Ascending', 'Descending'], key='table_descending', horizontal=True) == 'Descending'
+    with ocol3:
+        page_size = st.selectbox("Rows per page", [25, 50, 100, 250], index=1, key='table_page_size')
+    n_pages = max(1, -(-len(table_rows) // page_size))
+    with ocol4:
+        page = st.number_input(f"Page (of {n_pages:,})", min_value=1, max_value=n_pages, step=1, key='table_page') \
+            if n_pages > 1 else 1
+    
+    sorted_rows = catalog.sort_index.sort(table_rows, sort_column, sort_descending)
+    page_start, page_stop = page_bounds(len(sorted_rows), page, page_size)
+    df_display = df.take(sorted_rows[page_start:page_stop])[display_cols].rename(columns=display_names)
+    
+    st.dataframe(
+        df_display,
+        use_container_width=True,
+        height=400,
+        hide_index=True
+    )
+    st.caption(f"Rows {page_start + 1 if page_stop else 0:,}–{page_stop:,} of {len(sorted_rows):,}")
+    
+    # CSV export of the whole selection in the table's order, generated only when clicked
+    if len(sorted_rows) <= CSV_EXPORT_MAX_ROWS:
+        st.download_button(
+            "Download CSV",
+            lambda: export_csv(df, sorted_rows, display_cols, display_names),
+            file_name='netflix_titles_filtered.csv',
+            mime='text/csv',
+            key='table_download',
+            on_click='ignore'
+        )
+    else:
+        st.caption(f"CSV export is limited to {CSV_EXPORT_MAX_ROWS:,} titles; narrow the filters to export.")
+    
+    # Insights
+    with st.expander("Insights - Data Overview"):
+        # Over the whole selection, reading only the columns needed
+        total_titles = len(table_rows)
+        unique_countries = df['primary_country'].take(table_rows).nunique()
+        unique_genres = df['primary_genre'].take(table_rows).nunique()
+        release_years = df['release_year'].take(table_rows)
+        avg_release_year = release_years.mean() if not release_years.isna().all() else None
+        total_in_dataset = len(df)
+        
+        st.write(f"""
+        - **Total Titles**: {total_titles:,} titles in filtered dataset
+        - **Geographic Diversity**: {unique_countries} unique countries represented
+        - **Genre Variety**: {unique_genres} unique genres available
+        - **Average Release Year**: {int(avg_release_year) if avg_release_year else 'N/A'}
+        - **Data Quality**: Use this view to explore individual titles and verify data accuracy
+        - **Filtering Impact**: Current filters show {total_titles:,} of {total_in_dataset:,} total titles ({total_titles/total_in_dataset*100:.1f}%)
+        """)
+    
+    st.markdown("</div>", unsafe_allow_html=True)
 
 # Footer
 st.markdown("<br>", unsafe_allow_html=True)
@@ -11,8 +11,11 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+import networkx as nx
 from datetime import datetime
 import warnings
+from data_access import get_catalog, filter_key, filter_rows
+from multivalue import token_cooccurrence
 warnings.filterwarnings('ignore')
 
 # Page configuration
@@ -230,211 +233,6 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-@st.cache_data
-def load_data():
-    """Load and preprocess the Netflix dataset."""
-    try:
-        df = pd.read_csv('netflix_titles_processed.csv')
-        df['date_added'] = pd.to_datetime(df['date_added'], errors='coerce')
-        df['year_month'] = pd.to_datetime(df['date_added']).dt.to_period('M')
-    except FileNotFoundError:
-        df = pd.read_csv('netflix_titles.csv')
-        df['date_added'] = pd.to_datetime(df['date_added'], errors='coerce')
-        df['year_added'] = df['date_added'].dt.year
-        df['month_added'] = df['date_added'].dt.month
-        df['month_name'] = df['date_added'].dt.strftime('%B')
-        df['country'] = df['country'].fillna('Unknown')
-        df['primary_country'] = df['country'].str.split(', ').apply(
-            lambda x: x[0] if isinstance(x, list) and len(x) > 0 else 'Unknown'
-        )
-        df['genres'] = df['listed_in'].str.split(', ')
-        df['primary_genre'] = df['genres'].apply(
-            lambda x: x[0] if isinstance(x, list) and len(x) > 0 else 'Unknown'
-        )
-        df['rating'] = df['rating'].fillna('Unknown')
-        df['decade'] = (df['release_year'] // 10) * 10
-        
-        def extract_duration(duration_str):
-            if pd.isna(duration_str):
-                return np.nan
-            if 'min' in str(duration_str):
-                try:
-                    return int(str(duration_str).split()[0])
-                except:
-                    return np.nan
-            return np.nan
-        
-        df['duration_minutes'] = df[df['type'] == 'Movie']['duration'].apply(extract_duration)
-        
-        def extract_seasons(duration_str):
-            if pd.isna(duration_str):
-                return np.nan
-            if 'Season' in str(duration_str):
-                try:
-                    return int(str(duration_str).split()[0])
-                except:
-                    return np.nan
-            return np.nan
-        
-        df['num_seasons'] = df[df['type'] == 'TV Show']['duration'].apply(extract_seasons)
-    
-    return df
-
-def create_sankey_diagram(df_filtered):
-    """Create a clear Sankey diagram showing genre-to-country content flow."""
-    # Get top genres and countries
-    top_genres = df_filtered['primary_genre'].value_counts().head(6).index.tolist()
-    top_countries = df_filtered['primary_country'].value_counts().head(6).index.tolist()
-    
-    # Create source-target-value pairs for Sankey
-    source = []
-    target = []
-    value = []
-    label = []
-    
-    # Add genre labels (left side)
-    genre_labels = {}
-    for i, genre in enumerate(top_genres):
-        genre_labels[genre] = i
-        label.append(genre[:20] if len(genre) <= 20 else genre[:17] + '...')
-    
-    # Add country labels (right side)
-    country_labels = {}
-    start_idx = len(top_genres)
-    for i, country in enumerate(top_countries):
-        country_labels[country] = start_idx + i
-        label.append(country[:20] if len(country) <= 20 else country[:17] + '...')
-    
-    # Create connections with minimum threshold
-    min_threshold = max(5, len(df_filtered) // 200)
-    
-    for genre in top_genres:
-        genre_data = df_filtered[df_filtered['primary_genre'] == genre]
-        for country in top_countries:
-            count = len(genre_data[genre_data['primary_country'] == country])
-            if count >= min_threshold:
-                source.append(genre_labels[genre])
-                target.append(country_labels[country])
-                value.append(count)
-    
-    if not source:
-        return None
-    
-    # Create Sankey diagram
-    fig = go.Figure(data=[go.Sankey(
-        node=dict(
-            pad=15,
-            thickness=20,
-            line=dict(color='#141414', width=2),
-            label=label,
-            color=['#E50914' if i < len(top_genres) else '#564d4d' for i in range(len(label))],
-            hovertemplate='<b>%{label}</b><br>Total: %{value}<extra></extra>',
-        ),
-        link=dict(
-            source=source,
-            target=target,
-            value=value,
-            color=['rgba(229, 9, 20, 0.4)' for _ in source],  # Semi-transparent red
-            hovertemplate='%{source.label} → %{target.label}<br>Count: %{value}<extra></extra>',
-        )
-    )])
-    
-    fig.update_layout(
-        title=dict(
-            text="Content Flow: Genres → Countries",
-            font=dict(size=18, color='#E50914', family='Helvetica Neue'),
-            x=0.5,
-            xanchor='center'
-        ),
-        height=550,
-        plot_bgcolor='#141414',
-        paper_bgcolor='#141414',
-        font=dict(color='#ffffff', size=12, family='Helvetica Neue'),
-        transition_duration=500
-    )
-    
-    return fig
-
-def create_treemap(df_filtered):
-    """Create a clean treemap showing hierarchical data: Country -> Genre -> Type."""
-    # Filter to top countries and genres for clarity
-    top_countries = df_filtered['primary_country'].value_counts().head(8).index.tolist()
-    
-    # Prepare hierarchical data with minimum thresholds
-    treemap_data = []
-    min_count = max(3, len(df_filtered) // 300)  # Dynamic minimum threshold
-    
-    for country in top_countries:
-        country_data = df_filtered[df_filtered['primary_country'] == country]
-        # Get top genres per country
-        top_genres_country = country_data['primary_genre'].value_counts().head(4).index.tolist()
-        
-        for genre in top_genres_country:
-            genre_data = country_data[country_data['primary_genre'] == genre]
-            for content_type in genre_data['type'].unique():
-                count = len(genre_data[genre_data['type'] == content_type])
-                if count >= min_count:
-                    # Shorten long names for better display
-                    country_short = country[:20] + '...' if len(country) > 20 else country
-                    genre_short = genre[:25] + '...' if len(genre) > 25 else genre
-                    
-                    treemap_data.append({
-                        'Country': country_short,
-                        'Genre': genre_short,
-                        'Type': content_type,
-                        'Count': count,
-                        'Full_Country': country,
-                        'Full_Genre': genre
-                    })
-    
-    if not treemap_data:
-        return None
-    
-    df_treemap = pd.DataFrame(treemap_data)
-    
-    # Create treemap with better styling
-    fig = px.treemap(
-        df_treemap,
-        path=[px.Constant("All Content"), 'Country', 'Genre', 'Type'],
-        values='Count',
-        color='Count',
-        color_continuous_scale=[[0, '#1a1a1a'], [0.3, '#2a2a2a'], [0.6, '#E50914'], [1, '#ff1a1a']],
-        title="Content Hierarchy: Country → Genre → Type",
-        hover_data={'Count': True, 'Full_Country': False, 'Full_Genre': False},
-        custom_data=['Full_Country', 'Full_Genre']
-    )
-    
-    # Update hover template
-    fig.update_traces(
-        hovertemplate='<b>%{label}</b><br>Count: %{value}<extra></extra>',
-        textfont=dict(size=14, color='#ffffff', family='Helvetica Neue'),
-        textposition="middle center",
-        texttemplate='<b>%{label}</b><br>%{value}',
-        marker=dict(line=dict(width=2, color='#141414'))
-    )
-    
-    fig.update_layout(
-        plot_bgcolor='#141414',
-        paper_bgcolor='#141414',
-        font=dict(color='#ffffff', size=12, family='Helvetica Neue'),
-        title=dict(
-            font=dict(size=18, color='#E50914', family='Helvetica Neue'),
-            x=0.5,
-            xanchor='center',
-            pad=dict(b=20)
-        ),
-        height=550,
-        transition_duration=500,
-        coloraxis_colorbar=dict(
-            title=dict(text="Count", font=dict(color='#ffffff', family='Helvetica Neue')),
-            tickfont=dict(color='#ffffff', family='Helvetica Neue'),
-            bgcolor='#1f1f1f',
-            bordercolor='#404040'
-        )
-    )
-    
-    return fig
-
 def create_floating_elements():
     """Create floating animation elements in the background"""
     st.markdown("""
@@ -478,50 +276,6 @@ def create_floating_elements():
     </script>
     """, unsafe_allow_html=True)
 
-@st.cache_data
-def load_data():
-    """Load and preprocess the Netflix dataset for EDA (from raw CSV)."""
-    df = pd.read_csv('netflix_titles.csv')
-    df['date_added'] = pd.to_datetime(df['date_added'], errors='coerce')
-    df['year_added'] = df['date_added'].dt.year
-    df['month_added'] = df['date_added'].dt.month
-    df['month_name'] = df['date_added'].dt.strftime('%B')
-    df['country'] = df['country'].fillna('Unknown')
-    df['primary_country'] = df['country'].str.split(', ').apply(
-        lambda x: x[0] if isinstance(x, list) and len(x) > 0 else 'Unknown'
-    )
-    df['genres'] = df['listed_in'].str.split(', ')
-    df['primary_genre'] = df['genres'].apply(
-        lambda x: x[0] if isinstance(x, list) and len(x) > 0 else 'Unknown'
-    )
-    df['rating'] = df['rating'].fillna('Unknown')
-    df['decade'] = (df['release_year'] // 10) * 10
-    
-    def extract_duration(duration_str):
-        if pd.isna(duration_str):
-            return np.nan
-        if 'min' in str(duration_str):
-            try:
-                return int(str(duration_str).split()[0])
-            except:
-                return np.nan
-        return np.nan
-    
-    df['duration_minutes'] = df[df['type'] == 'Movie']['duration'].apply(extract_duration)
-    
-    def extract_seasons(duration_str):
-        if pd.isna(duration_str):
-            return np.nan
-        if 'Season' in str(duration_str):
-            try:
-                return int(str(duration_str).split()[0])
-            except:
-                return np.nan
-        return np.nan
-    
-    df['num_seasons'] = df[df['type'] == 'TV Show']['duration'].apply(extract_seasons)
-    
-    return df
 # Add glow animation style
 st.markdown("""
 <style>
@@ -540,8 +294,15 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Load fresh data for EDA (unfiltered)
-df = load_data()
+# Shared catalog for EDA (unfiltered)
+df = get_catalog().titles
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def genre_cooccurrence(key, top=15):
+    """Co-occurrence of the ``top`` genres of the titles matching a Dashboard filter key (memoized per key)."""
+    catalog = get_catalog()
+    rows = None if key == filter_key() else filter_rows(catalog, key)
+    return token_cooccurrence(catalog.multivalue['genres'], rows, top=top)
 
 # Header for EDA
 st.markdown("""
@@ -677,7 +438,7 @@ top_5_genres = df['primary_genre'].value_counts().index[:5].tolist()
 heatmap_data = df[
     (df['primary_country'].isin(top_5_countries)) & 
     (df['primary_genre'].isin(top_5_genres))
-].groupby(['primary_country', 'primary_genre']).size().unstack().fillna(0)
+].groupby(['primary_country', 'primary_genre'], observed=True).size().unstack().fillna(0)
 
 fig6 = px.imshow(
     heatmap_data,
@@ -694,6 +455,104 @@ fig6.update_layout(
 )
 st.plotly_chart(fig6, use_container_width=True)
 
+# Genre Co-occurrence Section
+st.markdown("---")
+st.markdown("### Genre Co-occurrence")
+
+dashboard_filter = st.session_state.get('dashboard_filter_key')
+use_dashboard_filter = False
+if dashboard_filter is not None and dashboard_filter != filter_key():
+    use_dashboard_filter = st.toggle("Apply Dashboard filters", value=True, key='eda_dashboard_filters')
+# Top genres by titles listing them, most listed first; the diagonal holds their totals
+pair_counts = genre_cooccurrence(dashboard_filter if use_dashboard_filter else filter_key())
+top_genres = pair_counts.index
+genre_totals = pd.Series(np.diag(pair_counts), index=top_genres)
+
+if len(top_genres) < 2:
+    st.info("Not enough genres in the current selection to show co-occurrences.")
+else:
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Blank the diagonal so genre totals don't swamp the pair counts
+        heatmap_pairs = pair_counts.astype(float).mask(np.eye(len(top_genres), dtype=bool))
+        fig_cooc = px.imshow(
+            heatmap_pairs,
+            labels=dict(x="Genre", y="Genre", color="Titles"),
+            title="Titles Listing Both Genres",
+            aspect="auto",
+            color_continuous_scale='Reds'
+        )
+        fig_cooc.update_xaxes(side="bottom", tickangle=45)
+        fig_cooc.update_layout(
+            height=600,
+            plot_bgcolor='#1f1f1f',
+            paper_bgcolor='#141414',
+            font=dict(color='#ffffff', family='Helvetica Neue')
+        )
+        st.plotly_chart(fig_cooc, use_container_width=True)
+
+    with col2:
+        upper = np.triu(pair_counts.to_numpy(), k=1)
+        max_pair = int(upper.max())
+        if max_pair > 1:
+            min_shared = st.slider(
+                "Minimum shared titles per link",
+                min_value=1,
+                max_value=max_pair,
+                value=max(1, max_pair // 10),
+                key='eda_cooccurrence_min_shared'
+            )
+        else:
+            # A slider needs two distinct bounds; every pair is shared at most once
+            min_shared = 1
+        first, second = np.nonzero(upper >= min_shared)
+        graph = nx.Graph()
+        graph.add_nodes_from(top_genres)
+        graph.add_weighted_edges_from(
+            (top_genres[i], top_genres[j], int(upper[i, j])) for i, j in zip(first, second)
+        )
+        layout = nx.spring_layout(graph, weight='weight', seed=0)
+
+        edge_x, edge_y = [], []
+        for a, b in graph.edges():
+            edge_x += [layout[a][0], layout[b][0], None]
+            edge_y += [layout[a][1], layout[b][1], None]
+        nodes = list(graph.nodes())
+        node_sizes = genre_totals[nodes].to_numpy(dtype=float)
+
+        fig_net = go.Figure()
+        fig_net.add_trace(go.Scatter(
+            x=edge_x, y=edge_y, mode='lines',
+            line=dict(width=1, color='rgba(229, 9, 20, 0.4)'),
+            hoverinfo='skip'
+        ))
+        fig_net.add_trace(go.Scatter(
+            x=[layout[n][0] for n in nodes],
+            y=[layout[n][1] for n in nodes],
+            mode='markers+text',
+            text=nodes,
+            textposition='top center',
+            customdata=np.stack([node_sizes, [graph.degree(n) for n in nodes]], axis=1),
+            hovertemplate='%{text}<br>Titles: %{customdata[0]:,.0f}<br>Linked genres: %{customdata[1]}<extra></extra>',
+            marker=dict(
+                size=12 + 30 * np.sqrt(node_sizes / node_sizes.max()),
+                color='#E50914',
+                line=dict(width=1, color='#ffffff')
+            )
+        ))
+        fig_net.update_layout(
+            title="Genre Network",
+            height=600,
+            showlegend=False,
+            xaxis=dict(visible=False),
+            yaxis=dict(visible=False),
+            plot_bgcolor='#1f1f1f',
+            paper_bgcolor='#141414',
+            font=dict(color='#ffffff', family='Helvetica Neue')
+        )
+        st.plotly_chart(fig_net, use_container_width=True)
+
 # Genre & Ratings Section
 st.markdown("---")
 st.markdown("### Content Ratings Analysis")
@@ -0,0 +1,315 @@
+"""
+Netflix Content Analytics - Full-Text Search Index
+==================================================
+BM25-ranked search over the ``title`` and ``description`` of every title.
+
+Text is lower-cased and split on anything that is not a letter or digit by
+Arrow compute kernels, so tokenizing millions of descriptions never loops
+over rows in Python. The index stores one posting list per term (row ids
+with the term's frequency in each title), built from a single sort of the
+(row, term) pairs, plus the length of every title's text.
+
+A query only reads the posting lists of its own terms: their BM25 weights
+are summed per row with one bincount and the best rows are selected with a
+partial sort, so the cost follows the size of the postings, not of the
+catalog. Title terms count ``TITLE_WEIGHT`` times, so a word in the title
+outranks the same word in a description.
+
+The index is built by ``eda_preprocessing.py`` and saved as an uncompressed
+``.npz`` file, which the dashboard loads once per process. The file records
+a fingerprint of the rows it was built from, so an index left over from
+another table is never served against the wrong rows.
+
+Document frequencies and the average title length are derived from the
+postings when the index is loaded, so an incremental feed update only
+tokenizes the new and changed titles: their postings are merged into the
+existing ones, whose row ids are remapped and whose removed rows are dropped.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Occurrences of a term in the title count this many times as often as in the description
+TITLE_WEIGHT = 2.0
+
+# BM25 parameters: term frequency saturation and document length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Letters and digits in any script form the terms
+TOKEN_SEPARATOR = r'[^\p{L}\p{N}]+'
+
+def tokenize(texts):
+    """
+    Split texts into lower-case terms.
+
+    Parameters:
+    -----------
+    texts : array-like of str
+        Texts to split; missing values have no terms
+
+    Returns:
+    --------
+    tuple
+        (rows, terms): the position of each term's text, and the terms as a
+        pyarrow string array, in text order
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    array = texts if isinstance(texts, (pa.Array, pa.ChunkedArray)) else pa.array(pd.Series(texts, dtype=object))
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    if pa.types.is_dictionary(array.type):
+        array = array.dictionary_decode()
+    split = pc.split_pattern_regex(pc.utf8_lower(array.cast(pa.string())), TOKEN_SEPARATOR)
+
+    lengths = pc.fill_null(pc.list_value_length(split), 0).to_numpy()
+    rows = np.repeat(np.arange(len(split), dtype=np.int64), lengths)
+    terms = pc.list_flatten(split)
+    # Leading/trailing separators leave empty strings behind
+    keep = pc.greater(pc.utf8_length(terms), 0)
+    return rows[keep.to_numpy(zero_copy_only=False)], terms.filter(keep)
+
+class SearchIndex:
+    """
+    BM25 posting lists over the titles' text.
+
+    Parameters:
+    -----------
+    vocab : np.ndarray
+        Sorted terms
+    offsets : np.ndarray
+        Term ``i`` owns postings ``offsets[i]:offsets[i + 1]``
+    row_ids : np.ndarray
+        Posting row ids, ascending within each term
+    term_freqs : np.ndarray
+        Weighted frequency of the term in each posting's title
+    doc_lengths : np.ndarray
+        Weighted number of terms of each title
+    fingerprint : str
+        Identity of the rows the index was built from (see
+        eda_preprocessing.rows_fingerprint); empty when unknown
+    """
+
+    def __init__(self, vocab, offsets, row_ids, term_freqs, doc_lengths, fingerprint=''):
+        self.vocab = vocab
+        self.offsets = offsets
+        self.row_ids = row_ids
+        self.term_freqs = term_freqs
+        self.doc_lengths = doc_lengths
+        self.fingerprint = fingerprint
+        self.n_rows = len(doc_lengths)
+        relative_length = doc_lengths / doc_lengths.mean() if doc_lengths.any() else np.ones(self.n_rows)
+        # Per-row part of the BM25 denominator, computed once
+        self.length_norm = (BM25_K1 * (1 - BM25_B + BM25_B * relative_length)).astype(np.float32)
+
+    def _term_codes(self, query):
+        """Codes of the distinct query terms present in the vocabulary."""
+        _, terms = tokenize([query])
+        terms = np.unique(np.asarray(terms.to_pylist(), dtype=str))
+        codes = np.searchsorted(self.vocab, terms)
+        found = codes < len(self.vocab)
+        found[found] = self.vocab[codes[found]] == terms[found]
+        return codes[found]
+
+    def scores(self, query):
+        """
+        BM25 score of every title for ``query``.
+
+        Returns:
+        --------
+        np.ndarray
+            float array with one score per row; 0 for titles without any
+            query term
+        """
+        codes = self._term_codes(query)
+        if len(codes) == 0:
+            return np.zeros(self.n_rows)
+        starts, ends = self.offsets[codes], self.offsets[codes + 1]
+        doc_freqs = ends - starts
+        idf = np.log(1 + (self.n_rows - doc_freqs + 0.5) / (doc_freqs + 0.5))
+
+        postings = np.concatenate([np.arange(start, end) for start, end in zip(starts, ends)])
+        rows = self.row_ids[postings]
+        tf = self.term_freqs[postings]
+        weights = np.repeat(idf, doc_freqs) * tf * (BM25_K1 + 1) / (tf + self.length_norm[rows])
+        return np.bincount(rows, weights=weights, minlength=self.n_rows)
+
+    def search(self, query, within=None, limit=50):
+        """
+        Best matching titles for a free-text query.
+
+        Parameters:
+        -----------
+        query : str
+            Free text; every term adds to the score, order does not matter
+        within : array-like of int, optional
+            Row ids to search (e.g. the rows matching the sidebar filters);
+            all rows when omitted
+        limit : int
+            Number of results
+
+        Returns:
+        --------
+        tuple
+            (rows, scores, n_matches): row ids and scores of the best
+            ``limit`` titles, best first (ties by row id), and the number of
+            titles matching at least one term
+        """
+        scores = self.scores(query)
+        candidates = np.arange(self.n_rows) if within is None else np.asarray(within, dtype=np.int64)
+        candidates = candidates[scores[candidates] > 0]
+        if len(candidates) > limit:
+            top = np.argpartition(-scores[candidates], limit - 1)[:limit]
+            candidates = np.sort(candidates[top])
+        order = np.argsort(-scores[candidates], kind='stable')
+        n_matches = int(np.count_nonzero(scores[within] > 0)) if within is not None else int(np.count_nonzero(scores))
+        return candidates[order], scores[candidates[order]], n_matches
+
+def _row_id_dtype(n_rows):
+    """Smallest of int32/int64 holding every row id."""
+    return np.int32 if n_rows <= np.iinfo(np.int32).max else np.int64
+
+def build_search_index(titles, descriptions, title_weight=TITLE_WEIGHT):
+    """
+    Build the search index of row-aligned title and description texts.
+
+    Parameters:
+    -----------
+    titles, descriptions : array-like of str
+        ``title`` and ``description`` columns (pandas or pyarrow)
+    title_weight : float
+        Weight of a title occurrence relative to a description occurrence
+
+    Returns:
+    --------
+    SearchIndex
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    title_rows, title_terms = tokenize(titles)
+    description_rows, description_terms = tokenize(descriptions)
+    n_rows = len(titles)
+
+    rows = np.concatenate([title_rows, description_rows])
+    weights = np.concatenate([np.full(len(title_rows), title_weight), np.ones(len(description_rows))])
+    encoded = pc.dictionary_encode(pa.chunked_array([title_terms, description_terms]).combine_chunks())
+    # Renumber the terms in sorted order, so queries find them by binary search
+    vocab = np.asarray(encoded.dictionary.to_pylist(), dtype=str)
+    order = np.argsort(vocab, kind='stable')
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    codes = rank[encoded.indices.to_numpy()]
+
+    # One posting per (term, row), sorted by term then row
+    keys, inverse = np.unique(codes * n_rows + rows, return_inverse=True)
+    term_freqs = np.bincount(inverse, weights=weights, minlength=len(keys)).astype(np.float32)
+    posting_codes = keys // n_rows if n_rows else keys
+    row_ids = (keys % n_rows if n_rows else keys).astype(_row_id_dtype(n_rows))
+
+    return SearchIndex(
+        vocab=vocab[order],
+        offsets=np.searchsorted(posting_codes, np.arange(len(vocab) + 1)),
+        row_ids=row_ids,
+        term_freqs=term_freqs,
+        doc_lengths=np.bincount(rows, weights=weights, minlength=n_rows).astype(np.float32),
+    )
+
+def update_search_index(index, kept_rows, kept_positions, titles, descriptions, positions, n_rows,
+                        title_weight=TITLE_WEIGHT):
+    """
+    Patch an index with the titles added or changed since it was built.
+
+    Only the new titles are tokenized; the postings of the kept titles are
+    carried over with their row ids remapped, and those of every other
+    title are dropped. The result equals a full build over the new rows.
+
+    Parameters:
+    -----------
+    index : SearchIndex
+        Index of the previous rows
+    kept_rows, kept_positions : np.ndarray
+        Previous row ids of the unchanged titles, ascending, and their row
+        ids in the new table
+    titles, descriptions : array-like of str
+        ``title`` and ``description`` of the added and changed titles
+    positions : np.ndarray
+        Row ids of those titles in the new table
+    n_rows : int
+        Number of rows of the new table
+    title_weight : float
+        Weight of a title occurrence relative to a description occurrence
+
+    Returns:
+    --------
+    SearchIndex
+        Index over the new table, without a fingerprint
+    """
+    kept_rows = np.asarray(kept_rows, dtype=np.int64)
+    kept_positions = np.asarray(kept_positions, dtype=np.int64)
+    positions = np.asarray(positions, dtype=np.int64)
+    delta = build_search_index(titles, descriptions, title_weight)
+
+    # Merged vocabulary: the old terms with the delta's new terms inserted in order
+    found = np.searchsorted(index.vocab, delta.vocab)
+    is_known = found < len(index.vocab)
+    is_known[is_known] = index.vocab[found[is_known]] == delta.vocab[is_known]
+    new_terms = delta.vocab[~is_known]
+    vocab = np.insert(index.vocab, np.searchsorted(index.vocab, new_terms), new_terms)
+    old_codes = np.arange(len(index.vocab)) + np.searchsorted(new_terms, index.vocab)
+    delta_codes = np.searchsorted(vocab, delta.vocab)
+
+    # Carried-over postings, with row ids remapped and replaced rows dropped
+    new_row = np.full(index.n_rows, -1, dtype=np.int64)
+    new_row[kept_rows] = kept_positions
+    rows = new_row[index.row_ids]
+    keep = rows >= 0
+    codes = np.repeat(old_codes, np.diff(index.offsets))[keep]
+    keys = codes * n_rows + rows[keep]
+    term_freqs = index.term_freqs[keep]
+    if np.any(np.diff(kept_positions) < 0):
+        # The feed reordered the kept titles, so their postings need sorting again
+        order = np.argsort(keys, kind='stable')
+        keys, term_freqs = keys[order], term_freqs[order]
+
+    # Insert the delta's postings, sorted by term then row, among them
+    delta_keys = np.repeat(delta_codes, np.diff(delta.offsets)) * n_rows + positions[delta.row_ids]
+    delta_order = np.argsort(delta_keys, kind='stable')
+    at = np.searchsorted(keys, delta_keys[delta_order])
+    keys = np.insert(keys, at, delta_keys[delta_order])
+    term_freqs = np.insert(term_freqs, at, delta.term_freqs[delta_order])
+
+    # Terms left without postings are dropped, as a full build would never list them
+    posting_codes = keys // n_rows if n_rows else keys
+    counts = np.bincount(posting_codes, minlength=len(vocab))
+    live = counts > 0
+    doc_lengths = np.zeros(n_rows, dtype=np.float32)
+    doc_lengths[kept_positions] = index.doc_lengths[kept_rows]
+    doc_lengths[positions] = delta.doc_lengths
+
+    return SearchIndex(
+        vocab=vocab[live],
+        offsets=np.concatenate([[0], np.cumsum(counts[live])]),
+        row_ids=(keys % n_rows if n_rows else keys).astype(_row_id_dtype(n_rows)),
+        term_freqs=term_freqs,
+        doc_lengths=doc_lengths,
+    )
+
+def write_search_index(index, path):
+    """Write the index and its fingerprint to an uncompressed ``.npz`` file."""
+    np.savez(
+        path, vocab=index.vocab, offsets=index.offsets, row_ids=index.row_ids,
+        term_freqs=index.term_freqs, doc_lengths=index.doc_lengths,
+        fingerprint=np.array(index.fingerprint)
+    )
+
+def read_search_index(path):
+    """Read an index written by write_search_index (older files have no fingerprint)."""
+    with np.load(path) as saved:
+        return SearchIndex(
+            vocab=saved['vocab'], offsets=saved['offsets'], row_ids=saved['row_ids'],
+            term_freqs=saved['term_freqs'], doc_lengths=saved['doc_lengths'],
+            fingerprint=str(saved['fingerprint']) if 'fingerprint' in saved.files else ''
+        )
@@ -0,0 +1,400 @@
+"""
+Netflix Content Analytics - Similar Titles Index
+================================================
+"Titles like this" lookups from hashed TF-IDF features.
+
+Every title is described by the words and word pairs of its description,
+its genres, its cast and its directors. Features are hashed (no vocabulary
+is kept), TF-IDF weighted and L2-normalized per field, and projected onto
+``EMBEDDING_DIM`` dimensions with a signed sparse random projection: each
+feature adds its weight, with a hash-derived sign, to ``PROJECTION_HASHES``
+hash-derived dimensions. Cosine similarity of the projected vectors
+approximates the cosine similarity of the TF-IDF vectors.
+
+The unit-length embeddings are saved as a float32 ``.npy`` file that the
+dashboard memory-maps (numpy has no fast float16 arithmetic, so a half-size
+file would cost more per lookup in conversions than it saves in reads).
+
+Embeddings are per title once the document frequencies are fixed, so an
+incremental feed update re-embeds only the added and changed titles. The
+document frequencies of every feature are saved next to the embeddings
+(``<name>_stats.npz``) and patched with the delta's features; the kept
+titles keep the IDF weights they were embedded with until the rows changed
+since the last full build exceed ``REBUILD_FRACTION`` of the catalog. The
+stats file also records a fingerprint of the rows the embeddings belong to,
+and the SimHash signatures described below, so loading the index never
+reads the whole embedding matrix.
+
+The signs of an embedding's coordinates form a SimHash signature, so large
+candidate sets are first narrowed to the ``LSH_CANDIDATES`` titles at the
+smallest Hamming distance and only those are scored exactly; smaller
+candidate sets are scored exactly with one matrix-vector product.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from multivalue import explode_rows
+from search_index import tokenize
+
+EMBEDDING_DIM = 128
+
+# Dimensions each feature is projected onto
+PROJECTION_HASHES = 2
+
+# Relative weight of each field in the combined vector
+FIELD_WEIGHTS = {'description': 1.0, 'genres': 1.0, 'cast_list': 0.5, 'director_list': 0.5}
+
+# Candidate sets up to this size are scored exactly, larger ones through the signatures
+EXACT_SEARCH_LIMIT = 50_000
+LSH_CANDIDATES = 1_000
+
+# Rows projected per block, bounding the temporary arrays of the projection
+PROJECTION_BLOCK = 65_536
+
+# Incremental updates re-embed every title once this share of rows changed since the last full build
+REBUILD_FRACTION = 0.1
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+def _mix(h):
+    """splitmix64 finalizer: spreads every input bit over the whole 64-bit hash."""
+    h = h.astype(np.uint64)
+    h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return (h ^ (h >> np.uint64(31))) & _MASK64
+
+def _hash_strings(values, field):
+    """64-bit hash of each string, distinct per field."""
+    salt = int(pd.util.hash_array(np.array([field], dtype=object))[0])
+    return _mix(pd.util.hash_array(np.asarray(values, dtype=object)) ^ np.uint64(salt))
+
+def _text_features(texts):
+    """(rows, feature hashes) of the words and adjacent word pairs of each text."""
+    import pyarrow.compute as pc
+
+    rows, terms = tokenize(texts)
+    encoded = pc.dictionary_encode(terms)
+    hashes = _hash_strings(encoded.dictionary.to_pylist(), 'description')[encoded.indices.to_numpy()]
+    same_text = rows[1:] == rows[:-1]
+    pair_hashes = _mix(hashes[:-1][same_text] * np.uint64(0x9E3779B97F4A7C15) + hashes[1:][same_text])
+    # Pairs follow the words of their text, keeping the rows sorted
+    order = np.argsort(np.concatenate([rows, rows[:-1][same_text]]), kind='stable')
+    return np.concatenate([rows, rows[:-1][same_text]])[order], np.concatenate([hashes, pair_hashes])[order]
+
+def _list_features(mv, field):
+    """(rows, feature hashes) of the tokens of a multi-valued column."""
+    rows, codes = explode_rows(mv)
+    return rows, _hash_strings(mv.vocab, field)[codes]
+
+def _distinct_features(rows, features):
+    """
+    Distinct (row, feature) pairs and their number of occurrences.
+
+    Returns:
+    --------
+    tuple
+        (rows, features, term_counts), sorted by row then feature
+    """
+    order = np.lexsort((features, rows))
+    rows, features = rows[order], features[order]
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = (rows[1:] != rows[:-1]) | (features[1:] != features[:-1])
+    starts = np.flatnonzero(first)
+    return rows[starts], features[starts], np.diff(np.append(starts, len(rows)))
+
+def _field_features(descriptions, multivalue, field_weights):
+    """Field -> distinct (rows, features, term_counts) of each title."""
+    fields = {}
+    for field in field_weights:
+        if field == 'description':
+            rows, features = _text_features(descriptions)
+        else:
+            rows, features = _list_features(multivalue[field], field)
+        fields[field] = _distinct_features(rows, features)
+    return fields
+
+def _tfidf(rows, features, term_counts, n_rows, doc_freqs, n_docs):
+    """
+    Sublinear TF-IDF weight of each distinct (row, feature), L2-normalized per row.
+
+    ``doc_freqs`` is a (sorted features, titles listing each) pair counted
+    over ``n_docs`` titles; features missing from it count as in no title.
+    """
+    known, counts = doc_freqs
+    found = np.minimum(np.searchsorted(known, features), max(len(known) - 1, 0))
+    df = np.where(known[found] == features, counts[found], 0) if len(known) else np.zeros(len(features))
+    idf = np.log((1 + n_docs) / (1 + df)) + 1
+    weights = (1 + np.log(term_counts)) * idf
+    norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=n_rows))
+    return weights / norms[rows]
+
+def _project(rows, features, weights, n_rows, dim=EMBEDDING_DIM, n_hashes=PROJECTION_HASHES):
+    """Signed sparse random projection of weighted features (rows sorted) onto ``dim`` dimensions."""
+    embeddings = np.zeros((n_rows, dim), dtype=np.float32)
+    for probe in range(n_hashes):
+        h = _mix(features + np.uint64(probe + 1))
+        dims = (h % np.uint64(dim)).astype(np.int64)
+        signed = np.where((h >> np.uint64(32)) & np.uint64(1), 1.0, -1.0) * weights / np.sqrt(n_hashes)
+        bounds = np.searchsorted(rows, np.arange(0, n_rows + PROJECTION_BLOCK, PROJECTION_BLOCK))
+        for block, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])):
+            first_row = block * PROJECTION_BLOCK
+            n_block = min(PROJECTION_BLOCK, n_rows - first_row)
+            if n_block <= 0:
+                break
+            cells = (rows[lo:hi] - first_row) * dim + dims[lo:hi]
+            embeddings[first_row:first_row + n_block] += np.bincount(
+                cells, weights=signed[lo:hi], minlength=n_block * dim
+            ).reshape(n_block, dim).astype(np.float32)
+    return embeddings
+
+def count_doc_freqs(descriptions, multivalue, field_weights=FIELD_WEIGHTS):
+    """
+    Number of titles listing each feature, per field.
+
+    Parameters:
+    -----------
+    descriptions, multivalue, field_weights
+        As for build_embeddings
+
+    Returns:
+    --------
+    dict
+        Field -> (sorted feature hashes, number of titles listing each)
+    """
+    fields = _field_features(descriptions, multivalue, field_weights)
+    return {field: np.unique(features, return_counts=True) for field, (_, features, _) in fields.items()}
+
+def merge_doc_freqs(base, add=None, subtract=None):
+    """
+    Patch document frequencies with those of added and removed titles.
+
+    Parameters:
+    -----------
+    base : dict
+        Existing document frequencies (see count_doc_freqs)
+    add, subtract : dict, optional
+        Document frequencies of the titles to add / remove
+
+    Returns:
+    --------
+    dict
+        Summed document frequencies; features that drop to zero are removed
+    """
+    merged = {}
+    for field, (features, counts) in base.items():
+        parts = [(features, counts)]
+        if add is not None:
+            parts.append(add[field])
+        if subtract is not None:
+            parts.append((subtract[field][0], -subtract[field][1]))
+        features, inverse = np.unique(np.concatenate([part[0] for part in parts]), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.concatenate([part[1] for part in parts]), minlength=len(features))
+        live = counts > 0
+        merged[field] = features[live], np.rint(counts[live]).astype(np.int64)
+    return merged
+
+def build_embeddings(descriptions, multivalue, field_weights=FIELD_WEIGHTS, dim=EMBEDDING_DIM,
+                     doc_freqs=None, n_docs=None):
+    """
+    Unit-length title embeddings from the description and list-valued columns.
+
+    Parameters:
+    -----------
+    descriptions : array-like of str
+        ``description`` column (pandas or pyarrow)
+    multivalue : dict
+        Column name -> MultiValueColumn, row-aligned with ``descriptions``;
+        needs the list columns named in ``field_weights``
+    field_weights : dict
+        Field -> weight of its normalized TF-IDF vector
+    dim : int
+        Embedding dimensions
+    doc_freqs : dict, optional
+        Document frequencies of the whole catalog (see count_doc_freqs),
+        when embedding only some of its titles; counted over the given
+        titles when omitted
+    n_docs : int, optional
+        Number of titles ``doc_freqs`` was counted over
+
+    Returns:
+    --------
+    np.ndarray
+        float32 array of shape (n_titles, dim); titles without any feature
+        are all zero
+    """
+    n_rows = len(descriptions)
+    fields = _field_features(descriptions, multivalue, field_weights)
+    if doc_freqs is None:
+        doc_freqs = {field: np.unique(features, return_counts=True) for field, (_, features, _) in fields.items()}
+        n_docs = n_rows
+    parts = []
+    for field, field_weight in field_weights.items():
+        rows, features, term_counts = fields[field]
+        weights = _tfidf(rows, features, term_counts, n_rows, doc_freqs[field], n_docs)
+        parts.append((rows, features, weights * field_weight))
+
+    rows, features, weights = (np.concatenate(arrays) for arrays in zip(*parts))
+    order = np.argsort(rows, kind='stable')
+    embeddings = _project(rows[order], features[order], weights[order], n_rows, dim)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return np.divide(embeddings, norms, out=np.zeros_like(embeddings), where=norms > 0)
+
+def _popcount(words):
+    """Set bits of each uint64."""
+    if hasattr(np, 'bitwise_count'):  # numpy >= 2.0
+        return np.bitwise_count(words)
+    table = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+    return table[words.view(np.uint8)].reshape(len(words), 8).sum(axis=1, dtype=np.uint8)
+
+def simhash_signatures(embeddings):
+    """
+    SimHash signatures of embeddings: one bit per coordinate sign.
+
+    Returns:
+    --------
+    np.ndarray
+        uint64 array of shape (words per signature, n_titles); word-major, so
+        each word of every signature is one contiguous array
+    """
+    bits = np.packbits(np.asarray(embeddings) > 0, axis=1)
+    padded = np.zeros((len(bits), -(-bits.shape[1] // 8) * 8), dtype=np.uint8)
+    padded[:, :bits.shape[1]] = bits
+    return np.ascontiguousarray(padded.view(np.uint64).T)
+
+class SimilarityIndex:
+    """
+    Nearest-neighbour lookups over unit-length title embeddings.
+
+    Parameters:
+    -----------
+    embeddings : np.ndarray
+        (n_titles, dim) array, e.g. a read-only memory map of the saved index
+    fingerprint : str
+        Identity of the rows the embeddings belong to (see
+        eda_preprocessing.rows_fingerprint); empty when unknown
+    signatures : np.ndarray, optional
+        Saved simhash_signatures of ``embeddings``; computed when omitted
+    """
+
+    def __init__(self, embeddings, fingerprint='', signatures=None):
+        self.embeddings = embeddings
+        self.fingerprint = fingerprint
+        self.n_rows = len(embeddings)
+        self.signatures = simhash_signatures(embeddings) if signatures is None else signatures
+
+    def _hamming_candidates(self, row, candidates, n_candidates):
+        """The ``n_candidates`` candidates whose signatures are closest to ``row``'s."""
+        every_row = len(candidates) == self.n_rows
+        # At most 128 bits differ, so the distances fit in a byte
+        distances = np.zeros(len(candidates), dtype=np.uint8)
+        for words in self.signatures:
+            distances += _popcount((words if every_row else words[candidates]) ^ words[row])
+        # Everything below the cut-off distance, topped up with ties at the cut-off
+        cut = int(np.searchsorted(np.cumsum(np.bincount(distances)), n_candidates))
+        below = np.flatnonzero(distances < cut)
+        ties = np.flatnonzero(distances == cut)[:n_candidates - len(below)]
+        return candidates[np.sort(np.concatenate([below, ties]))]
+
+    def similar(self, row, within=None, limit=5):
+        """
+        Titles most similar to title ``row``.
+
+        Parameters:
+        -----------
+        row : int
+            Row id of the reference title
+        within : array-like of int, optional
+            Sorted row ids eligible as results (e.g. the rows matching the
+            sidebar filters); all rows when omitted
+        limit : int
+            Number of results
+
+        Returns:
+        --------
+        tuple
+            (rows, similarities): best first, excluding ``row`` itself and
+            titles without any similarity
+        """
+        query = np.asarray(self.embeddings[row], dtype=np.float32)
+        candidates = np.arange(self.n_rows) if within is None else np.asarray(within, dtype=np.int64)
+        if not query.any() or len(candidates) == 0:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+
+        if len(candidates) > EXACT_SEARCH_LIMIT:
+            candidates = self._hamming_candidates(row, candidates, LSH_CANDIDATES)
+        vectors = self.embeddings if len(candidates) == self.n_rows else self.embeddings[candidates]
+        similarities = np.asarray(vectors, dtype=np.float32) @ query
+
+        keep = (candidates != row) & (similarities > 0)
+        candidates, similarities = candidates[keep], similarities[keep]
+        order = np.lexsort((candidates, -similarities))[:limit]
+        return candidates[order], similarities[order]
+
+def stats_path(path):
+    """Path of the stats file kept next to the embeddings at ``path``."""
+    return os.path.splitext(path)[0] + '_stats.npz'
+
+def write_similarity_index(embeddings, path, fingerprint='', doc_freqs=None, changed_rows=0):
+    """
+    Write embeddings as a float32 ``.npy`` file, and their stats and SimHash
+    signatures next to it.
+
+    Parameters:
+    -----------
+    embeddings : np.ndarray
+        (n_titles, dim) embeddings
+    path : str
+        Output ``.npy`` file path
+    fingerprint : str
+        Identity of the rows the embeddings belong to
+    doc_freqs : dict, optional
+        Document frequencies the embeddings were weighted with
+    changed_rows : int
+        Rows added, changed or removed since the last full build
+    """
+    embeddings = embeddings.astype(np.float32)
+    np.save(path, embeddings)
+    fields = {'signatures': simhash_signatures(embeddings)}
+    for field, (features, counts) in (doc_freqs or {}).items():
+        fields[f'features_{field}'] = features
+        fields[f'counts_{field}'] = counts
+    np.savez(stats_path(path), fingerprint=np.array(fingerprint), changed_rows=np.array(changed_rows), **fields)
+
+def read_similarity_stats(path):
+    """
+    Stats written next to the embeddings at ``path``.
+
+    Returns:
+    --------
+    tuple
+        (fingerprint, doc_freqs, changed_rows); ('', {}, 0) when there is no
+        stats file
+    """
+    try:
+        with np.load(stats_path(path)) as saved:
+            doc_freqs = {
+                key[len('features_'):]: (saved[key], saved['counts_' + key[len('features_'):]])
+                for key in saved.files if key.startswith('features_')
+            }
+            return str(saved['fingerprint']), doc_freqs, int(saved['changed_rows'])
+    except FileNotFoundError:
+        return '', {}, 0
+
+def read_similarity_index(path):
+    """Memory-map an index written by write_similarity_index."""
+    embeddings = np.load(path, mmap_mode='r')
+    fingerprint, signatures = '', None
+    try:
+        with np.load(stats_path(path)) as saved:
+            fingerprint = str(saved['fingerprint'])
+            # Stats files written before the signatures were saved leave them to the index
+            if 'signatures' in saved.files:
+                signatures = saved['signatures']
+    except (FileNotFoundError, KeyError):
+        pass
+    if signatures is not None and signatures.shape[1] != len(embeddings):
+        signatures = None
+    return SimilarityIndex(embeddings, fingerprint, signatures)